@@ -14,6 +14,10 @@ Key Features:
 - Enables customization of enemy actions and interactions during combat.
 '''
 
+from src.modules.DropTableHandler import RollDrops
+from src.modules.TextFormatter import GenerateBar
+from src.modules.TraceHandler import Traced
+
 import random
 
 class Enemy:
@@ -32,20 +36,63 @@ class Enemy:
         "Bandit"
     ]
 
-    def __init__(self, player_level, threshold):
-        self.type = self.RandomlySelectEnemyType()
+    # Deterministic stats of every (enemy type, enemy level, player level) spawned so far, filled lazily
+    derived_stats = {}
+
+    @Traced('Enemy.__init__', 'combat')
+    def __init__(self, player_level, threshold, enemy_type = None, rng = random):
+        # Source of every random roll of the enemy, a seeded random.Random makes the spawn reproducible
+        self.rng = rng
+        self.type = enemy_type if enemy_type is not None else self.RandomlySelectEnemyType()
         self.level = self.GenerateEnemyLevel(player_level, threshold)
-        self.attribute_modifier = random.uniform(1.05, 1.10) + (self.level / 30)
-        self.exp_modifier = random.uniform(1.30, 1.50) + (self.level / 4)
-        self.gold_modifier = random.uniform(1.25, 1.75) + (self.level / 5)
+        self.attribute_modifier = rng.uniform(1.05, 1.10) + (self.level / 30)
+        self.exp_modifier = rng.uniform(1.30, 1.50) + (self.level / 4)
+        self.gold_modifier = rng.uniform(1.25, 1.75) + (self.level / 5)
         self.dropped_exp = self.CalculateDroppedExp()
         self.dropped_gold = self.CalculateDroppedGold()
-        self.dropped_item = self.ReadDropsFromFile('.\\config\\enemyDrops.txt')
-        self.attributes = self.GetAttributes(player_level)
+        self.dropped_item = self.RollDroppedItem()
         self.description = self.type
+        self.defense_modifier = 100
+        self.LoadDerivedStats(player_level)
+
+    def LoadDerivedStats(self, player_level: int):
+        """
+        Sets the attributes and every stat derived from them, using the precomputed table when possible.
+
+        Everything an enemy has besides its type, level, loot and modifiers only depends on its type, its
+        level and the player's level, so it is calculated once per combination and stored in `derived_stats`.
+        Later enemies of the same type and level copy their stats from the table instead of recalculating them.
+
+        Args:
+            player_level (int): The current level of the player.
+        """
+
+        key = (self.type, self.level, player_level)
+        derived = Enemy.derived_stats.get(key)
+
+        if derived is None:
+            derived = Enemy.derived_stats[key] = self.CalculateDerivedStats(player_level)
+
+        self.__dict__.update(derived)
+        # Combat changes these in place, so every enemy needs its own copies
+        self.attributes = derived['attributes'].copy()
+        self.stats = derived['stats'].copy()
+        self.max_stats = derived['max_stats'].copy()
+
+    def CalculateDerivedStats(self, player_level: int) -> dict:
+        """
+        Calculates the attributes of the enemy and every stat derived from them.
+
+        Args:
+            player_level (int): The current level of the player.
+
+        Returns:
+            dict: The attributes, stats, max stats, attack, defense, costs, dodge chance and critical chance of the enemy, keyed by attribute name.
+        """
+
+        self.attributes = self.GetAttributes(player_level)
         self.stats = self.CalculateBaseStats()
         self.max_stats = self.stats.copy()
-        self.defense_modifier = 100
         self.physical_attack = self.CalculateAttack("Strength", 10.5)
         self.magical_attack = self.CalculateAttack("Intelligence", 10.5)
         self.critical_hit = self.CalculateCriticalHit()
@@ -56,6 +103,21 @@ class Enemy:
         self.dodge_chance = self.CalculateDodgeChance(player_level)
         self.critical_chance = self.CalculateCriticalChance()
 
+        return {
+            'attributes': self.attributes.copy(),
+            'stats': self.stats.copy(),
+            'max_stats': self.max_stats.copy(),
+            'physical_attack': self.physical_attack,
+            'magical_attack': self.magical_attack,
+            'critical_hit': self.critical_hit,
+            'physical_defense': self.physical_defense,
+            'magical_defense': self.magical_defense,
+            'stamina_cost': self.stamina_cost,
+            'mana_cost': self.mana_cost,
+            'dodge_chance': self.dodge_chance,
+            'critical_chance': self.critical_chance
+        }
+
     def RandomlySelectEnemyType(self) -> str:
         """
         Randomly selects an enemy type from the list.
@@ -73,7 +135,7 @@ class Enemy:
             str: The randomly selected Enemy type from the list of enemies.
         """
 
-        return random.choice(self.enemy_types)
+        return self.rng.choice(self.enemy_types)
 
     def GenerateEnemyLevel(self, player_level: int, threshold: int) -> int:
         """
@@ -92,7 +154,7 @@ class Enemy:
             int: The randomly generated enemy level, with a minimum value of 1.
         """
 
-        return max(1, random.randint(player_level - threshold, player_level + threshold))
+        return max(1, self.rng.randint(player_level - threshold, player_level + threshold))
 
     def CalculateStat(self, attribute: str, level: int, multiplier: int = 1) -> float:
         """
@@ -127,7 +189,7 @@ class Enemy:
             float: The amount of experience dropped by the enemy, rounded to the nearest whole number.
         """
 
-        return round(random.uniform(15, 30) * self.exp_modifier, 0)
+        return round(self.rng.uniform(15, 30) * self.exp_modifier, 0)
 
     def CalculateDroppedGold(self) -> float:
         """
@@ -142,45 +204,23 @@ class Enemy:
             float: The amount of gold dropped by the enemy, rounded to the nearest whole number.
         """
 
-        return round(random.uniform(2, 4) * self.gold_modifier, 0)
+        return round(self.rng.uniform(2, 4) * self.gold_modifier, 0)
 
-    def ReadDropsFromFile(self, filename: str) -> dict:
+    def RollDroppedItem(self) -> dict:
         """
-        Takes the enemy drops from the file and determines the drops for the Player.
+        Determines the item the enemy drops for the Player.
 
-        This method opens a specified file containing information about possible drops for various enemy types. 
-        It processes each line in the file to check if the enemy's type matches the type in the file, and if so, 
-        randomly determines the quantity of each item within the specified range for that drop. If a match is 
-        found, it returns a dictionary containing the items and quantities dropped by the enemy; otherwise, 
-        an empty dictionary is returned.
-
-        Args:
-            filename (str): The filename of the enemy drop information.
+        This method looks up the enemy's type in the enemy drop table, which is loaded from
+        `config/enemyDrops.txt` once and kept in memory (see `ConfigHandler`). If the enemy has a
+        drop, the quantity is randomly determined within the range for that drop and a dictionary
+        containing the item and quantity dropped by the enemy is returned; otherwise, an empty
+        dictionary is returned.
 
         Returns:
             drops (dict): All of the drop information from the enemy.
         """
-        
-        drops = {}
-    
-        with open(filename, 'r') as file:
-            for line in file:
-                parts = line.strip().split(',')
-                
-                if len(parts) == 4:
-                    enemy_type = parts[0].strip()
-                    name = parts[1].strip()
-
-                    min_count = int(parts[2].strip())
-                    max_count = int(parts[3].strip())
-                    count = random.randint(min_count, max_count)
-                    
-                    if enemy_type == self.type:
-                        drops[name] = {'type': enemy_type, 'name': name, 'count': count}
-
-                        return drops
-                    
-            return drops
+
+        return RollDrops(self.type, self.rng)
 
     def CalculateBaseStats(self) -> dict:
         """
@@ -324,13 +364,7 @@ class Enemy:
             display (str): Stat in parathesis for actual value viewing
         """
 
-        bar_length = int(length * (current / maximum))
-        color_code = f"\033[1;{30 + list(('black', 'red', 'green', 'yellow', 'blue', 'magenta', 'cyan', 'white')).index(bar_color)}m"
-        bracket_color_code = f"\033[1;{30 + list(('black', 'red', 'green', 'yellow', 'blue', 'magenta', 'cyan', 'white')).index(bracket_color)}m"
-        stat_bar = f"{bracket_color_code}[{color_code}{'=' * bar_length}{' ' * (length - bar_length)}{bracket_color_code}]\033[0m"
-        display = f"({current}/{maximum})".rjust(10)
-
-        return stat_bar, display
+        return GenerateBar(current, maximum, length, bar_color, bracket_color, 10)
     
     def GetAttributes(self, player_level: int) -> dict:
         """
@@ -19,9 +19,10 @@ Key Features:
 from src.modules.MainMenu import MenuLine
 from src.modules.CoreGameFunctions import ConsoleInput, ClearConsole
 from src.modules.ArtAssets import DisplayStars
+from src.modules.TextFormatter import GenerateBar
+from src.modules.GameClock import Wait
 
 import random
-import time
 
 class Player:
     """
@@ -46,16 +47,34 @@ class Player:
         self.total_kills = 0
         self.total_deaths = 0
         self.inventory = {}
+        self.defense_modifier = 100
+        self.CalculateDerivedStats()
+
+    def CalculateDerivedStats(self):
+        """
+        Recalculates every stat that is derived from the player's attributes and level.
+
+        This method refills Health, Mana and Stamina to their new maximums and recomputes attack,
+        defense, critical hit, costs, and dodge and critical chances. A new character (level 1) uses
+        the starting cost formulas, while a character that has leveled up uses the level up formulas,
+        so calling this after changing attributes or level gives the same result as `LevelUp`.
+        """
+
         self.stats = self.CalculateBaseStats()
         self.max_stats = self.stats.copy()
-        self.defense_modifier = 100
         self.physical_attack = self.CalculateAttack("Strength", 10.5)
         self.magical_attack = self.CalculateAttack("Intelligence", 10.5)
         self.critical_hit = self.CalculateCriticalHit()
         self.physical_defense = self.CalculateDefense("Endurance")
         self.magical_defense = self.CalculateDefense("Willpower")
-        self.stamina_cost = self.CalculateCost("Endurance", base = 15, scale = 1.2, per_level_scale = 0.012)
-        self.mana_cost = self.CalculateCost("Willpower", base = 35, scale = 1.6, per_level_scale = 0.008)
+
+        if self.level == 1:
+            self.stamina_cost = self.CalculateCost("Endurance", base = 15, scale = 1.2, per_level_scale = 0.012)
+            self.mana_cost = self.CalculateCost("Willpower", base = 35, scale = 1.6, per_level_scale = 0.008)
+        else:
+            self.stamina_cost = self.CalculateCost("Endurance", base = 15, scale = 1.4, per_level_scale = 0.012)
+            self.mana_cost = self.CalculateCost("Willpower", base = 30, scale = 1.4, per_level_scale = 0.012)
+
         self.dodge_chance = self.CalculateDodgeChance()
         self.critical_chance = self.CalculateCriticalChance()
 
@@ -221,13 +240,7 @@ class Player:
             display (str): Stat in parathesis for actual value viewing
         """
 
-        bar_length = int(length * (current / maximum))
-        color_code = f"\033[1;{30 + list(('black', 'red', 'green', 'yellow', 'blue', 'magenta', 'cyan', 'white')).index(bar_color)}m"
-        bracket_color_code = f"\033[1;{30 + list(('black', 'red', 'green', 'yellow', 'blue', 'magenta', 'cyan', 'white')).index(bracket_color)}m"
-        stat_bar = f"{bracket_color_code}[{color_code}{'=' * bar_length}{' ' * (length - bar_length)}{bracket_color_code}]\033[0m"
-        display = f"({current}/{maximum})".rjust(10)
-
-        return stat_bar, display
+        return GenerateBar(current, maximum, length, bar_color, bracket_color, 10)
 
     def GenerateExpBar(self, current, maximum, length = 50, bar_color = 'white', bracket_color = 'white'):
         """
@@ -244,13 +257,7 @@ class Player:
             display (str): Stat in parathesis for actual value viewing
         """
 
-        bar_length = int(length * (current / maximum))
-        color_code = f"\033[1;{30 + list(('black', 'red', 'green', 'yellow', 'blue', 'magenta', 'cyan', 'white')).index(bar_color)}m"
-        bracket_color_code = f"\033[1;{30 + list(('black', 'red', 'green', 'yellow', 'blue', 'magenta', 'cyan', 'white')).index(bracket_color)}m"
-        exp_bar = f"{bracket_color_code}[{color_code}{'=' * bar_length}{' ' * (length - bar_length)}{bracket_color_code}]\033[0m"
-        display = f"({current}/{maximum})".rjust(5)
-
-        return exp_bar, display
+        return GenerateBar(current, maximum, length, bar_color, bracket_color, 5)
 
     def Rest(self):
         """
@@ -343,7 +350,7 @@ class Player:
                     MenuLine()
                     print(f" - {attribute_name} is already been maxed out. Please try again.")
                     MenuLine()
-                    time.sleep(2)
+                    Wait(2)
                     ClearConsole()
             else:
                 return
@@ -351,14 +358,4 @@ class Player:
         self.experience = round(self.experience % self.next_experience, 0)
         self.level += 1
         self.next_experience = round(self.next_experience * 1.125, 0)
-        self.stats = self.CalculateBaseStats()
-        self.max_stats = self.stats.copy()
-        self.physical_attack = self.CalculateAttack("Strength", 10.5)
-        self.magical_attack = self.CalculateAttack("Intelligence", 10.5)
-        self.critical_hit = self.CalculateCriticalHit()
-        self.physical_defense = self.CalculateDefense("Endurance")
-        self.magical_defense = self.CalculateDefense("Willpower")
-        self.stamina_cost = self.CalculateCost("Endurance", base = 15, scale = 1.4, per_level_scale = 0.012)
-        self.mana_cost = self.CalculateCost("Willpower", base = 30, scale = 1.4, per_level_scale = 0.012)
-        self.dodge_chance = self.CalculateDodgeChance()
-        self.critical_chance = self.CalculateCriticalChance()
\ No newline at end of file
+        self.CalculateDerivedStats()
\ No newline at end of file
@@ -17,9 +17,14 @@ Functions:
 - DisplayDragon: Displays ASCII art of a dragon.
 '''
 
-def DisplaySkull() -> None:
+from src.modules.TextFormatter import Frame, Emit
+
+def DisplaySkull(frame: Frame = None) -> None:
     """
     Displays ASCII art representing a skull.
+
+    Parameters:
+        frame (Frame): The frame to add the art to, if any.
     """
 
     skull = """
@@ -47,11 +52,14 @@ def DisplaySkull() -> None:
                       ................................
 """
 
-    print(skull)
+    Emit(skull, frame)
 
-def DisplayRogue() -> None:
+def DisplayRogue(frame: Frame = None) -> None:
     """
     Displays ASCII art representing a rogue character.
+
+    Parameters:
+        frame (Frame): The frame to add the art to, if any.
     """
 
     rogue = """
@@ -75,11 +83,14 @@ def DisplayRogue() -> None:
                          `-------'       `--''       `'''
 """
 
-    print(rogue)
+    Emit(rogue, frame)
 
-def DisplayMage() -> None:
+def DisplayMage(frame: Frame = None) -> None:
     """
     Displays ASCII art representing a mage character.
+
+    Parameters:
+        frame (Frame): The frame to add the art to, if any.
     """
 
     mage = """
@@ -106,11 +117,14 @@ def DisplayMage() -> None:
                           ||                
 """
 
-    print(mage)
+    Emit(mage, frame)
 
-def DisplayWarrior() -> None:
+def DisplayWarrior(frame: Frame = None) -> None:
     """
     Displays ASCII art representing a warrior character.
+
+    Parameters:
+        frame (Frame): The frame to add the art to, if any.
     """
 
     warrior = """
@@ -140,11 +154,14 @@ def DisplayWarrior() -> None:
                                /____/\____\\
 """
 
-    print(warrior)
+    Emit(warrior, frame)
 
-def DisplayBattleAxe() -> None:
+def DisplayBattleAxe(frame: Frame = None) -> None:
     """
     Displays ASCII art of a battle axe.
+
+    Parameters:
+        frame (Frame): The frame to add the art to, if any.
     """
 
     battleaxe = """
@@ -168,11 +185,14 @@ def DisplayBattleAxe() -> None:
                                                ""YY8888888PP""
 """
 
-    print(battleaxe)
+    Emit(battleaxe, frame)
 
-def DisplayStars() -> None:
+def DisplayStars(frame: Frame = None) -> None:
     """
     Displays ASCII art of stars for decorative purposes.
+
+    Parameters:
+        frame (Frame): The frame to add the art to, if any.
     """
 
     stars = """
@@ -193,11 +213,14 @@ def DisplayStars() -> None:
                  .        ,            ,                o         .              
 """
 
-    print(stars)
+    Emit(stars, frame)
 
-def DisplayPlanet() -> None:
+def DisplayPlanet(frame: Frame = None) -> None:
     """
     Displays ASCII art for a race menu.
+
+    Parameters:
+        frame (Frame): The frame to add the art to, if any.
     """
 
     planet = """
@@ -218,11 +241,14 @@ def DisplayPlanet() -> None:
                  .          ---         .              
 """                 
 
-    print(planet)
+    Emit(planet, frame)
 
-def DisplayDragon() -> None:
+def DisplayDragon(frame: Frame = None) -> None:
     """
     Displays ASCII art of a dragon.
+
+    Parameters:
+        frame (Frame): The frame to add the art to, if any.
     """
 
     # ASCII Art by Adrian Elhart
@@ -247,4 +273,4 @@ def DisplayDragon() -> None:
                      /         /{___/_\___}\   `          \    `     
     """
 
-    print(dragon)
\ No newline at end of file
+    Emit(dragon, frame)
\ No newline at end of file
@@ -0,0 +1,246 @@
+'''
+Balance sweep across every starting build, enemy type and level of Console Quest RPG.
+
+This module fans the full balance matrix out over a `multiprocessing` pool: every race, birthsign and
+class combination from character creation, against every enemy type, at every level from 1 to the
+level cap, with a batch of simulated fights per cell. Each cell is independent, so the sweep keeps every
+core busy and scales with the number of cores available.
+
+Characters above level 1 are leveled up without any input: the 5 attribute points gained per level go
+into the two attributes their class favors (Strength and Endurance for a Warrior, Intelligence and
+Willpower for a Mage, Agility and Speed for a Rogue) until they are maxed out.
+
+Results are streamed to a CSV file as cells finish, one row per build, enemy type and level, and can
+also be written to a NPY matrix of shape (builds, enemy types, levels, 2) holding the win rate and the
+average turns to kill. Fights are resolved by `VectorizedCombat` when NumPy is installed, and by
+`CombatSimulator` otherwise (the NPY matrix needs NumPy).
+
+Run a sweep from the root folder of the game with:
+    python -m src.modules.BalanceSweep --fights 200 --csv sweep.csv --npy sweep.npy
+
+Functions:
+- ListBuilds: Lists every (race, birthsign, class) starting build from character creation.
+- CreateBuild: Creates a character for a starting build and levels it up automatically.
+- SweepCell: Simulates the fights of a single cell of the sweep and returns its results.
+- RunBalanceSweep: Runs the full sweep over a process pool and streams the results to disk.
+- main: Parses the command line arguments and runs the sweep.
+'''
+
+from src.modules.CharacterCreation import race_attributes, birthsign_attribute_changes, class_attribute_changes
+from src.modules.CombatSimulator import SimulateEncounters, SummarizeEncounters, level_cap
+from src.classes.Player import Player
+from src.classes.Enemy import Enemy
+
+try:
+    from src.modules.VectorizedCombat import SimulateEncountersVectorized, SummarizeVectorizedEncounters
+    import numpy as np
+except ImportError:
+    np = None
+
+import argparse
+import csv
+import multiprocessing
+import os
+
+class_focus = {
+    'Warrior': ('Strength', 'Endurance'),
+    'Mage': ('Intelligence', 'Willpower'),
+    'Rogue': ('Agility', 'Speed')
+}
+
+csv_columns = [
+    'race', 'birthsign', 'class', 'enemy_type', 'level', 'fights',
+    'win_rate', 'loss_rate', 'flee_rate', 'draw_rate', 'average_turns', 'average_turns_to_kill'
+]
+
+def ListBuilds() -> list:
+    """
+    Lists every (race, birthsign, class) starting build from character creation.
+
+    Returns:
+        builds (list): Every combination of race, birthsign, and class, in menu order.
+    """
+
+    return [
+        (race, birthsign, player_class)
+        for race in race_attributes
+        for birthsign in birthsign_attribute_changes
+        for player_class in class_attribute_changes
+    ]
+
+def CreateBuild(race: str, birthsign: str, player_class: str, level: int = 1) -> Player:
+    """
+    Creates a character for a starting build and levels it up automatically.
+
+    Parameters:
+        race (str): The race of the character.
+        birthsign (str): The birthsign of the character.
+        player_class (str): The class of the character.
+        level (int): The level to bring the character up to.
+
+    Returns:
+        player (Player): The character, with full stats for their level.
+    """
+
+    attributes = dict(race_attributes[race])
+
+    for changes in (birthsign_attribute_changes[birthsign], class_attribute_changes[player_class]):
+        for key in changes:
+            attributes[key] += changes[key]
+
+    player = Player("Sweep", "Other", race, birthsign, player_class, attributes)
+    points = 5 * (level - 1)
+
+    while points > 0:
+        # Spend points on the least developed favored attribute, anything left over once both are maxed
+        candidates = [attribute for attribute in class_focus[player_class] if player.attributes[attribute] < 100] \
+            or [attribute for attribute in player.attributes if player.attributes[attribute] < 100]
+
+        if not candidates:
+            break
+
+        player.attributes[min(candidates, key = lambda attribute: player.attributes[attribute])] += 1
+        points -= 1
+
+    player.level = level
+    player.CalculateDerivedStats()
+
+    return player
+
+def SweepCell(cell: tuple) -> tuple:
+    """
+    Simulates the fights of a single cell of the sweep and returns its results.
+
+    Parameters:
+        cell (tuple): The cell index, race, birthsign, class, enemy type, level, fights, max turns, flee threshold and seed.
+
+    Returns:
+        index (int): The index of the cell, since cells finish out of order.
+        row (dict): The CSV row of the cell, keyed by `csv_columns`.
+    """
+
+    index, race, birthsign, player_class, enemy_type, level, fights, max_turns, flee_threshold, seed = cell
+
+    player = CreateBuild(race, birthsign, player_class, level)
+
+    if np is not None:
+        summary = SummarizeVectorizedEncounters(SimulateEncountersVectorized(player, fights, enemy_type, flee_threshold, max_turns, seed))
+    else:
+        summary = SummarizeEncounters(SimulateEncounters(player, fights, enemy_type, None, flee_threshold, max_turns, seed))
+
+    row = {
+        'race': race,
+        'birthsign': birthsign,
+        'class': player_class,
+        'enemy_type': enemy_type,
+        'level': level,
+        'fights': fights,
+        'win_rate': summary['win_rate'],
+        'loss_rate': summary['loss_rate'],
+        'flee_rate': summary['flee_rate'],
+        'draw_rate': summary['draw_rate'],
+        'average_turns': summary['average_turns'],
+        'average_turns_to_kill': summary['average_turns_to_kill']
+    }
+
+    return index, row
+
+def RunBalanceSweep(csv_path: str, npy_path: str = None, fights: int = 200, levels = None, enemy_types: list = None, processes: int = None, flee_threshold: float = 0.0, max_turns: int = 500, seed: int = 0) -> int:
+    """
+    Runs the full sweep over a process pool and streams the results to disk.
+
+    Every cell gets its own seed derived from the sweep seed, so a sweep gives the same results no matter
+    how many processes run it or in which order the cells finish.
+
+    Parameters:
+        csv_path (str): Path of the CSV file to stream the results to.
+        npy_path (str): Optional path of the NPY matrix of win rates and average turns to kill (needs NumPy).
+        fights (int): How many fights to simulate per cell.
+        levels (iterable): The player levels to sweep, every level up to the level cap by default.
+        enemy_types (list): The enemy types to sweep, every enemy type by default.
+        processes (int): How many worker processes to use, one per core by default.
+        flee_threshold (float): Health ratio under which the player runs away (when fast enough).
+        max_turns (int): Turns after which an unfinished fight is called a draw.
+        seed (int): Seed the cell seeds are derived from.
+
+    Returns:
+        cells (int): How many cells were simulated.
+    """
+
+    builds = ListBuilds()
+    levels = list(levels) if levels is not None else list(range(1, level_cap + 1))
+    enemy_types = list(enemy_types) if enemy_types is not None else list(Enemy.enemy_types)
+
+    if npy_path is not None and np is None:
+        raise RuntimeError("Writing a NPY matrix needs NumPy, see docs/DEPENDENCIES.md.")
+
+    cells = [
+        (index, race, birthsign, player_class, enemy_type, level, fights, max_turns, flee_threshold, seed * 1000003 + index)
+        for index, ((race, birthsign, player_class), enemy_type, level) in enumerate(
+            (build, enemy_type, level) for build in builds for enemy_type in enemy_types for level in levels
+        )
+    ]
+
+    matrix = None
+
+    if npy_path is not None:
+        matrix = np.lib.format.open_memmap(npy_path, mode = 'w+', dtype = np.float64, shape = (len(builds), len(enemy_types), len(levels), 2))
+        matrix[:] = np.nan
+
+    processes = processes or os.cpu_count() or 1
+    # Hand out a few cells at a time so workers stay busy without waiting on the parent for every cell
+    chunksize = max(1, min(16, len(cells) // (processes * 8)))
+
+    with open(csv_path, 'w', newline = '') as file:
+        writer = csv.DictWriter(file, fieldnames = csv_columns)
+        writer.writeheader()
+
+        with multiprocessing.Pool(processes) as pool:
+            for index, row in pool.imap_unordered(SweepCell, cells, chunksize):
+                writer.writerow(row)
+
+                if matrix is not None:
+                    build_index, remainder = divmod(index, len(enemy_types) * len(levels))
+                    enemy_index, level_index = divmod(remainder, len(levels))
+                    turns_to_kill = row['average_turns_to_kill']
+                    matrix[build_index, enemy_index, level_index] = (row['win_rate'], turns_to_kill if turns_to_kill is not None else np.nan)
+
+    if matrix is not None:
+        matrix.flush()
+
+    return len(cells)
+
+def main():
+    """
+    Parses the command line arguments and runs the sweep.
+    """
+
+    parser = argparse.ArgumentParser(description = "Sweeps every build, enemy type and level of Console Quest RPG.")
+    parser.add_argument('--csv', default = 'balance_sweep.csv', help = "CSV file to stream the results to")
+    parser.add_argument('--npy', default = None, help = "NPY file to write the win rate and turns to kill matrix to")
+    parser.add_argument('--fights', type = int, default = 200, help = "fights to simulate per cell")
+    parser.add_argument('--min-level', type = int, default = 1, help = "lowest player level to sweep")
+    parser.add_argument('--max-level', type = int, default = level_cap, help = "highest player level to sweep")
+    parser.add_argument('--enemy', action = 'append', choices = Enemy.enemy_types, help = "enemy type to sweep (repeatable, every type by default)")
+    parser.add_argument('--processes', type = int, default = None, help = "worker processes (one per core by default)")
+    parser.add_argument('--flee-threshold', type = float, default = 0.0, help = "health ratio under which the player runs away")
+    parser.add_argument('--max-turns', type = int, default = 500, help = "turns after which a fight is a draw")
+    parser.add_argument('--seed', type = int, default = 0, help = "seed of the sweep")
+    arguments = parser.parse_args()
+
+    cells = RunBalanceSweep(
+        arguments.csv,
+        arguments.npy,
+        arguments.fights,
+        range(arguments.min_level, arguments.max_level + 1),
+        arguments.enemy,
+        arguments.processes,
+        arguments.flee_threshold,
+        arguments.max_turns,
+        arguments.seed
+    )
+
+    print(f" - Swept {cells} cells into {arguments.csv}" + (f" and {arguments.npy}" if arguments.npy else ""))
+
+if __name__ == '__main__':
+    main()
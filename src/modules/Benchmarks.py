@@ -0,0 +1,353 @@
+'''
+Benchmark suite for Console Quest RPG.
+
+This module times the hot paths of the game, so performance changes can be measured and compared over time:
+- Spawning an enemy (`Enemy.__init__`).
+- A single melee attack and spell cast (`MeleeAttack`, `CastSpell`).
+- A full headless encounter (`SimulateEncounter`).
+- A save and load round trip through `SaveGame`, the save writer and the storage backend.
+- Loading the shop inventory and needs (`LoadShopInventory`, `LoadShopNeeds`).
+- A full render of the in-game menu (`DisplayMenu`) through the frame-buffer renderer to a null terminal.
+
+Every benchmark is warmed up first, then timed over a number of repeats. Each repeat runs the benchmark
+enough times to last at least `min_repeat_time`, so fast benchmarks aren't dominated by the timer. The
+median, 95th percentile, minimum, mean and standard deviation of the time per call are reported. Randomness
+is seeded before every benchmark, and the game runs with zero pacing and scripted input, so nothing waits.
+
+Results are written as JSON along with the Python version, platform and git commit they were measured on.
+
+Run the suite from the root folder of the game with:
+    python -m src.modules.Benchmarks --output benchmarks.json
+    python -m src.modules.Benchmarks --benchmark encounter --benchmark save_load_round_trip
+
+Functions:
+- BenchmarkPlayer: Creates the character the benchmarks are run with.
+- BenchmarkEnemySpawn: Spawns an enemy.
+- BenchmarkMeleeAttack: Lands a melee attack on an enemy.
+- BenchmarkCastSpell: Casts a spell at an enemy.
+- BenchmarkEncounter: Resolves a full headless encounter.
+- BenchmarkSaveLoad: Saves a character and loads it back.
+- BenchmarkShopLoading: Loads the shop inventory and needs.
+- BenchmarkMenuRender: Renders the in-game menu to a null terminal.
+- Percentile: Returns a percentile of a list of timings.
+- TimeBenchmark: Times a benchmark and returns its statistics.
+- GitCommit: Returns the git commit the game is running from, if any.
+- RunBenchmarks: Runs the benchmarks and writes their results to a JSON file.
+- main: Parses the command line arguments and runs the benchmarks.
+'''
+
+from src.modules.BalanceSweep import CreateBuild
+from src.modules.CombatEncounter import MeleeAttack, CastSpell
+from src.modules.CombatSimulator import SimulateEncounter, enemy_level_threshold
+from src.modules.GameActions import SaveGame
+from src.modules.SaveWriter import FlushSaves
+from src.modules.SaveStore import LoadStoredSave
+from src.modules.ShopHandler import LoadShopInventory, LoadShopNeeds
+from src.modules.Launcher import DisplayMenu
+from src.modules.ScreenRenderer import StartRenderer, StopRenderer
+from src.modules.InputProvider import UseInput, UseConsoleInput
+from src.modules.GameClock import SetPacing
+from src.modules.ConfigHandler import LoadConfig
+from src.classes.Enemy import Enemy
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+
+min_repeat_time = 0.02      # Seconds each timed repeat lasts at least
+terminal_size = ('100', '40')   # Columns and lines of the null terminal the menu is rendered to
+
+def BenchmarkPlayer():
+    """
+    Creates the character the benchmarks are run with: a level 10 Human Warrior born under The Knight.
+
+    Returns:
+        player (Player): The character.
+    """
+
+    return CreateBuild('Human', 'The Knight', 'Warrior', 10)
+
+@contextlib.contextmanager
+def BenchmarkEnemySpawn():
+    """
+    Spawns an enemy.
+    """
+
+    player = BenchmarkPlayer()
+
+    yield lambda: Enemy(player.level, enemy_level_threshold)
+
+@contextlib.contextmanager
+def BenchmarkMeleeAttack():
+    """
+    Lands a melee attack on an enemy. The stats of both sides are restored before every attack, so every attack takes the same path.
+    """
+
+    player = BenchmarkPlayer()
+    enemy = Enemy(player.level, enemy_level_threshold, 'Ogre')
+
+    def attack():
+        player.stats['Stamina'] = player.max_stats['Stamina']
+        enemy.stats['Health'] = enemy.max_stats['Health']
+        MeleeAttack(player, enemy)
+
+    yield attack
+
+@contextlib.contextmanager
+def BenchmarkCastSpell():
+    """
+    Casts a spell at an enemy. The stats of both sides are restored before every spell, so every spell takes the same path.
+    """
+
+    player = BenchmarkPlayer()
+    enemy = Enemy(player.level, enemy_level_threshold, 'Ogre')
+
+    def cast():
+        player.stats['Mana'] = player.max_stats['Mana']
+        enemy.stats['Health'] = enemy.max_stats['Health']
+        CastSpell(player, enemy)
+
+    yield cast
+
+@contextlib.contextmanager
+def BenchmarkEncounter():
+    """
+    Resolves a full headless encounter against a random enemy.
+    """
+
+    player = BenchmarkPlayer()
+    rng = random.Random(0)
+
+    yield lambda: SimulateEncounter(player, rng = rng)
+
+@contextlib.contextmanager
+def BenchmarkSaveLoad():
+    """
+    Saves a character and loads it back, in an empty folder so existing saves are left alone.
+    """
+
+    player = BenchmarkPlayer()
+    working_directory = os.getcwd()
+
+    def round_trip():
+        player.gold += 1
+        SaveGame(player)
+        FlushSaves()
+        LoadStoredSave(player.name)
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+
+        try:
+            yield round_trip
+        finally:
+            FlushSaves()
+            os.chdir(working_directory)
+
+@contextlib.contextmanager
+def BenchmarkShopLoading():
+    """
+    Loads the shop inventory and needs.
+    """
+
+    def load_shop():
+        LoadShopInventory()
+        LoadShopNeeds()
+
+    yield load_shop
+
+@contextlib.contextmanager
+def BenchmarkMenuRender():
+    """
+    Renders the in-game menu to a null terminal, through the frame-buffer renderer, answering its prompt right away.
+    """
+
+    player = BenchmarkPlayer()
+    environment = {name: os.environ.get(name) for name in ('COLUMNS', 'LINES')}
+    os.environ['COLUMNS'], os.environ['LINES'] = terminal_size
+    terminal = io.TextIOWrapper(open(os.devnull, 'wb'), encoding = 'utf-8')
+    UseInput(itertools.repeat('1'), echo = False)
+    StartRenderer(terminal)
+
+    try:
+        yield lambda: DisplayMenu(player)
+    finally:
+        StopRenderer()
+        UseConsoleInput()
+        terminal.close()
+
+        for name, value in environment.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+# Every benchmark, by name: a context manager that prepares the benchmark and yields the function to time
+benchmarks = {
+    'enemy_spawn': BenchmarkEnemySpawn,
+    'melee_attack': BenchmarkMeleeAttack,
+    'cast_spell': BenchmarkCastSpell,
+    'encounter': BenchmarkEncounter,
+    'save_load_round_trip': BenchmarkSaveLoad,
+    'shop_loading': BenchmarkShopLoading,
+    'menu_render': BenchmarkMenuRender
+}
+
+def Percentile(timings: list, percent: float) -> float:
+    """
+    Returns a percentile of a list of timings, using the nearest rank.
+
+    Parameters:
+        timings (list): The timings.
+        percent (float): The percentile, from 0 to 100.
+
+    Returns:
+        value (float): The timing at that percentile.
+    """
+
+    ordered = sorted(timings)
+
+    return ordered[max(0, math.ceil(len(ordered) * percent / 100) - 1)]
+
+def TimeBenchmark(benchmark, warmup: int = 3, repeats: int = 30) -> dict:
+    """
+    Times a benchmark and returns its statistics.
+
+    Parameters:
+        benchmark (function): The function to time, called without arguments.
+        warmup (int): Number of untimed repeats run first.
+        repeats (int): Number of timed repeats.
+
+    Returns:
+        statistics (dict): The calls per repeat, the number of repeats, and the median, 95th percentile,
+            minimum, mean and standard deviation of the time per call, in microseconds.
+    """
+
+    # Run the benchmark enough times per repeat to last at least min_repeat_time
+    number = 1
+
+    while True:
+        start = time.perf_counter()
+
+        for _ in range(number):
+            benchmark()
+
+        if time.perf_counter() - start >= min_repeat_time:
+            break
+
+        number *= 2
+
+    timings = []
+
+    for repeat in range(warmup + repeats):
+        start = time.perf_counter()
+
+        for _ in range(number):
+            benchmark()
+
+        if repeat >= warmup:
+            timings.append((time.perf_counter() - start) / number * 1e6)
+
+    return {
+        'number': number,
+        'repeats': repeats,
+        'median_us': statistics.median(timings),
+        'p95_us': Percentile(timings, 95),
+        'min_us': min(timings),
+        'mean_us': statistics.fmean(timings),
+        'stdev_us': statistics.stdev(timings) if len(timings) > 1 else 0.0
+    }
+
+def GitCommit() -> str:
+    """
+    Returns the git commit the game is running from, if any.
+
+    Returns:
+        commit (str): The hash of the commit (None if the game isn't running from a git repository).
+    """
+
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output = True, text = True, timeout = 5,
+                                cwd = os.path.dirname(os.path.abspath(__file__)))
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    return result.stdout.strip() if result.returncode == 0 else None
+
+def RunBenchmarks(output_path: str = None, names: list = None, warmup: int = 3, repeats: int = 30) -> dict:
+    """
+    Runs the benchmarks and writes their results to a JSON file.
+
+    Parameters:
+        output_path (str): Optional JSON file to write the results to.
+        names (list): Names of the benchmarks to run (every benchmark by default).
+        warmup (int): Number of untimed repeats of each benchmark.
+        repeats (int): Number of timed repeats of each benchmark.
+
+    Returns:
+        results (dict): When and where the benchmarks ran, and the statistics of each benchmark, keyed by name.
+    """
+
+    for name in names or ():
+        if name not in benchmarks:
+            raise ValueError(f"Unknown benchmark '{name}', expected one of {', '.join(benchmarks)}.")
+
+    LoadConfig()
+    SetPacing('zero')
+
+    results = {
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'commit': GitCommit(),
+        'warmup': warmup,
+        'benchmarks': {}
+    }
+
+    try:
+        for name in names or benchmarks:
+            random.seed(0)
+
+            with benchmarks[name]() as benchmark:
+                results['benchmarks'][name] = TimeBenchmark(benchmark, warmup, repeats)
+    finally:
+        SetPacing(None)
+
+    if output_path:
+        with open(output_path, 'w', encoding = 'utf-8') as file:
+            json.dump(results, file, indent = 2)
+
+    return results
+
+def main():
+    """
+    Parses the command line arguments and runs the benchmarks.
+    """
+
+    parser = argparse.ArgumentParser(description = "Times the hot paths of Console Quest RPG.")
+    parser.add_argument('--output', default = 'benchmarks.json', help = "JSON file to write the results to")
+    parser.add_argument('--benchmark', action = 'append', choices = list(benchmarks), help = "benchmark to run (repeatable, every benchmark by default)")
+    parser.add_argument('--warmup', type = int, default = 3, help = "untimed repeats of each benchmark")
+    parser.add_argument('--repeats', type = int, default = 30, help = "timed repeats of each benchmark")
+    arguments = parser.parse_args()
+
+    results = RunBenchmarks(arguments.output, arguments.benchmark, arguments.warmup, arguments.repeats)
+
+    for name, result in results['benchmarks'].items():
+        print(f" - {name:<22} median {result['median_us']:>10.2f} us   p95 {result['p95_us']:>10.2f} us   ({result['repeats']} x {result['number']})")
+
+    print(f" - Results written to {arguments.output}")
+
+if __name__ == '__main__':
+    main()
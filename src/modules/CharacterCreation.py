@@ -24,6 +24,26 @@ m_attributes = " Strength\t- {}" + " " * 16 + "(Affects Max Stamina, Physical Da
                " Agility\t- {}" + " " * 26 + "(Dodge Chance, Critical Hit)\n" \
                " Speed\t\t- {}" + " " * 28 + "(Run Away, Faster Resting)"
 
+race_attributes = {
+    'Human': {'Strength': 40, 'Endurance': 40, 'Intelligence': 40, 'Willpower': 40, 'Agility': 40, 'Speed': 40},
+    'Elf': {'Strength': 30, 'Endurance': 35, 'Intelligence': 50, 'Willpower': 45, 'Agility': 40, 'Speed': 40},
+    'Orc': {'Strength': 50, 'Endurance': 45, 'Intelligence': 30, 'Willpower': 35, 'Agility': 40, 'Speed': 40},
+    'Lynxarite': {'Strength': 35, 'Endurance': 30, 'Intelligence': 45, 'Willpower': 40, 'Agility': 50, 'Speed': 40},
+    'Scalekin': {'Strength': 45, 'Endurance': 40, 'Intelligence': 35, 'Willpower': 30, 'Agility': 40, 'Speed': 50}
+}
+
+birthsign_attribute_changes = {
+    'The Knight': {'Strength': 5, 'Endurance': 5, 'Willpower': -5, 'Speed': -5},
+    'The Magistar': {'Intelligence': 5, 'Willpower': 5, 'Endurance': -5, 'Agility': -5},
+    'The Shadow': {'Agility': 5, 'Speed': 5, 'Intelligence': -5, 'Willpower': -5}
+}
+
+class_attribute_changes = {
+    'Warrior': {'Strength': 5, 'Endurance': 5, 'Speed': -5},
+    'Mage': {'Intelligence': 5, 'Willpower': 5, 'Agility': -5},
+    'Rogue': {'Agility': 5, 'Speed': 5, 'Endurance': -5}
+}
+
 def CharacterMenuSelection(name: str, art: Callable, menu_line: Callable, options: list, type: str = "") -> str:
     """
     Displays a menu for the player to select a character attribute (race, birthsign, or class).
@@ -70,7 +90,7 @@ def SelectClass(name: str, attributes: list, art_class: Callable, menu_line: Cal
         attributes (list): The character's attributes.
     """
 
-    class_options = ['Warrior', 'Mage', 'Rogue']
+    class_options = list(class_attribute_changes)
 
     class_messages = {
         class_options[0]: " The Warrior class specializes in swords, maces, axes, and heavy armor.\n\n Their armor is a bit too heavy though, and slows them down in battle.\n Despite that, they are very defensive and have quite the health pool.\n",
@@ -87,17 +107,15 @@ def SelectClass(name: str, attributes: list, art_class: Callable, menu_line: Cal
         if option in ['1', '2', '3']:
             if option == '1':
                 class_name = class_options[0]
-                class_attributes = {'Strength': 5, 'Endurance': 5, 'Speed': -5}
                 art = DisplayWarrior
             elif option == '2':
                 class_name = class_options[1]
-                class_attributes = {'Intelligence': 5, 'Willpower': 5, 'Agility': -5}
                 art = DisplayMage
             elif option == '3':
                 class_name = class_options[2]
-                class_attributes = {'Agility': 5, 'Speed': 5, 'Endurance': -5}
                 art = DisplayRogue
 
+            class_attributes = class_attribute_changes[class_name]
             art()
             menu_line()
             print(f" ^ {name}, the {class_name}:")
@@ -137,7 +155,7 @@ def SelectBirthsign(name: str, attributes: list, art_birthsign: Callable, menu_l
         attributes (list): The character's attributes.
     """
     
-    birthsign_options = ['The Knight', 'The Magistar', 'The Shadow']
+    birthsign_options = list(birthsign_attribute_changes)
     
     birthsign_messages = {
         birthsign_options[0]: " Those born under The Knight can expect to be stronger and hardier.\n\n However, they tend to be slower, weaker to magical damage overall,\n and less capable at casting spells as they progress through the world.\n",
@@ -152,15 +170,8 @@ def SelectBirthsign(name: str, attributes: list, art_birthsign: Callable, menu_l
         birthsign_attributes = {}
 
         if option in ['1', '2', '3']:
-            if option == '1':
-                birthsign_name = birthsign_options[0]
-                birthsign_attributes = {'Strength': 5, 'Endurance': 5, 'Willpower': -5, 'Speed': -5}
-            elif option == '2':
-                birthsign_name = birthsign_options[1]
-                birthsign_attributes = {'Intelligence': 5, 'Willpower': 5, 'Endurance': -5, 'Agility': -5}
-            elif option == '3':
-                birthsign_name = birthsign_options[2]
-                birthsign_attributes = {'Agility': 5, 'Speed': 5, 'Intelligence': -5, 'Willpower': -5}
+            birthsign_name = birthsign_options[int(option) - 1]
+            birthsign_attributes = birthsign_attribute_changes[birthsign_name]
 
             art_birthsign()
             menu_line()
@@ -200,7 +211,7 @@ def SelectRace(name: str, art_race: Callable, menu_line: Callable) -> tuple[str,
         attributes (dict): The attributes of the selected race.
     """
 
-    race_options = ['Human', 'Elf', 'Orc', 'Lynxarite', 'Scalekin']
+    race_options = list(race_attributes)
 
     race_messages = {
         race_options[0]: " Humans are the most common race, found in cities across the planet. \n Many adventurers and conquerors of old have been of Human descent.\n\n Well-rounded, truly the jack of all trades with an even spread. \n You can go in any direction you want as a Human.\n",
@@ -210,23 +221,15 @@ def SelectRace(name: str, art_race: Callable, menu_line: Callable) -> tuple[str,
         race_options[4]: " Hailing from the marshes in the south, the Scalekin reign supreme. \n As the most athletic race, they tend to get away from anything. \n\n These reptile-like beasts have Speed like none other. \n If you are going to race a Scalekin, best of luck to you!\n"
     }
 
-    attributes = {
-        'Human': {'Strength': 40, 'Endurance': 40, 'Intelligence': 40, 'Willpower': 40, 'Agility': 40, 'Speed': 40},
-        'Elf': {'Strength': 30, 'Endurance': 35, 'Intelligence': 50, 'Willpower': 45, 'Agility': 40, 'Speed': 40},
-        'Orc': {'Strength': 50, 'Endurance': 45, 'Intelligence': 30, 'Willpower': 35, 'Agility': 40, 'Speed': 40},
-        'Lynxarite': {'Strength': 35, 'Endurance': 30, 'Intelligence': 45, 'Willpower': 40, 'Agility': 50, 'Speed': 40},
-        'Scalekin': {'Strength': 45, 'Endurance': 40, 'Intelligence': 35, 'Willpower': 30, 'Agility': 40, 'Speed': 50}
-    }
-                   
     while True:
         option = CharacterMenuSelection(name, art_race, menu_line, race_options, "race")
 
         race = ""
-        race_attributes = {}
+        chosen_attributes = {}
 
         if option in ['1', '2', '3', '4', '5']:
             race_name = race_options[int(option) - 1]
-            race_attributes = attributes[race_name]
+            chosen_attributes = dict(race_attributes[race_name])
 
             art_race()
             menu_line()
@@ -235,7 +238,7 @@ def SelectRace(name: str, art_race: Callable, menu_line: Callable) -> tuple[str,
             message = race_messages[race_name]
             
             print(message)
-            print(m_attributes.format(*[race_attributes[key] for key in race_attributes]))
+            print(m_attributes.format(*[chosen_attributes[key] for key in chosen_attributes]))
 
             print("\n * Is this your race? (Y/N)")
             menu_line()
@@ -245,4 +248,4 @@ def SelectRace(name: str, art_race: Callable, menu_line: Callable) -> tuple[str,
                 race = race_name
                 break
     
-    return race, race_attributes
\ No newline at end of file
+    return race, chosen_attributes
\ No newline at end of file
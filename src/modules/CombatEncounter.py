@@ -17,16 +17,17 @@ Functions:
 '''
 
 from src.modules.MainMenu import ConsoleInput, ClearConsole
-from src.modules.GameActions import SaveGame
+from src.modules.GameActions import AutosaveGame
 from src.modules.ArtAssets import DisplayPlanet, DisplayStars, DisplayBattleAxe, DisplaySkull
-from src.modules.TextFormatter import MenuLine
+from src.modules.TextFormatter import MenuLine, Frame
 from src.modules.StatusBarHandler import UpdateStatusBar, UpdateEnemyHealthBar
 from src.modules.CoreGameFunctions import ReturnToGame
+from src.modules.GameClock import Wait
+from src.modules.TraceHandler import StartSpan, EndSpan
 
 from src.classes.Player import Player # Change either to Player or old_Player
 from src.classes.Enemy import Enemy
 
-import time
 import random
 
 def CheckDodge(attacker, dodge_threshold: float) -> bool:
@@ -198,7 +199,7 @@ def StartEncounter(player: Player, message: str) -> None:
         for i in range(seconds, 0, -1):
             sys.stdout.write(f"\r ^ Returning to main menu in: {i}")
             sys.stdout.flush()
-            time.sleep(1)
+            Wait(1)
         sys.stdout.write("\r ^ Returning to main menu in: 0\n")
         sys.stdout.flush()
 
@@ -226,33 +227,43 @@ def StartEncounter(player: Player, message: str) -> None:
         isPlayerTurn = False
 
     while player.stats['Health'] > 0:
+        # The turn is traced without the player's answer and the enemy's pause, only the work the game does
+        turn_span = StartSpan('Encounter turn', 'combat', turn = turn_counter, enemy = enemy.type)
         ClearConsole()
-        DisplayBattleAxe()
-        MenuLine()
-        print(f" ^ You encountered a Level {enemy.level} {enemy.type} at {player.location}!")
-        MenuLine()
-        UpdateEnemyHealthBar(enemy)
-        MenuLine()
-        UpdateStatusBar(player)
-        MenuLine()
+        # Every turn is drawn as a single frame
+        frame = Frame()
+        DisplayBattleAxe(frame)
+        MenuLine(frame = frame)
+        frame.Print(f" ^ You encountered a Level {enemy.level} {enemy.type} at {player.location}!")
+        MenuLine(frame = frame)
+        UpdateEnemyHealthBar(enemy, frame)
+        MenuLine(frame = frame)
+        UpdateStatusBar(player, frame)
+        MenuLine(frame = frame)
         
         if message != "":
-            print(message)
-            MenuLine()
+            frame.Print(message)
+            MenuLine(frame = frame)
             
         if turn_counter % 2 == 1 and isPlayerTurn:
             isPlayerTurn = False
-            print(" * What would you like to do?")
-            MenuLine()
-            print(" 1. Attack\n 2. Cast Spell\n 3. Run Away")
-            MenuLine()
+            frame.Print(" * What would you like to do?")
+            MenuLine(frame = frame)
+            frame.Print(" 1. Attack\n 2. Cast Spell\n 3. Run Away")
+            MenuLine(frame = frame)
+            frame.Write()
+            EndSpan(turn_span)
             user_input = ConsoleInput()
+            turn_span = StartSpan('Encounter turn resolution', 'combat', turn = turn_counter, enemy = enemy.type)
             message = PlayerDecides(player, enemy, user_input)
         elif turn_counter % 2 == 0 and not isPlayerTurn:
             isPlayerTurn = True
-            print(f" * {enemy.type} is making a decision...")
-            MenuLine()
-            time.sleep(3)
+            frame.Print(f" * {enemy.type} is making a decision...")
+            MenuLine(frame = frame)
+            frame.Write()
+            EndSpan(turn_span)
+            Wait(3)
+            turn_span = StartSpan('Encounter turn resolution', 'combat', turn = turn_counter, enemy = enemy.type)
             message = EnemyDecides(enemy, player)
 
         turn_counter += 1 
@@ -268,14 +279,16 @@ def StartEncounter(player: Player, message: str) -> None:
                 
         player.stats['Mana'] += mana_recovery if player_mana + mana_recovery <= player.max_stats['Mana'] else mana_difference
         player.stats['Stamina'] += stamina_recovery if player_stamina + stamina_recovery <= player.max_stats['Stamina'] else stamina_difference
+        EndSpan(turn_span)
         
         if message == "Run away!":
+            AutosaveGame(player)
             ClearConsole()
             DisplayPlanet()
             MenuLine()
             print(f" ^ You managed to run away from the {enemy.type}!")
             MenuLine()
-            time.sleep(3)
+            Wait(3)
             break
         
         if player.stats['Health'] <= 0:
@@ -286,7 +299,7 @@ def StartEncounter(player: Player, message: str) -> None:
             health_penalty = round(player.max_stats['Health'] * 0.10, 2)
             player.stats['Health'] = max(health_penalty, 1)
             player.experience -= round(player.experience * 0.5, 2)
-            SaveGame(player)
+            AutosaveGame(player)
             ClearConsole()
             DisplaySkull()
             MenuLine()
@@ -312,7 +325,8 @@ def StartEncounter(player: Player, message: str) -> None:
             determine_enemy_drop()
             MenuLine()
             player.gold += enemy.dropped_gold
-            time.sleep(4)
+            AutosaveGame(player)
+            Wait(4)
 
             if player.experience >= player.next_experience and player.level < level_cap:
                 ClearConsole()
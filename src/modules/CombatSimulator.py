@@ -0,0 +1,311 @@
+'''
+Headless combat simulation for balancing Console Quest RPG.
+
+This module replays the exact rules of an enemy encounter without any console output, user input, or
+delays, so thousands of fights can be resolved in the time it takes to draw a single combat screen.
+It mirrors the behavior of `StartEncounter`, including:
+- Turn order decided by Speed, with the slower side skipping the first turn.
+- The rules of `MeleeAttack`, `CastSpell` and `EnemyDecides` (weakened melee, critical hits that bypass dodging, etc).
+- The per-turn mana and stamina recovery for the player.
+- Loot (experience, gold and enemy drops) awarded when the player wins.
+
+The player and enemy passed in are never modified; every simulated fight works on copies of their stats.
+
+Functions:
+- ThresholdProbability: Converts a crit or dodge chance into the probability that a rounded random roll lands below it.
+- ChooseAction: The default player strategy used by the simulator when no policy is provided.
+- SpawnEnemy: Creates an enemy from an enemy spec (an Enemy, an enemy type or None for a random type).
+- SimulateEncounter: Resolves a single encounter between a player and an enemy and returns the outcome.
+- SimulateEncounters: Resolves a batch of encounters and returns every outcome.
+- SummarizeEncounters: Aggregates a batch of outcomes into win rates and averages.
+'''
+
+from src.classes.Enemy import Enemy
+
+import math
+import random
+
+level_cap = 50          # Same cap StartEncounter uses before awarding experience
+enemy_level_threshold = 2   # Same threshold StartEncounter uses when spawning an enemy
+
+def ThresholdProbability(chance: float) -> float:
+    """
+    Converts a crit or dodge chance into the probability that a rounded random roll lands below it.
+
+    Combat rolls `round(random.random(), 2)` and compares it against the chance, so the real
+    probability is slightly different from the chance itself. Comparing a raw `random.random()`
+    against the value returned here gives exactly the same odds as the rounded roll.
+
+    Parameters:
+        chance (float): The critical hit or dodge chance of the attacker.
+
+    Returns:
+        probability (float): The probability that the rounded roll is lower than the chance.
+    """
+
+    smallest_roll_not_below = math.ceil(round(chance * 100, 6))
+
+    return max(0.0, min(1.0, smallest_roll_not_below / 100 - 0.005))
+
+def ChooseAction(player, enemy, player_mana: float, player_stamina: float, player_health_ratio: float, flee_threshold: float = 0.0) -> str:
+    """
+    The default player strategy used by the simulator when no policy is provided.
+
+    The player attacks while they have the stamina for it, falls back to casting spells when they
+    only have mana, and otherwise swings a weakened attack. If their health drops below the flee
+    threshold and they are fast enough to escape, they run away instead.
+
+    Parameters:
+        player (Player): The simulated player.
+        enemy (Enemy): The simulated enemy.
+        player_mana (float): The player's current mana.
+        player_stamina (float): The player's current stamina.
+        player_health_ratio (float): The player's current health divided by their max health.
+        flee_threshold (float): Health ratio under which the player tries to run away.
+
+    Returns:
+        user_input (str): The option the player would have entered ('1' attack, '2' spell, '3' run away).
+    """
+
+    if player_health_ratio < flee_threshold and player.attributes['Speed'] > enemy.attributes['Speed']:
+        return '3'
+
+    if player_stamina >= player.stamina_cost:
+        return '1'
+
+    if player_mana >= player.mana_cost:
+        return '2'
+
+    return '1'
+
+def SpawnEnemy(player, enemy = None, rng = random) -> Enemy:
+    """
+    Creates an enemy from an enemy spec (an Enemy, an enemy type or None for a random type).
+
+    Parameters:
+        player (Player): The player the enemy is spawned for.
+        enemy (Enemy, str or None): An existing enemy, the type of enemy to spawn, or None for a random type.
+        rng (random.Random): Source of randomness for the spawned enemy, so batches can be seeded.
+
+    Returns:
+        enemy (Enemy): The enemy to fight.
+    """
+
+    if isinstance(enemy, Enemy):
+        return enemy
+
+    return Enemy(player.level, enemy_level_threshold, enemy, rng)
+
+def SimulateEncounter(player, enemy = None, policy = None, flee_threshold: float = 0.0, max_turns: int = 500, rng = random) -> dict:
+    """
+    Resolves a single encounter between a player and an enemy and returns the outcome.
+
+    Parameters:
+        player (Player): The character fighting the encounter. Their current stats are used as the starting point.
+        enemy (Enemy, str or None): An existing enemy, the type of enemy to spawn, or None for a random type.
+        policy (function -> str): Optional strategy called as `policy(player, enemy, player_mana, player_stamina, player_health_ratio)` on each player turn, returning '1', '2' or '3'.
+        flee_threshold (float): Health ratio under which the default strategy runs away.
+        max_turns (int): Turns after which the fight is called a draw (both sides may be unable to hurt each other).
+        rng (random.Random): Source of randomness, so batches can be seeded.
+
+    Returns:
+        outcome (dict): The winner ('player', 'enemy', 'fled' or 'draw'), turns taken, damage dealt and taken, and the loot earned.
+    """
+
+    enemy = SpawnEnemy(player, enemy, rng)
+    roll = rng.random
+
+    player_health = player.stats['Health']
+    player_mana = player.stats['Mana']
+    player_stamina = player.stats['Stamina']
+    player_max_health = player.max_stats['Health']
+    player_max_mana = player.max_stats['Mana']
+    player_max_stamina = player.max_stats['Stamina']
+    mana_recovery = round(player.attributes['Willpower'] * 0.03, 2)
+    stamina_recovery = round(player.attributes['Endurance'] * 0.03, 2)
+    player_mana_cost = player.mana_cost
+    player_stamina_cost = player.stamina_cost
+    player_crit_roll = ThresholdProbability(player.critical_chance)
+    player_dodge_roll = ThresholdProbability(player.dodge_chance)
+    player_critical_hit = player.critical_hit
+    player_melee_damage = max(0, player.physical_attack - enemy.physical_defense)
+    player_weakened_damage = max(0, player.physical_attack * 0.75 - enemy.physical_defense)
+    player_spell_damage = max(0, player.magical_attack - enemy.magical_defense)
+    player_can_run = player.attributes['Speed'] > enemy.attributes['Speed']
+    flee_health = player_max_health * flee_threshold
+
+    enemy_health = enemy.stats['Health']
+    enemy_mana = enemy.stats['Mana']
+    enemy_stamina = enemy.stats['Stamina']
+    enemy_mana_cost = enemy.mana_cost
+    enemy_stamina_cost = enemy.stamina_cost
+    enemy_crit_roll = ThresholdProbability(enemy.critical_chance)
+    enemy_dodge_roll = ThresholdProbability(enemy.dodge_chance)
+    enemy_critical_hit = enemy.critical_hit
+    enemy_melee_damage = max(0, enemy.physical_attack - player.physical_defense)
+    enemy_weakened_damage = max(0, enemy.physical_attack * 0.75 - player.physical_defense)
+    enemy_spell_damage = max(0, enemy.magical_attack - player.magical_defense)
+
+    is_player_turn = player.attributes['Speed'] >= enemy.attributes['Speed']
+    turn_counter = 1
+    winner = 'draw'
+
+    while player_health > 0 and turn_counter <= max_turns:
+        player_ran = False
+
+        if turn_counter % 2 == 1 and is_player_turn:
+            is_player_turn = False
+
+            if policy is None:
+                # Inlined ChooseAction, this branch runs on every player turn
+                if player_can_run and player_health < flee_health:
+                    user_input = '3'
+                elif player_stamina >= player_stamina_cost or player_mana < player_mana_cost:
+                    user_input = '1'
+                else:
+                    user_input = '2'
+            else:
+                user_input = policy(player, enemy, player_mana, player_stamina, player_health / player_max_health)
+
+            if user_input == '1':
+                if player_stamina < player_stamina_cost:
+                    enemy_health -= player_weakened_damage
+                elif roll() < player_crit_roll:
+                    enemy_health -= player_critical_hit
+                    player_stamina -= player_stamina_cost
+                elif roll() >= player_dodge_roll:
+                    enemy_health -= player_melee_damage
+                    player_stamina -= player_stamina_cost
+            elif user_input == '2':
+                if player_mana < player_mana_cost:
+                    pass
+                elif roll() < player_crit_roll:
+                    enemy_health -= player_critical_hit
+                    player_mana -= player_mana_cost
+                elif roll() >= player_dodge_roll:
+                    enemy_health -= player_spell_damage
+                    player_mana -= player_mana_cost
+            elif user_input == '3':
+                player_ran = player_can_run
+        elif turn_counter % 2 == 0 and not is_player_turn:
+            is_player_turn = True
+
+            if roll() < 0.5:
+                if enemy_stamina < enemy_stamina_cost:
+                    player_health -= enemy_weakened_damage
+                elif roll() < enemy_crit_roll:
+                    player_health -= enemy_critical_hit
+                    enemy_stamina -= enemy_stamina_cost
+                elif roll() >= enemy_dodge_roll:
+                    player_health -= enemy_melee_damage
+                    enemy_stamina -= enemy_stamina_cost
+            else:
+                if enemy_mana < enemy_mana_cost:
+                    pass
+                elif roll() < enemy_crit_roll:
+                    player_health -= enemy_critical_hit
+                    enemy_mana -= enemy_mana_cost
+                elif roll() >= enemy_dodge_roll:
+                    player_health -= enemy_spell_damage
+                    enemy_mana -= enemy_mana_cost
+
+        turn_counter += 1
+
+        player_mana += mana_recovery if player_mana + mana_recovery <= player_max_mana else player_max_mana - player_mana
+        player_stamina += stamina_recovery if player_stamina + stamina_recovery <= player_max_stamina else player_max_stamina - player_stamina
+
+        if player_ran:
+            winner = 'fled'
+            break
+
+        if player_health <= 0:
+            winner = 'enemy'
+            break
+
+        if enemy_health <= 0:
+            winner = 'player'
+            break
+
+    loot = {'exp': 0, 'gold': 0, 'items': {}}
+
+    if winner == 'player':
+        loot['exp'] = enemy.dropped_exp if player.level < level_cap else 0
+        loot['gold'] = enemy.dropped_gold
+        loot['items'] = {item_info['name']: item_info['count'] for item_info in enemy.dropped_item.values() if item_info['count'] > 0}
+
+    return {
+        'winner': winner,
+        'turns': turn_counter - 1,
+        'enemy_type': enemy.type,
+        'enemy_level': enemy.level,
+        'damage_dealt': enemy.stats['Health'] - enemy_health,
+        'damage_taken': player.stats['Health'] - player_health,
+        'loot': loot
+    }
+
+def SimulateEncounters(player, count: int, enemy = None, policy = None, flee_threshold: float = 0.0, max_turns: int = 500, seed: int = None) -> list:
+    """
+    Resolves a batch of encounters and returns every outcome.
+
+    Passing an Enemy reuses that enemy (at full stats) for every fight, while passing an enemy type or
+    None spawns a fresh enemy for each fight exactly like exploring the world does.
+
+    Parameters:
+        player (Player): The character fighting the encounters.
+        count (int): How many encounters to simulate.
+        enemy (Enemy, str or None): An existing enemy, the type of enemy to spawn, or None for a random type.
+        policy (function -> str): Optional player strategy, see `SimulateEncounter`.
+        flee_threshold (float): Health ratio under which the default strategy runs away.
+        max_turns (int): Turns after which a fight is called a draw.
+        seed (int): Optional seed so a batch can be reproduced.
+
+    Returns:
+        outcomes (list): One outcome dictionary per encounter.
+    """
+
+    rng = random.Random(seed) if seed is not None else random
+
+    return [SimulateEncounter(player, enemy, policy, flee_threshold, max_turns, rng) for _ in range(count)]
+
+def SummarizeEncounters(outcomes: list) -> dict:
+    """
+    Aggregates a batch of outcomes into win rates and averages.
+
+    Parameters:
+        outcomes (list): Outcome dictionaries returned by `SimulateEncounter`.
+
+    Returns:
+        summary (dict): Number of fights, win/loss/flee/draw rates, average turns, average turns to kill, and average loot per fight.
+    """
+
+    fights = len(outcomes)
+
+    if fights == 0:
+        return {'fights': 0}
+
+    results = {'player': 0, 'enemy': 0, 'fled': 0, 'draw': 0}
+    total_turns = 0
+    turns_to_kill = 0
+    total_exp = 0
+    total_gold = 0
+
+    for outcome in outcomes:
+        results[outcome['winner']] += 1
+        total_turns += outcome['turns']
+        total_exp += outcome['loot']['exp']
+        total_gold += outcome['loot']['gold']
+
+        if outcome['winner'] == 'player':
+            turns_to_kill += outcome['turns']
+
+    return {
+        'fights': fights,
+        'win_rate': results['player'] / fights,
+        'loss_rate': results['enemy'] / fights,
+        'flee_rate': results['fled'] / fights,
+        'draw_rate': results['draw'] / fights,
+        'average_turns': total_turns / fights,
+        'average_turns_to_kill': turns_to_kill / results['player'] if results['player'] else None,
+        'average_exp': total_exp / fights,
+        'average_gold': total_gold / fights
+    }
@@ -0,0 +1,248 @@
+'''
+Central configuration for Console Quest RPG.
+
+This module loads every file in the `config` folder once and keeps them in memory as typed, immutable
+tables, so shop visits and enemy spawns never open a config file. It manages:
+- Resolving the config folder relative to the game itself, so the game runs from any working directory and on any OS.
+- Parsing the enemy drops, shop inventory and shop needs files into read-only tables of named tuples, and
+  the game settings file into a read-only table of settings.
+- Watching the modification time of each file and reloading only the files that changed, from a background thread.
+
+The tables are loaded on first use if `LoadConfig` hasn't been called yet, which lets the simulators use
+them without starting the game.
+
+Functions:
+- ParseDrops: Parses the enemy drops file, keeping the first drop listed for each enemy type.
+- ParseShopItems: Parses a shop file, one `Item Name, Min Price, Max Price` per line.
+- ParseSettings: Parses the game settings file, one `name = value` per line.
+- LoadConfigFile: Loads a single config file into memory, replacing the table it was loaded into before.
+- LoadConfig: Loads every config file into memory.
+- ReloadChangedConfig: Reloads the config files that changed since they were loaded.
+- StartConfigWatcher: Starts a background thread that reloads config files when they change.
+- GetConfigTable: Returns a loaded config table, loading it first if needed.
+- GetDropTable: Returns the enemy drop table.
+- GetShopInventory: Returns the items the shop sells.
+- GetShopNeeds: Returns the items the shop buys.
+- GetGameSettings: Returns the game settings.
+'''
+
+from src.modules.TraceHandler import Traced
+
+from types import MappingProxyType
+from typing import NamedTuple
+
+import os
+import threading
+import time
+
+config_directory = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'config')
+
+class DropEntry(NamedTuple):
+    """
+    The item an enemy type drops, and how many of it.
+    """
+
+    enemy_type: str
+    name: str
+    min_count: int
+    max_count: int
+
+class ShopEntry(NamedTuple):
+    """
+    An item the shop deals in, and the range its price is picked from.
+    """
+
+    name: str
+    min_price: int
+    max_price: int
+
+def ParseDrops(file) -> MappingProxyType:
+    """
+    Parses the enemy drops file, keeping the first drop listed for each enemy type.
+    """
+
+    drops = {}
+
+    for line in file:
+        parts = line.strip().split(',')
+
+        if len(parts) == 4:
+            entry = DropEntry(parts[0].strip(), parts[1].strip(), int(parts[2].strip()), int(parts[3].strip()))
+            drops.setdefault(entry.enemy_type, entry)
+
+    return MappingProxyType(drops)
+
+def ParseShopItems(file) -> tuple:
+    """
+    Parses a shop file, one `Item Name, Min Price, Max Price` per line.
+    """
+
+    items = []
+
+    for line in file:
+        if line.strip():
+            name, min_price, max_price = line.strip().split(', ')
+            items.append(ShopEntry(name, int(min_price), int(max_price)))
+
+    return tuple(items)
+
+def ParseSettings(file) -> MappingProxyType:
+    """
+    Parses the game settings file, one `name = value` per line. Blank lines, lines starting with `#` and lines
+    without a `=` are skipped.
+    """
+
+    settings = {}
+
+    for line in file:
+        name, separator, value = line.strip().partition('=')
+
+        if separator and name.strip() and not name.startswith('#'):
+            settings[name.strip()] = value.strip()
+
+    return MappingProxyType(settings)
+
+config_files = {
+    'enemy_drops': ('enemyDrops.txt', ParseDrops),
+    'shop_inventory': ('shopInventory.txt', ParseShopItems),
+    'shop_needs': ('shopNeeds.txt', ParseShopItems),
+    'game_settings': ('gameSettings.txt', ParseSettings)
+}
+
+# Loaded tables and the modification times of the files they were loaded from, keyed by config name
+config_tables = {}
+config_modified_times = {}
+config_lock = threading.Lock()
+
+@Traced('LoadConfigFile', 'config')
+def LoadConfigFile(config_name: str) -> None:
+    """
+    Loads a single config file into memory, replacing the table it was loaded into before.
+
+    Parameters:
+        config_name (str): The name of the config file in `config_files`.
+    """
+
+    file_name, parse = config_files[config_name]
+    file_path = os.path.join(config_directory, file_name)
+    modified_time = os.stat(file_path).st_mtime_ns
+
+    with open(file_path, 'r') as file:
+        table = parse(file)
+
+    # Tables are swapped in whole, readers either see the old table or the new one
+    config_tables[config_name] = table
+    config_modified_times[config_name] = modified_time
+
+def LoadConfig() -> None:
+    """
+    Loads every config file into memory.
+    """
+
+    with config_lock:
+        for config_name in config_files:
+            LoadConfigFile(config_name)
+
+def ReloadChangedConfig() -> list:
+    """
+    Reloads the config files that changed since they were loaded.
+
+    Returns:
+        reloaded (list): The names of the config files that were reloaded.
+    """
+
+    reloaded = []
+
+    with config_lock:
+        for config_name, (file_name, _) in config_files.items():
+            try:
+                modified_time = os.stat(os.path.join(config_directory, file_name)).st_mtime_ns
+            except OSError:
+                continue    # Keep the last good table while the file is missing (e.g. being saved)
+
+            if config_modified_times.get(config_name) != modified_time:
+                try:
+                    LoadConfigFile(config_name)
+                except (OSError, ValueError):
+                    continue    # Keep the last good table if the file is half written or malformed
+
+                reloaded.append(config_name)
+
+    return reloaded
+
+def StartConfigWatcher(interval: float = 2.0) -> threading.Thread:
+    """
+    Starts a background thread that reloads config files when they change.
+
+    Parameters:
+        interval (float): Seconds to wait between checks of the config files.
+
+    Returns:
+        watcher (threading.Thread): The watcher thread, which stops when the game exits.
+    """
+
+    def watch():
+        while True:
+            time.sleep(interval)
+            ReloadChangedConfig()
+
+    watcher = threading.Thread(target = watch, name = "ConfigWatcher", daemon = True)
+    watcher.start()
+
+    return watcher
+
+def GetConfigTable(config_name: str):
+    """
+    Returns a loaded config table, loading it first if needed.
+    """
+
+    table = config_tables.get(config_name)
+
+    if table is None:
+        with config_lock:
+            if config_name not in config_tables:
+                LoadConfigFile(config_name)
+
+        table = config_tables[config_name]
+
+    return table
+
+def GetDropTable() -> MappingProxyType:
+    """
+    Returns the enemy drop table.
+
+    Returns:
+        drop_table (MappingProxyType): The `DropEntry` of each enemy type, keyed by enemy type.
+    """
+
+    return GetConfigTable('enemy_drops')
+
+def GetShopInventory() -> tuple:
+    """
+    Returns the items the shop sells.
+
+    Returns:
+        shop_inventory (tuple): A `ShopEntry` for each item the shop sells.
+    """
+
+    return GetConfigTable('shop_inventory')
+
+def GetShopNeeds() -> tuple:
+    """
+    Returns the items the shop buys.
+
+    Returns:
+        shop_needs (tuple): A `ShopEntry` for each item the shop buys.
+    """
+
+    return GetConfigTable('shop_needs')
+
+def GetGameSettings() -> MappingProxyType:
+    """
+    Returns the game settings.
+
+    Returns:
+        game_settings (MappingProxyType): The value of each setting, keyed by setting name.
+    """
+
+    return GetConfigTable('game_settings')
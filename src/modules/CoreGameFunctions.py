@@ -11,26 +11,36 @@ Functions:
 - ReturnToGame: Resets user input and facilitates returning to the main game menu.
 '''
 
+from src.modules.ScreenRenderer import NewFrame
+from src.modules.InputProvider import ReadInput
+from src.modules.TraceHandler import Traced
+
 import os
 
 def ConsoleInput() -> str:
     """
     Prompts the user for input and returns it in a formatted manner.
+
+    The answer comes from the console, or from an input script (see `InputProvider`).
     
     Returns:
         user_input(str): The string entered by the user.
     """
 
-    user_input = str(input(" > "))
+    user_input = str(ReadInput(" > "))
 
     return user_input
 
+@Traced('ClearConsole', 'render')
 def ClearConsole()-> None:
     """
     Clears the console screen for a clean display.
+
+    When the renderer is running, this only starts a new frame (see `ScreenRenderer`), otherwise the screen is cleared by the shell.
     """
 
-    os.system('cls' if os.name == 'nt' else 'clear')
+    if not NewFrame():
+        os.system('cls' if os.name == 'nt' else 'clear')
 
 def ReturnToGame(user_input: str) -> str:
     """
@@ -0,0 +1,33 @@
+'''
+Enemy drops for Console Quest RPG.
+
+This module rolls the loot an enemy drops from the enemy drop table kept in memory by `ConfigHandler`,
+so spawning an enemy never reads the drops file. Each enemy type drops the first item listed for it in
+`config/enemyDrops.txt`, in a random quantity within the range listed for that item.
+
+Functions:
+- RollDrops: Rolls the items dropped by an enemy of the given type.
+'''
+
+from src.modules.ConfigHandler import GetDropTable
+
+import random
+
+def RollDrops(enemy_type: str, rng = random) -> dict:
+    """
+    Rolls the items dropped by an enemy of the given type.
+
+    Parameters:
+        enemy_type (str): The type of the enemy.
+        rng (random.Random): Source of randomness, so drops can be seeded.
+
+    Returns:
+        drops (dict): The item dropped by the enemy and how many of it, keyed by item name (empty if the enemy drops nothing).
+    """
+
+    drop = GetDropTable().get(enemy_type)
+
+    if drop is None:
+        return {}
+
+    return {drop.name: {'type': enemy_type, 'name': drop.name, 'count': rng.randint(drop.min_count, drop.max_count)}}
@@ -0,0 +1,238 @@
+'''
+Exact encounter odds for Console Quest RPG, computed instead of simulated.
+
+This module treats an encounter as a Markov chain over combat states (player health, mana and stamina,
+enemy health, mana and stamina, and the turn). Each turn branches on the same outcomes `StartEncounter`
+can produce - critical hits, regular hits, dodges, weakened attacks, the enemy picking melee or magic,
+and the player running away - weighted by the crit and dodge chances the player and enemy already expose.
+Dynamic programming over those states gives the exact win, loss, flee and draw probabilities and the
+expected length of the fight, with none of the noise of `CombatSimulator`.
+
+Walking the full chain is far too slow to do before every encounter, but it never has to be. The player's
+attacks only depend on the player's own mana and stamina, and the enemy's attacks only on the enemy's, so
+the chain splits into two independent chains that only meet when one side dies (or the player flees):
+- The player chain tracks (enemy health, player mana, player stamina) across the player's actions.
+- The enemy chain tracks (player health, enemy mana, enemy stamina) across the enemy's actions.
+Each chain is walked forward one action at a time, merging every path that reaches the same state, and the
+two resulting timelines are then combined on the shared turn order to get the exact outcome of the fight.
+
+Health, mana and stamina are kept as whole hundredths, which is exact for every value combat can produce
+(regeneration is a multiple of 0.03 and weakened attacks deal multiples of 0.25) and stops float noise
+from splitting equal states. The live game adds up regeneration as floats, which can leave stamina a hair
+under a cost it should exactly meet (12.999999 against 13), so `CombatSimulator` may drift from these odds
+by a fraction of a percent on builds that hit that edge. States whose probability drops below a negligible
+threshold are folded into the draw probability instead of being expanded for hundreds more turns.
+The player follows the default strategy of `CombatSimulator.ChooseAction`.
+
+Functions:
+- CalculateEncounterOdds: Computes the exact outcome probabilities and expected turns of an encounter.
+'''
+
+from src.modules.CombatSimulator import ThresholdProbability, SpawnEnemy
+
+from collections import defaultdict
+
+def CalculateEncounterOdds(player, enemy = None, flee_threshold: float = 0.0, max_turns: int = 200, negligible: float = 1e-12) -> dict:
+    """
+    Computes the exact outcome probabilities and expected turns of an encounter.
+
+    Parameters:
+        player (Player): The character fighting the encounter. Their current stats are used as the starting point.
+        enemy (Enemy, str or None): An existing enemy, the type of enemy to spawn, or None for a random type.
+        flee_threshold (float): Health ratio under which the player runs away (when fast enough).
+        max_turns (int): Turns after which an unfinished fight is counted as a draw.
+        negligible (float): Probability under which a combat state is dropped (and counted as a draw).
+
+    Returns:
+        odds (dict): The 'win', 'loss', 'flee' and 'draw' probabilities, the 'expected_turns' of the fight, and the number of combat 'states' explored.
+    """
+
+    def hundredths(value):
+        return int(round(value * 100))
+
+    def attack_branches(attacker, cost, damage, weakened_damage = None):
+        """
+        Lists the (probability, damage, resource spent) branches of an attack when the attacker can pay
+        for it, and when they can't. Spells (no weakened damage) do nothing without enough mana.
+        """
+
+        crit = ThresholdProbability(attacker.critical_chance)
+        dodge = ThresholdProbability(attacker.dodge_chance)
+        ready = (
+            (crit, hundredths(attacker.critical_hit), cost),
+            ((1 - crit) * (1 - dodge), hundredths(damage), cost),
+            ((1 - crit) * dodge, 0, 0)
+        )
+        exhausted = ((1.0, hundredths(weakened_damage) if weakened_damage is not None else 0, 0),)
+
+        return tuple(branch for branch in ready if branch[0] > 0), exhausted
+
+    if player.stats['Health'] <= 0:
+        return {'win': 0.0, 'loss': 0.0, 'flee': 0.0, 'draw': 1.0, 'expected_turns': 0.0, 'states': 0}
+
+    enemy = SpawnEnemy(player, enemy)
+
+    player_mana_cost = hundredths(player.mana_cost)
+    player_stamina_cost = hundredths(player.stamina_cost)
+    enemy_mana_cost = hundredths(enemy.mana_cost)
+    enemy_stamina_cost = hundredths(enemy.stamina_cost)
+    player_max_mana = hundredths(player.max_stats['Mana'])
+    player_max_stamina = hundredths(player.max_stats['Stamina'])
+    # Two turns pass between the player's actions, so they recover twice in between
+    mana_recovery = 2 * hundredths(round(player.attributes['Willpower'] * 0.03, 2))
+    stamina_recovery = 2 * hundredths(round(player.attributes['Endurance'] * 0.03, 2))
+    player_goes_first = player.attributes['Speed'] >= enemy.attributes['Speed']
+    player_can_run = player.attributes['Speed'] > enemy.attributes['Speed']
+    flee_health = player.max_stats['Health'] * flee_threshold * 100 if player_can_run else float('-inf')
+
+    player_melee = attack_branches(player, player_stamina_cost, max(0, player.physical_attack - enemy.physical_defense), max(0, player.physical_attack * 0.75 - enemy.physical_defense))
+    player_spell = attack_branches(player, player_mana_cost, max(0, player.magical_attack - enemy.magical_defense))
+    enemy_melee = attack_branches(enemy, enemy_stamina_cost, max(0, enemy.physical_attack - player.physical_defense), max(0, enemy.physical_attack * 0.75 - player.physical_defense))
+    enemy_spell = attack_branches(enemy, enemy_mana_cost, max(0, enemy.magical_attack - player.magical_defense))
+
+    # The player's k-th action and the enemy's j-th action happen on these turns (the slower side skips turn 1)
+    def player_turn(action):
+        return 2 * action - 1 if player_goes_first else 2 * action + 1
+
+    def enemy_turn(action):
+        return 2 * action
+
+    def player_actions_until(turn_counter):
+        return max(0, (turn_counter + 1) // 2 if player_goes_first else (turn_counter - 1) // 2)
+
+    player_actions = player_actions_until(max_turns)
+    enemy_actions = max_turns // 2
+    states = 0
+
+    # Player chain: probability that the player's k-th action is the one that kills the enemy
+    kill_on_action = [0.0] * (player_actions + 1)
+    mana = hundredths(player.stats['Mana'])
+    stamina = hundredths(player.stats['Stamina'])
+
+    if not player_goes_first:
+        mana = min(mana + mana_recovery, player_max_mana)
+        stamina = min(stamina + stamina_recovery, player_max_stamina)
+
+    distribution = {(hundredths(enemy.stats['Health']), mana, stamina): 1.0}
+
+    for action in range(1, player_actions + 1):
+        if not distribution:
+            break
+
+        states += len(distribution)
+        next_distribution = defaultdict(float)
+
+        for (enemy_health, mana, stamina), probability in distribution.items():
+            if stamina >= player_stamina_cost or mana < player_mana_cost:
+                branches = player_melee[0] if stamina >= player_stamina_cost else player_melee[1]
+                spends_stamina = True
+            else:
+                branches = player_spell[0]
+                spends_stamina = False
+
+            for chance, dealt, spent in branches:
+                chance *= probability
+
+                if enemy_health - dealt <= 0:
+                    kill_on_action[action] += chance
+                elif spends_stamina:
+                    next_distribution[(enemy_health - dealt, min(mana + mana_recovery, player_max_mana), min(stamina - spent + stamina_recovery, player_max_stamina))] += chance
+                else:
+                    next_distribution[(enemy_health - dealt, min(mana - spent + mana_recovery, player_max_mana), min(stamina + stamina_recovery, player_max_stamina))] += chance
+
+        distribution = {state: probability for state, probability in next_distribution.items() if probability >= negligible}
+
+    # Enemy chain: probability that the enemy's j-th action kills the player, or leaves them low enough to flee
+    death_on_action = [0.0] * (enemy_actions + 1)
+    flee_after_action = [0.0] * (enemy_actions + 1)
+    player_health = hundredths(player.stats['Health'])
+
+    if player_goes_first and player_health < flee_health:
+        flee_after_action[0] = 1.0
+        distribution = {}
+    else:
+        distribution = {(player_health, hundredths(enemy.stats['Mana']), hundredths(enemy.stats['Stamina'])): 1.0}
+
+    for action in range(1, enemy_actions + 1):
+        if not distribution:
+            break
+
+        states += len(distribution)
+        next_distribution = defaultdict(float)
+
+        for (player_health, mana, stamina), probability in distribution.items():
+            for chance, dealt, spent in enemy_melee[0] if stamina >= enemy_stamina_cost else enemy_melee[1]:
+                chance *= 0.5 * probability
+
+                if player_health - dealt <= 0:
+                    death_on_action[action] += chance
+                elif player_health - dealt < flee_health:
+                    flee_after_action[action] += chance
+                else:
+                    next_distribution[(player_health - dealt, mana, stamina - spent)] += chance
+
+            for chance, dealt, spent in enemy_spell[0] if mana >= enemy_mana_cost else enemy_spell[1]:
+                chance *= 0.5 * probability
+
+                if player_health - dealt <= 0:
+                    death_on_action[action] += chance
+                elif player_health - dealt < flee_health:
+                    flee_after_action[action] += chance
+                else:
+                    next_distribution[(player_health - dealt, mana - spent, stamina)] += chance
+
+        distribution = {state: probability for state, probability in next_distribution.items() if probability >= negligible}
+
+    # Combine both timelines on the shared turn order, the earliest event ends the fight
+    win = loss = flee = draw = expected_turns = 0.0
+    killed_by = [0.0] * (player_actions + 1)    # probability the player has killed the enemy by their k-th action
+
+    for action in range(1, player_actions + 1):
+        killed_by[action] = killed_by[action - 1] + kill_on_action[action]
+
+    def add_enemy_event(probability, event_turn, outcome):
+        """
+        Splits the probability of an enemy-side event between the player winning first and the event happening.
+        """
+
+        nonlocal win, loss, flee, draw, expected_turns
+
+        if probability == 0:
+            return
+
+        earlier_actions = player_actions_until(min(event_turn, max_turns + 1) - 1)
+
+        for action in range(1, earlier_actions + 1):
+            win += probability * kill_on_action[action]
+            expected_turns += probability * kill_on_action[action] * player_turn(action)
+
+        remaining = probability * (1 - killed_by[earlier_actions])
+
+        if outcome == 'loss':
+            loss += remaining
+        elif outcome == 'flee':
+            flee += remaining
+        else:
+            draw += remaining
+
+        expected_turns += remaining * min(event_turn, max_turns)
+
+    for action in range(1, enemy_actions + 1):
+        add_enemy_event(death_on_action[action], enemy_turn(action), 'loss')
+
+    for action in range(0, enemy_actions + 1):
+        # The player runs on their first turn after the enemy's action, if it still fits in the fight
+        flee_turn = player_turn(action + 1 if player_goes_first else action)
+        add_enemy_event(flee_after_action[action], flee_turn, 'flee' if flee_turn <= max_turns else 'draw')
+
+    # The enemy never finishes the player (or scares them off) within the turn limit
+    add_enemy_event(max(0.0, 1 - sum(death_on_action) - sum(flee_after_action)), max_turns + 1, 'draw')
+
+    return {
+        'win': win,
+        'loss': loss,
+        'flee': flee,
+        'draw': draw,
+        'expected_turns': expected_turns,
+        'states': states
+    }
@@ -7,11 +7,16 @@ It includes functions to manage player character creation and interactions
 with saved game files. The game supports basic ASCII art for a visual 
 presentation and aims to provide a text-based RPG experience.
 
+The main menu is drawn as soon as the game starts, so the save modules and character creation are only
+imported by the functions that use them.
+
 Functions:
 - AboutGame: Displays some information and background about the game, how to play, etc.
 - DeleteGame: Deletes an existing saved game.
 - LoadGame: Loads a saved character from a file.
 - SaveGame: Saves the current player character to a file.
+- AutosaveGame: Autosaves the current player character, only journaling what changed since the last save.
+- ReportSaveErrors: Tells the player about the saves that failed to write.
 - GetGender: Prompts the user to select the player's gender.
 - GetName: Prompts the user to enter the player's name.
 - NewGame: Initializes a new game with character attributes.
@@ -19,13 +24,13 @@ Functions:
 
 from src.modules.CoreGameFunctions import ClearConsole
 from src.modules.ArtAssets import DisplayDragon, DisplayPlanet, DisplayStars, DisplayBattleAxe
-from src.modules.CharacterCreation import SelectRace, SelectBirthsign, SelectClass
 from src.modules.MainMenu import MenuLine, ReturnToMainMenu
+from src.modules.InputProvider import ReadInput
+from src.modules.TraceHandler import Traced
 
 from src.classes.Player import Player # Change either to Player or old_Player
 
 import os
-import pickle
 
 def AboutGame() -> None:
     """
@@ -54,32 +59,34 @@ def DeleteGame() -> None:
     Deletes an existing saved game.
     """
 
+    from src.modules.SaveCatalog import DescribeEntry
+    from src.modules.SaveStore import ListStoredSaves, DeleteStoredSave
+    from src.modules.SaveWriter import FlushSaves
+
     ClearConsole()
     DisplayDragon()
 
-    saves_directory = "saves"
-
-    if not os.path.exists(saves_directory) or not os.path.isdir(saves_directory):
-        print("No saved games found.")
-        return
+    # A save still waiting to be written would bring the deleted save back
+    ReportSaveErrors(FlushSaves())
 
-    saved_games = [file for file in os.listdir(saves_directory) if os.path.isfile(os.path.join(saves_directory, file))]
+    catalog = ListStoredSaves()
+    saved_games = sorted(catalog)
     
     if not saved_games:
+        print("No saved games found.")
         return ""
     
     MenuLine()
     print(" * Select a save to delete (Enter 0 to cancel):")
     MenuLine()
 
-    for index, game in enumerate(saved_games, start = 1):
-        save_name = os.path.splitext(game)[0]
-        print(f" {index}. {save_name}")
+    for index, save_name in enumerate(saved_games, start = 1):
+        print(f" {index}. {DescribeEntry(save_name, catalog[save_name])}")
 
     MenuLine()
 
     try:
-        choice = int(input(" > "))
+        choice = int(ReadInput(" > "))
     except ValueError:
         print("Invalid input. Please enter a number.")
         return
@@ -91,13 +98,12 @@ def DeleteGame() -> None:
         print(f" * Are you sure you want to delete this save? (Y/N)")
         MenuLine()
         
-        confirm = str(input(" > "))
+        confirm = str(ReadInput(" > "))
         
         MenuLine()
 
         if confirm.lower() == 'y':
-            file_path = os.path.join(saves_directory, selected_game)
-            os.remove(file_path)
+            DeleteStoredSave(selected_game)
         elif confirm.lower() == 'n':
             return ""
         else:
@@ -110,12 +116,16 @@ def LoadGame() -> None:
     Loads a saved character from a file.
     """
 
-    saves_directory = 'saves\\'
+    from src.modules.SaveCatalog import DescribeEntry
+    from src.modules.SaveStore import ListStoredSaves, LoadStoredSave
+    from src.modules.SaveWriter import FlushSaves
 
     ClearConsole()
     DisplayDragon()
 
-    save_files = [file for file in os.listdir(saves_directory) if file.endswith('.pkl')]
+    ReportSaveErrors(FlushSaves())
+    catalog = ListStoredSaves()
+    save_files = sorted(catalog)
 
     if not save_files:
         MenuLine()
@@ -131,14 +141,13 @@ def LoadGame() -> None:
     MenuLine()
     print(" * Choose a saved character to load:")
     MenuLine()
-    for index, save_file in enumerate(save_files, start = 1):
-        player_save = os.path.splitext(save_file)[0]
-        print(f" {index}. {player_save}")
+    for index, player_save in enumerate(save_files, start = 1):
+        print(f" {index}. {DescribeEntry(player_save, catalog[player_save])}")
 
     while True:
         try:
             MenuLine()
-            choice = int(input(" > "))
+            choice = int(ReadInput(" > "))
             if 0 <= choice <= len(save_files):
                 break
             else:
@@ -148,23 +157,82 @@ def LoadGame() -> None:
             MenuLine()
             print(" * Invalid input. Please enter a number.")
 
-    selected_save_file = save_files[choice - 1]
+    selected_save = save_files[choice - 1]
 
-    with open(os.path.join(saves_directory, selected_save_file), 'rb') as file:
-        player = pickle.load(file)
-
-    return player
+    try:
+        return LoadStoredSave(selected_save)
+    except (OSError, ValueError) as error:
+        MenuLine()
+        print(f" * The save of {selected_save} could not be loaded: {error}")
+        MenuLine()
+        ReturnToMainMenu()
+        return None
 
+@Traced('SaveGame', 'saves')
 def SaveGame(player: Player) -> None:
     """
     Saves the current player character to a file.
+
+    The save is written in the background (see `SaveWriter`), so the game never waits on the disk. It goes to
+    the saves folder or the save database, depending on the selected backend (see `SaveStore`).
     
     Parameters:
         player (Player): The character that will be saved.
     """
 
-    with open('saves\\' + player.name + '.pkl', 'wb') as file:
-        pickle.dump(player, file)
+    from src.modules.SaveWriter import QueueSave, TakeSaveErrors
+
+    try:
+        QueueSave(player)
+    except ValueError as error:
+        ReportSaveErrors([(player.name, error)])
+
+    ReportSaveErrors(TakeSaveErrors())
+
+@Traced('AutosaveGame', 'saves')
+def AutosaveGame(player: Player) -> None:
+    """
+    Autosaves the current player character, only journaling what changed since the last save.
+
+    Autosaves are cheap enough to make after every fight (see `SaveJournal`), and are written in the
+    background like any other save.
+
+    Parameters:
+        player (Player): The character that will be saved.
+    """
+
+    from src.modules.SaveWriter import QueueSave, TakeSaveErrors
+
+    try:
+        QueueSave(player, full_save = False)
+    except ValueError as error:
+        ReportSaveErrors([(player.name, error)])
+
+    ReportSaveErrors(TakeSaveErrors())
+
+def ReportSaveErrors(errors: list) -> None:
+    """
+    Tells the player about the saves that failed to write, and waits for them to read it.
+
+    Saves are written in the background, so their errors only come back with a later save or flush. Saves
+    that failed to write are tried again by the writer (see `SaveWriter`), a name that can't be saved never is.
+
+    Parameters:
+        errors (list): The (file path, error) of every save that failed to write.
+    """
+
+    if not errors:
+        return
+
+    MenuLine()
+
+    for file_path, error in errors:
+        print(f" * Saving {os.path.basename(file_path)} failed: {error}")
+
+    print(" * Press enter to continue...")
+    MenuLine()
+
+    ReadInput(" > ")
         
 def GetGender(name: str) -> str:
     """
@@ -186,7 +254,7 @@ def GetGender(name: str) -> str:
     print(" 1. Male\n 2. Female\n 3. Non-Binary\n 4. Transgender")
     MenuLine()
 
-    gender = input(" > ")
+    gender = ReadInput(" > ")
 
     if gender == '1':
         gender = 'Male'
@@ -205,12 +273,14 @@ def GetGender(name: str) -> str:
         
 def GetName() -> str:
     """
-    Prompts the user to enter the player's name.
+    Prompts the user to enter the player's name, until they enter one that can be saved (see `IsValidSaveName`).
     
     Returns:
         name (string): Name of the player.
     """
 
+    from src.modules.SaveFormat import IsValidSaveName, max_name_length
+
     nothing_entered = ""
     
     DisplayDragon()
@@ -220,11 +290,18 @@ def GetName() -> str:
     print(" * Enter thy name:")
     MenuLine()
 
-    name = input(" > ")
+    name = ReadInput(" > ")
 
     if name == nothing_entered:
         name = 'Player'
 
+    while not IsValidSaveName(name):
+        MenuLine()
+        print(f" * Thy name must be at most {max_name_length} characters, without slashes, colons, control characters or a leading dot.")
+        MenuLine()
+
+        name = ReadInput(" > ") or 'Player'
+
     ClearConsole()
     
     return name
@@ -238,6 +315,8 @@ def NewGame() -> tuple[str, str, str, str, str, list]:
         character's name, gender, race, birth sign, class, and a list of attributes.
     """
 
+    from src.modules.CharacterCreation import SelectRace, SelectBirthsign, SelectClass
+
     ClearConsole()
     
     name = GetName()
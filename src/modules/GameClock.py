@@ -0,0 +1,103 @@
+'''
+Virtual game clock for Console Quest RPG.
+
+The game pauses in a few places so the player can follow what is happening: while an enemy makes its
+decision, after a fight, while exploring, while resting and before returning to the main menu after
+dying. Every one of these pauses goes through `Wait`, which:
+- Shows whatever is on screen before pausing (see `ScreenRenderer`).
+- Advances the in-game clock by the full length of the pause, whatever the pacing.
+- Sleeps for the length of the pause scaled by the pacing profile: `normal` waits as long as it always has,
+  `fast` a quarter of that, and `zero` doesn't wait at all (for automated runs and testing).
+
+The pacing profile is picked by `SetPacing`, the `CQ_PACING` environment variable, or the `pacing` setting
+in `config/gameSettings.txt`, in that order, and is `normal` otherwise. An unknown pacing in the environment
+or the game settings (which are reloaded while the game runs) falls back to `normal` with a warning, only
+`SetPacing` rejects it.
+
+Functions:
+- GetPacing: Returns the name of the pacing profile in use.
+- SetPacing: Picks the pacing profile, overriding the environment and the game settings.
+- Wait: Pauses the game, advancing the in-game clock.
+- GameTime: Returns how many seconds have passed on the in-game clock.
+'''
+
+from src.modules.ConfigHandler import GetGameSettings
+
+import os
+import sys
+import threading
+import time
+
+# Fraction of every pause that is actually waited, by pacing profile
+pacing_profiles = {
+    'normal': 1.0,
+    'fast': 0.25,
+    'zero': 0.0
+}
+
+clock_state = {'pacing': None, 'game_time': 0.0}
+clock_lock = threading.Lock()
+# Unknown pacings already warned about, so a typo in the settings is reported once instead of at every pause
+unknown_pacings = set()
+
+def GetPacing() -> str:
+    """
+    Returns the name of the pacing profile in use.
+
+    Returns:
+        pacing (str): One of `pacing_profiles`, `normal` if the environment or the game settings name an unknown one.
+    """
+
+    pacing = clock_state['pacing'] or os.environ.get('CQ_PACING') or GetGameSettings().get('pacing', 'normal')
+    pacing = pacing.strip().lower()
+
+    if pacing not in pacing_profiles:
+        if pacing not in unknown_pacings:
+            unknown_pacings.add(pacing)
+            print(f"Unknown pacing '{pacing}', expected one of {', '.join(pacing_profiles)}. Using normal pacing.", file = sys.stderr)
+
+        return 'normal'
+
+    return pacing
+
+def SetPacing(pacing: str = None) -> None:
+    """
+    Picks the pacing profile, overriding the environment and the game settings.
+
+    Parameters:
+        pacing (str): One of `pacing_profiles`, or None to go back to the environment and the game settings.
+    """
+
+    if pacing is not None and pacing not in pacing_profiles:
+        raise ValueError(f"Unknown pacing '{pacing}', expected one of {', '.join(pacing_profiles)}.")
+
+    clock_state['pacing'] = pacing
+
+def Wait(seconds: float) -> None:
+    """
+    Pauses the game, advancing the in-game clock.
+
+    Parameters:
+        seconds (float): Length of the pause at normal pacing, in seconds.
+    """
+
+    sys.stdout.flush()
+
+    with clock_lock:
+        clock_state['game_time'] += seconds
+
+    delay = seconds * pacing_profiles[GetPacing()]
+
+    if delay > 0:
+        time.sleep(delay)
+
+def GameTime() -> float:
+    """
+    Returns how many seconds have passed on the in-game clock.
+
+    Returns:
+        game_time (float): The total length of every pause so far, at normal pacing.
+    """
+
+    with clock_lock:
+        return clock_state['game_time']
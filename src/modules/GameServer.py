@@ -0,0 +1,301 @@
+'''
+Multi-session game server for Console Quest RPG.
+
+This module hosts the game over TCP, so many players can play on one machine at once, each with a game of
+their own, from `telnet` or `nc`:
+- The server accepts and reads every connection with `asyncio`, so idle players only cost a coroutine
+  waiting on their socket.
+- Every connected player gets the main menu (`RunMainMenu`) in a thread of its own. Whatever the thread
+  prints is drawn on the player's connection by a frame buffer of its own (see `ScreenRenderer`), and its
+  prompts are answered by the lines the player sends (see `InputProvider`).
+- The game's pauses (see `GameClock`) only hold up the thread of the session waiting, never the server.
+- The output of a session is sent from the event loop. A session whose player stops reading waits for its
+  connection to drain, instead of piling up output.
+- A player that disconnects ends their session where it stands, like closing the game would.
+
+Run the server from the root folder of the game with:
+    python -m src.modules.GameServer --port 4000
+    telnet localhost 4000
+
+Functions:
+- SessionClosedError: Raised in a session thread once its player has disconnected.
+- Session: A player connected to the server, and the byte stream their game is drawn on.
+- StripTelnetCommands: Removes the telnet negotiation commands from the bytes a player sent.
+- RunSession: Runs the main menu for a connected player, in the thread of the session.
+- HandleConnection: Serves a connection, from the moment the player connects until they disconnect.
+- PrepareSessions: Loads the configuration and sets up the session threads, once per server process.
+- ServeSocket: Serves a connection accepted by another process (see `ServerSupervisor`).
+- RunServer: Accepts connections and serves them until the server is stopped.
+- main: Parses the command line arguments and runs the server.
+'''
+
+from src.modules.Launcher import RunMainMenu
+from src.modules.ConfigHandler import LoadConfig, StartConfigWatcher
+from src.modules.ScreenRenderer import StartSessionRenderer, StopSessionRenderer
+from src.modules.InputProvider import UseSessionInput
+
+import argparse
+import asyncio
+import functools
+import io
+import os
+import queue
+import socket
+import threading
+import traceback
+
+session_stack_size = 512 * 1024     # Bytes of stack for each session thread, the game never recurses deeply
+write_buffer_limit = 64 * 1024      # Bytes of output a session may have waiting to be sent before it waits for the player
+max_line_length = 4096              # Longest line a player can send
+
+server_state = {'open': 0, 'total': 0, 'refused': 0}
+
+class SessionClosedError(ConnectionError):
+    """
+    Raised in a session thread once its player has disconnected.
+    """
+
+class Session(io.RawIOBase):
+    """
+    A player connected to the server, and the byte stream their game is drawn on.
+
+    Bytes written to the session are sent down the connection by the event loop, with every line ending turned
+    into the CRLF that terminals expect.
+
+    Args:
+        loop (asyncio.AbstractEventLoop): The event loop serving the connection.
+        writer (asyncio.StreamWriter): The writing end of the connection.
+        number (int): Number of the session, counting every session the server has served.
+
+    Attributes:
+        answers (queue.SimpleQueue): The lines the player sent that haven't been read yet (None once the player disconnected).
+        connected (bool): Whether the player is still connected.
+        stream (io.TextIOWrapper): Text stream over the connection, for the frame buffer of the session.
+    """
+
+    def __init__(self, loop, writer, number):
+        super().__init__()
+        self.loop = loop
+        self.writer = writer
+        self.number = number
+        self.answers = queue.SimpleQueue()
+        self.connected = True
+        self.stream = io.TextIOWrapper(io.BufferedWriter(self), encoding = 'utf-8', errors = 'replace', write_through = True)
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if not self.connected:
+            raise SessionClosedError(f"Session {self.number} is closed.")
+
+        asyncio.run_coroutine_threadsafe(self.Send(bytes(data).replace(b'\n', b'\r\n')), self.loop).result()
+
+        return len(data)
+
+    async def Send(self, data: bytes) -> None:
+        """
+        Sends bytes down the connection, on the event loop, waiting for the player to read them if too much
+        output is waiting to be sent.
+
+        Parameters:
+            data (bytes): The bytes to send.
+        """
+
+        self.writer.write(data)
+
+        if self.writer.transport.get_write_buffer_size() > write_buffer_limit:
+            await self.writer.drain()
+
+    def ReadLine(self) -> str:
+        """
+        Waits for the next line the player sends.
+
+        Returns:
+            line (str): The line, without its line ending.
+        """
+
+        line = self.answers.get()
+
+        if line is None:
+            raise SessionClosedError(f"The player of session {self.number} disconnected.")
+
+        return line
+
+    def Disconnect(self) -> None:
+        """
+        Closes the connection of the session, from any thread.
+        """
+
+        self.connected = False
+        self.loop.call_soon_threadsafe(self.writer.close)
+
+def StripTelnetCommands(data: bytes) -> bytes:
+    """
+    Removes the telnet negotiation commands from the bytes a player sent.
+
+    Parameters:
+        data (bytes): The bytes the player sent.
+
+    Returns:
+        data (bytes): The bytes without any telnet command.
+    """
+
+    if b'\xff' not in data:
+        return data
+
+    output = bytearray()
+    index = 0
+
+    while index < len(data):
+        if data[index] != 0xFF:
+            output.append(data[index])
+            index += 1
+            continue
+
+        command = data[index + 1] if index + 1 < len(data) else None
+
+        if command == 0xFF:
+            output.append(0xFF)      # An escaped 255 byte
+            index += 2
+        elif command in (0xFB, 0xFC, 0xFD, 0xFE):
+            index += 3               # WILL, WON'T, DO and DON'T are followed by an option
+        elif command == 0xFA:
+            end = data.find(b'\xff\xf0', index)
+            index = len(data) if end < 0 else end + 2
+        else:
+            index += 2
+
+    return bytes(output)
+
+def RunSession(session: Session, size: os.terminal_size) -> None:
+    """
+    Runs the main menu for a connected player, in the thread of the session.
+
+    Parameters:
+        session (Session): The session.
+        size (os.terminal_size): The size of the player's terminal.
+    """
+
+    UseSessionInput(session.ReadLine)
+    StartSessionRenderer(session.stream, size)
+
+    try:
+        RunMainMenu()
+    except ConnectionError:
+        pass
+    except Exception:
+        traceback.print_exc()
+    finally:
+        try:
+            StopSessionRenderer()
+        except ConnectionError:
+            pass
+
+        UseSessionInput(None)
+        session.Disconnect()
+
+async def HandleConnection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, size: os.terminal_size, max_sessions: int) -> None:
+    """
+    Serves a connection, from the moment the player connects until they disconnect.
+
+    Parameters:
+        reader (asyncio.StreamReader): The reading end of the connection.
+        writer (asyncio.StreamWriter): The writing end of the connection.
+        size (os.terminal_size): The size of the player's terminal.
+        max_sessions (int): The number of sessions the server runs at most, players connecting past it are turned away.
+    """
+
+    if server_state['open'] >= max_sessions:
+        server_state['refused'] += 1
+        writer.write(b"The server is full, please try again later.\r\n")
+        writer.close()
+        return
+
+    server_state['open'] += 1
+    server_state['total'] += 1
+    session = Session(asyncio.get_running_loop(), writer, server_state['total'])
+    threading.Thread(target = RunSession, args = (session, size), name = f"Session-{session.number}", daemon = True).start()
+
+    try:
+        while True:
+            line = await reader.readline()
+
+            if not line:
+                break
+
+            session.answers.put(StripTelnetCommands(line).decode('utf-8', 'replace').rstrip('\r\n'))
+    except (ConnectionError, ValueError):
+        pass     # The player disconnected, or sent a line too long to be an answer
+    finally:
+        server_state['open'] -= 1
+        session.connected = False
+        session.answers.put(None)
+        writer.close()
+
+def PrepareSessions() -> None:
+    """
+    Loads the configuration and sets up the session threads, once per server process.
+    """
+
+    LoadConfig()
+    StartConfigWatcher()
+    threading.stack_size(session_stack_size)
+
+async def ServeSocket(connection: socket.socket, size: os.terminal_size, max_sessions: int) -> None:
+    """
+    Serves a connection accepted by another process (see `ServerSupervisor`).
+
+    Parameters:
+        connection (socket.socket): The connected socket.
+        size (os.terminal_size): The size of the player's terminal.
+        max_sessions (int): The number of sessions the server runs at most.
+    """
+
+    reader, writer = await asyncio.open_connection(sock = connection, limit = max_line_length)
+    await HandleConnection(reader, writer, size, max_sessions)
+
+async def RunServer(host: str = '127.0.0.1', port: int = 4000, size: os.terminal_size = os.terminal_size((80, 24)),
+                    max_sessions: int = 5000) -> None:
+    """
+    Accepts connections and serves them until the server is stopped.
+
+    Parameters:
+        host (str): The address to listen on.
+        port (int): The port to listen on.
+        size (os.terminal_size): The size of the players' terminals.
+        max_sessions (int): The number of sessions the server runs at most.
+    """
+
+    PrepareSessions()
+
+    handler = functools.partial(HandleConnection, size = size, max_sessions = max_sessions)
+    server = await asyncio.start_server(handler, host, port, limit = max_line_length)
+
+    print(f" - Serving Console Quest RPG on {', '.join(str(listener.getsockname()) for listener in server.sockets)}")
+
+    async with server:
+        await server.serve_forever()
+
+def main():
+    """
+    Parses the command line arguments and runs the server.
+    """
+
+    parser = argparse.ArgumentParser(description = "Hosts Console Quest RPG over TCP, a game for every connection.")
+    parser.add_argument('--host', default = '127.0.0.1', help = "address to listen on")
+    parser.add_argument('--port', type = int, default = 4000, help = "port to listen on")
+    parser.add_argument('--columns', type = int, default = 80, help = "width of the players' terminals")
+    parser.add_argument('--lines', type = int, default = 24, help = "height of the players' terminals")
+    parser.add_argument('--max-sessions', type = int, default = 5000, help = "sessions the server runs at most")
+    arguments = parser.parse_args()
+
+    size = os.terminal_size((arguments.columns, arguments.lines))
+
+    try:
+        asyncio.run(RunServer(arguments.host, arguments.port, size, arguments.max_sessions))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+'''
+Startup import budget for Console Quest RPG.
+
+Every session of the game is a new process, so the time it takes to import the game is paid on every
+connection. The launcher only imports what the main menu needs (see `Launcher`), and this module checks
+that it stays that way:
+- The launcher is imported in a fresh interpreter with `python -X importtime`, a few times over, and the
+  median of its cumulative import time is compared with the budget.
+- The modules that are meant to be loaded on first use (combat, the shop, the saves and the in-game screens)
+  must not show up in the import at all.
+
+The check exits with status 1 when the launcher is over budget or imports a deferred module, so it can be
+run as a test. The budget is 35 ms by default. Import times depend on the machine, so a slower machine (a CI
+runner, say) can set a budget of its own with the `CQ_IMPORT_BUDGET` environment variable or `--budget`, in
+milliseconds. Run it from the root folder of the game with:
+    python -m src.modules.ImportBudget
+    python -m src.modules.ImportBudget --budget 35 --runs 9
+    CQ_IMPORT_BUDGET=80 python -m src.modules.ImportBudget
+
+Functions:
+- MeasureImports: Imports a module in a fresh interpreter and returns how long each module it imported took.
+- CheckImportBudget: Checks the startup imports of the game against the budget.
+- main: Parses the command line arguments and runs the check.
+'''
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+startup_module = 'src.modules.Launcher'
+# Milliseconds the launcher may take to import, all of its imports included
+startup_budget = float(os.environ.get('CQ_IMPORT_BUDGET', 35.0))
+
+# Modules only loaded once the game needs them, never when it starts
+deferred_modules = (
+    'src.modules.CombatEncounter',
+    'src.modules.PlayerActions',
+    'src.modules.ShopHandler',
+    'src.modules.StatusBarHandler',
+    'src.modules.CharacterCreation',
+    'src.modules.DropTableHandler',
+    'src.modules.SaveCatalog',
+    'src.modules.SaveFormat',
+    'src.modules.SaveJournal',
+    'src.modules.SaveStore',
+    'src.modules.SaveWriter',
+    'src.classes.Enemy',
+    'pickle',
+    'sqlite3',
+    'json'
+)
+
+root_directory = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def MeasureImports(module: str = startup_module) -> dict:
+    """
+    Imports a module in a fresh interpreter and returns how long each module it imported took.
+
+    Parameters:
+        module (str): The module to import.
+
+    Returns:
+        timings (dict): The (own, cumulative) import time of every module imported, in microseconds, keyed by module name
+            (the modules the interpreter imports when it starts are left out).
+    """
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd = root_directory,
+                            capture_output = True, text = True)
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    timings = {}
+
+    # Lines look like "import time:       self [us] |  cumulative | imported package", nested imports are indented
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        own, cumulative, name = line[len('import time:'):].split('|')
+
+        if not own.strip().isdigit():
+            continue
+
+        # `site` is the last module the interpreter imports when it starts, whatever the game imports comes after
+        if name.strip() == 'site':
+            timings.clear()
+            continue
+
+        timings[name.strip()] = (int(own), int(cumulative))
+
+    return timings
+
+def CheckImportBudget(budget: float = startup_budget, runs: int = 5) -> dict:
+    """
+    Checks the startup imports of the game against the budget.
+
+    Parameters:
+        budget (float): Milliseconds the launcher may take to import.
+        runs (int): Number of times the launcher is imported, the median time is compared with the budget.
+
+    Returns:
+        report (dict): The median import time of the launcher in milliseconds ('time'), the budget, the deferred
+            modules imported anyway ('deferred'), the slowest imports as (name, own time in milliseconds)
+            ('slowest') and whether the check passed ('passed').
+    """
+
+    # The first import compiles anything that changed, which isn't what a player waits on
+    MeasureImports()
+    measurements = [MeasureImports() for _ in range(runs)]
+
+    startup_time = statistics.median(timings[startup_module][1] for timings in measurements) / 1000
+    deferred = sorted(name for name in deferred_modules if any(name in timings for timings in measurements))
+    slowest = sorted(measurements[-1].items(), key = lambda item: item[1][0], reverse = True)[:10]
+
+    return {
+        'time': startup_time,
+        'budget': budget,
+        'deferred': deferred,
+        'slowest': [(name, own / 1000) for name, (own, cumulative) in slowest],
+        'passed': startup_time <= budget and not deferred
+    }
+
+def main():
+    """
+    Parses the command line arguments and runs the check.
+    """
+
+    parser = argparse.ArgumentParser(description = "Checks how long Console Quest RPG takes to import when it starts.")
+    parser.add_argument('--budget', type = float, default = startup_budget, help = "milliseconds the launcher may take to import")
+    parser.add_argument('--runs', type = int, default = 5, help = "number of timed imports")
+    arguments = parser.parse_args()
+
+    report = CheckImportBudget(arguments.budget, arguments.runs)
+
+    print(f" - {startup_module} imports in {report['time']:.1f} ms (budget {report['budget']:.1f} ms)")
+
+    for name, own in report['slowest']:
+        print(f"   {name}: {own:.2f} ms")
+
+    for name in report['deferred']:
+        print(f" - {name} is imported at startup, it should only be loaded on first use")
+
+    print(" - Passed" if report['passed'] else " - Failed")
+    sys.exit(0 if report['passed'] else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+'''
+Input provider for Console Quest RPG.
+
+Every answer the game asks for goes through `ReadInput`, which reads it from the console by default. The
+answers can also come from a script instead, so whole sessions (new game, explore, shop, save...) can run
+unattended, e.g. for soak tests and benchmarks:
+- A script file, one answer per line (an empty line presses enter, lines starting with `#` are skipped).
+- Standard input, when it is piped into the game.
+- Any Python iterable of answers.
+
+Scripted answers are echoed after their prompt, so the output reads like a session played by hand. Once
+the script runs out, the game goes back to reading the console, unless the script is strict: a strict
+script fails with `UnexpectedPromptError` on any prompt it has no answer for, so a script that got out of
+step with the game stops instead of hanging or playing on by hand.
+
+A script can be picked with the `CQ_INPUT_SCRIPT` environment variable (a file path, or `-` for standard
+input), and made strict with `CQ_INPUT_STRICT=1`. Pair it with `CQ_PACING=zero` (see `GameClock`) to run
+at full speed.
+
+Sessions of the game server (see `GameServer`) read their answers from their own connection instead, picked
+for the thread running the session with `UseSessionInput`.
+
+Functions:
+- UnexpectedPromptError: Raised when a strict script has no answer for a prompt.
+- UseInput: Feeds the answers to the game's prompts from an iterable.
+- UseInputScript: Feeds the answers to the game's prompts from a script file, or standard input.
+- UseConsoleInput: Goes back to reading every answer from the console.
+- ConfigureInputFromEnvironment: Feeds the answers from the script picked by the environment, if any.
+- UseSessionInput: Reads the answers to the current thread's prompts with a function, e.g. from a network connection.
+- ReadInput: Reads the answer to a prompt, from the script in use or the console.
+'''
+
+import os
+import sys
+import threading
+
+class UnexpectedPromptError(RuntimeError):
+    """
+    Raised when a strict script has no answer for a prompt.
+    """
+
+input_state = {'answers': None, 'strict': False, 'echo': True, 'answered': 0}
+input_lock = threading.Lock()
+
+# The function each session thread reads its answers with, if any
+session_input = threading.local()
+
+def UseInput(answers, strict: bool = False, echo: bool = True) -> None:
+    """
+    Feeds the answers to the game's prompts from an iterable.
+
+    Parameters:
+        answers (iterable): The answers, in order (read lazily, so it can be a generator).
+        strict (bool): Whether to fail on prompts once the answers run out, instead of reading the console.
+        echo (bool): Whether to print each answer after its prompt.
+    """
+
+    with input_lock:
+        input_state['answers'] = iter(answers)
+        input_state['strict'] = strict
+        input_state['echo'] = echo
+        input_state['answered'] = 0
+
+def UseInputScript(file_path: str, strict: bool = False, echo: bool = True) -> None:
+    """
+    Feeds the answers to the game's prompts from a script file, or standard input.
+
+    Parameters:
+        file_path (str): The path of the script, or `-` for standard input.
+        strict (bool): Whether to fail on prompts once the script runs out, instead of reading the console.
+        echo (bool): Whether to print each answer after its prompt.
+    """
+
+    def read_script():
+        file = sys.stdin if file_path == '-' else open(file_path, 'r', encoding = 'utf-8')
+
+        try:
+            for line in file:
+                if not line.startswith('#'):
+                    yield line.rstrip('\r\n')
+        finally:
+            if file is not sys.stdin:
+                file.close()
+
+    UseInput(read_script(), strict, echo)
+
+def UseConsoleInput() -> None:
+    """
+    Goes back to reading every answer from the console.
+    """
+
+    with input_lock:
+        input_state['answers'] = None
+        input_state['strict'] = False
+
+def ConfigureInputFromEnvironment() -> bool:
+    """
+    Feeds the answers from the script picked by the `CQ_INPUT_SCRIPT` environment variable, if any.
+
+    Returns:
+        scripted (bool): Whether a script is in use.
+    """
+
+    file_path = os.environ.get('CQ_INPUT_SCRIPT')
+
+    if not file_path:
+        return False
+
+    UseInputScript(file_path, os.environ.get('CQ_INPUT_STRICT', '') not in ('', '0'))
+
+    return True
+
+def UseSessionInput(read_line) -> None:
+    """
+    Reads the answers to the current thread's prompts with a function, e.g. from a network connection.
+
+    Parameters:
+        read_line (function): Returns the next answer, without its line ending (None to go back to the shared input).
+    """
+
+    session_input.read_line = read_line
+
+def ReadInput(prompt: str = " > ") -> str:
+    """
+    Reads the answer to a prompt, from the script in use or the console.
+
+    Parameters:
+        prompt (str): The prompt shown before the answer.
+
+    Returns:
+        answer (str): The answer, without its line ending.
+    """
+
+    read_line = getattr(session_input, 'read_line', None)
+
+    if read_line is not None:
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+
+        return read_line()
+
+    with input_lock:
+        answers = input_state['answers']
+
+        if answers is not None:
+            answer = next(answers, None)
+
+            if answer is not None:
+                input_state['answered'] += 1
+
+                if input_state['echo']:
+                    sys.stdout.write(f"{prompt}{answer}\n")
+
+                return answer
+
+            if input_state['strict']:
+                sys.stdout.write(prompt)
+                sys.stdout.flush()
+                raise UnexpectedPromptError(f"The input script ran out after {input_state['answered']} answers, but the game asked for another.")
+
+            # The script ran out, the rest of the session is played from the console
+            input_state['answers'] = None
+
+    return input(prompt)
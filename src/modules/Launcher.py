@@ -9,8 +9,13 @@ This module handles the initialization of the game and the core gameplay loop. I
 
 This module is essential for the game's flow, connecting the main menu, game actions, and player interaction with the world.
 
+Only what the main menu needs is imported when the game starts. The in-game modules are imported by `StartGame`
+and `DisplayMenu` once a game starts, and the shop, combat and saves on first use, which keeps the game quick to
+start (see `ImportBudget`).
+
 Functions:
-- InitializeGame: Sets up the main menu and handles user inputs to start or load a game.
+- InitializeGame: Sets up the console and runs the main menu.
+- RunMainMenu: Handles user inputs on the main menu to start or load a game, until the user quits.
 - StartGame: Executes the core game loop, allowing the player to explore, view stats, manage inventory, and more.
 - DisplayMenu: Shows the in-game menu with options for the player to choose from.
 '''
@@ -19,10 +24,10 @@ from src.modules.MainMenu import MainMenu, PauseMenu
 from src.modules.CoreGameFunctions import ConsoleInput, ClearConsole, ReturnToGame
 from src.modules.GameActions import AboutGame, NewGame, SaveGame, LoadGame, DeleteGame
 from src.modules.ArtAssets import DisplayPlanet, DisplayStars, DisplayDragon
-from src.modules.TextFormatter import MenuLine
-from src.modules.ShopHandler import ShopMenu
-from src.modules.StatusBarHandler import UpdateStatusBar, UpdateExperienceBar
-from src.modules.PlayerActions import ExploreLocation, PrintAllStats, RecoverStats
+from src.modules.TextFormatter import MenuLine, Frame
+from src.modules.ConfigHandler import LoadConfig, StartConfigWatcher
+from src.modules.ScreenRenderer import StartRenderer
+from src.modules.InputProvider import ConfigureInputFromEnvironment
 
 from src.classes.Player import Player # Change either to Player or old_Player
 
@@ -37,31 +42,35 @@ def DisplayMenu(player: Player) -> str:
         str: The user's input.
     """
 
+    from src.modules.StatusBarHandler import UpdateStatusBar, UpdateExperienceBar
+
     ClearConsole()
-    MenuLine()
-    print(f" ^ Welcome {player.name} the {player.sex} {player.race}!")
-    MenuLine()
-    print(f" - You are a Level {player.level} {player.player_class}, born under the {player.birth_sign} sign.")
-    MenuLine()
-    print(f" - Gold: {int(player.gold)}")
-    MenuLine()
-    print(f" - Current Location: {player.location}")
-    MenuLine()
-
-    UpdateStatusBar(player)
-    MenuLine()
-    UpdateExperienceBar(player)
-    MenuLine()
-
-    print(" * What would you like to do?")
-    MenuLine()
+    frame = Frame()
+    MenuLine(frame = frame)
+    frame.Print(f" ^ Welcome {player.name} the {player.sex} {player.race}!")
+    MenuLine(frame = frame)
+    frame.Print(f" - You are a Level {player.level} {player.player_class}, born under the {player.birth_sign} sign.")
+    MenuLine(frame = frame)
+    frame.Print(f" - Gold: {int(player.gold)}")
+    MenuLine(frame = frame)
+    frame.Print(f" - Current Location: {player.location}")
+    MenuLine(frame = frame)
+
+    UpdateStatusBar(player, frame)
+    MenuLine(frame = frame)
+    UpdateExperienceBar(player, frame)
+    MenuLine(frame = frame)
+
+    frame.Print(" * What would you like to do?")
+    MenuLine(frame = frame)
 
     options = ["Pause Game", "Explore World", "View Stats", "View Inventory", "Visit Shop", "Rest"]
 
     for index, option in enumerate(options, 1):
-        print(f" {index}. {option}")
+        frame.Print(f" {index}. {option}")
 
-    MenuLine()
+    MenuLine(frame = frame)
+    frame.Write()
 
     return ConsoleInput()
 
@@ -73,6 +82,8 @@ def StartGame(player: Player) -> None:
         player (Player): The character save file that the user goes through the game with.
     """
 
+    from src.modules.PlayerActions import ExploreLocation, PrintAllStats, RecoverStats
+
     locations = ["Small Town", "Foggy Forest", "Desolate Cave", "Knoll Mountain", "Sandy Beach", "Abandoned Fort", "Sacked Camp"]
     encounter_rate = 0.67
 
@@ -102,9 +113,11 @@ def StartGame(player: Player) -> None:
             DisplayPlanet()
             ExploreLocation(player, locations, encounter_rate)
         elif user_input == '3':
-            PrintAllStats(player)
-            print(" * Press enter to return to the game...")
-            MenuLine()
+            frame = Frame()
+            PrintAllStats(player, frame)
+            frame.Print(" * Press enter to return to the game...")
+            MenuLine(frame = frame)
+            frame.Write()
             ConsoleInput()
         elif user_input == '4':
             ClearConsole()
@@ -124,6 +137,8 @@ def StartGame(player: Player) -> None:
             MenuLine()
             ConsoleInput()
         elif user_input == '5':
+            from src.modules.ShopHandler import ShopMenu
+
             ClearConsole()
             ShopMenu(player)
         elif user_input == '6':
@@ -163,7 +178,21 @@ def StartGame(player: Player) -> None:
     
 def InitializeGame() -> None:
     """
-    Initializes and handles the main menu for Console Quest RPG.
+    Initializes the console and runs the main menu for Console Quest RPG.
+    """
+
+    LoadConfig()
+    StartConfigWatcher()
+    StartRenderer()
+    ConfigureInputFromEnvironment()
+    RunMainMenu()
+
+def RunMainMenu() -> None:
+    """
+    Handles the main menu for Console Quest RPG until the user quits.
+
+    The console isn't set up here, so the game server (see `GameServer`) can run a main menu for every connected
+    player, each in its own thread.
     """
 
     game_running = True
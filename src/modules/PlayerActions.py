@@ -16,13 +16,12 @@ Functions:
 
 from src.modules.MainMenu import ClearConsole
 from src.modules.ArtAssets import DisplayStars
-from src.modules.TextFormatter import MenuLine
-from src.modules.CombatEncounter import StartEncounter
+from src.modules.TextFormatter import MenuLine, Frame
 from src.modules.CoreGameFunctions import ReturnToGame
+from src.modules.GameClock import Wait
 
 from src.classes.Player import Player # Change either to Player or old_Player
 
-import time
 import random
 
 def RecoverStats(player: Player) -> None:
@@ -66,40 +65,42 @@ def RecoverStats(player: Player) -> None:
 
     MenuLine()
 
-    time.sleep(seconds_to_wait)
+    Wait(seconds_to_wait)
 
-def PrintAllStats(player: Player) -> None:
+def PrintAllStats(player: Player, frame: Frame = None) -> None:
     """
     Displays the player's current statistics, including attributes, attack and defense values, and kill/death ratio.
 
     Parameters:
         player (object): The player
+        frame (Frame): The frame to add the stats to, which the caller writes (the stats are written right away without one).
     """
 
     no_deaths = 0
+    screen = frame if frame is not None else Frame()
 
     ClearConsole()
-    DisplayStars()
-    MenuLine()
-    print(f" ^ {player.name}'s Stats")
-    MenuLine()
-    print(f" - Available Attribute Points: {player.attribute_points}")
-    MenuLine()
-    print(f" - Strength: {player.attributes['Strength']}")
-    print(f" - Endurance: {player.attributes['Endurance']}")
-    print(f" - Intelligence: {player.attributes['Intelligence']}")
-    print(f" - Willpower: {player.attributes['Willpower']}")
-    print(f" - Agility: {player.attributes['Agility']}")
-    print(f" - Speed: {player.attributes['Speed']}")
-    MenuLine()
-    print(f" - Physical attack: {player.physical_attack}")
-    print(f" - Magical attack: {player.magical_attack}")
-    MenuLine()
-    print(f" - Physical defense: {player.physical_defense}")
-    print(f" - Magical defense: {player.magical_defense}")
-    MenuLine()
-    print(f" - Enemies Killed: {player.total_kills}")
-    print(f" - Number of Deaths: {player.total_deaths}")
+    DisplayStars(screen)
+    MenuLine(frame = screen)
+    screen.Print(f" ^ {player.name}'s Stats")
+    MenuLine(frame = screen)
+    screen.Print(f" - Available Attribute Points: {player.attribute_points}")
+    MenuLine(frame = screen)
+    screen.Print(f" - Strength: {player.attributes['Strength']}")
+    screen.Print(f" - Endurance: {player.attributes['Endurance']}")
+    screen.Print(f" - Intelligence: {player.attributes['Intelligence']}")
+    screen.Print(f" - Willpower: {player.attributes['Willpower']}")
+    screen.Print(f" - Agility: {player.attributes['Agility']}")
+    screen.Print(f" - Speed: {player.attributes['Speed']}")
+    MenuLine(frame = screen)
+    screen.Print(f" - Physical attack: {player.physical_attack}")
+    screen.Print(f" - Magical attack: {player.magical_attack}")
+    MenuLine(frame = screen)
+    screen.Print(f" - Physical defense: {player.physical_defense}")
+    screen.Print(f" - Magical defense: {player.magical_defense}")
+    MenuLine(frame = screen)
+    screen.Print(f" - Enemies Killed: {player.total_kills}")
+    screen.Print(f" - Number of Deaths: {player.total_deaths}")
 
     # Determine KD Ratio
     if player.total_deaths == no_deaths:
@@ -107,8 +108,11 @@ def PrintAllStats(player: Player) -> None:
     else:
         kill_death_ratio = round(player.total_kills / player.total_deaths, 1)
 
-    print(f" - Kill/Death Ratio: {kill_death_ratio}")
-    MenuLine()
+    screen.Print(f" - Kill/Death Ratio: {kill_death_ratio}")
+    MenuLine(frame = screen)
+
+    if frame is None:
+        screen.Write()
 
 def ExploreLocation(player: Player, locations: list, encounter_rate: float) -> None:
     """
@@ -129,9 +133,12 @@ def ExploreLocation(player: Player, locations: list, encounter_rate: float) -> N
     print(f" - You set out for {exploration_time[1]}...")
     MenuLine()
 
-    time.sleep(exploration_time[0])
+    Wait(exploration_time[0])
 
     if encounter_roll < encounter_rate:
+        # Combat is only loaded once the first enemy shows up
+        from src.modules.CombatEncounter import StartEncounter
+
         StartEncounter(player, message)
     else:
         ReturnToGame("")
\ No newline at end of file
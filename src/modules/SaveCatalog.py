@@ -0,0 +1,238 @@
+'''
+Save catalog for Console Quest RPG.
+
+The load and delete menus used to list the saves folder and could only show file names, since showing
+anything more meant loading every save. This module keeps a catalog of every save in `saves/catalog.json`
+with the details the menus show (level, race, class, gold and when the character was last played):
+- The catalog is updated every time a character is saved or deleted, by rewriting it to a temporary file
+  and renaming it over the old catalog, so it is never left half written. Autosaves only update it in
+  memory, and it is written with the next full save or when the game exits.
+- It is read once and kept in memory, so the menus never touch the save files themselves.
+- If the catalog is missing or unreadable (e.g. saves copied over from an older version of the game), it is
+  rebuilt once from the headers of the save files (legacy saves have no header and are loaded instead). It
+  is rebuilt too if an entry doesn't point at a save file in the saves folder.
+- The save file of an entry is named by `SaveFileName`, like the save itself, so the two always agree.
+
+Functions:
+- CatalogEntry: Creates the catalog entry of a character.
+- CatalogEntryFromHeader: Creates the catalog entry of a save from its header, without loading the save.
+- CatalogFilePath: Returns the path of the save file a catalog entry points at.
+- LoadCatalog: Returns the catalog of a saves folder, rebuilding it if it is missing.
+- RebuildCatalog: Rebuilds the catalog of a saves folder from the save files in it.
+- WriteCatalog: Writes the catalog of a saves folder to disk.
+- UpdateCatalog: Adds or replaces the catalog entry of a character.
+- WriteDirtyCatalogs: Writes every catalog that has changes that weren't written to disk yet.
+- RemoveFromCatalog: Removes a character from the catalog.
+- DescribeEntry: Formats a catalog entry for the load and delete menus.
+'''
+
+from src.modules.SaveFormat import ReadSave, ReadSaveHeader, ListSaves, IsValidSaveName, SaveFileName, WriteFileAtomically
+from src.modules.SaveFormat import saves_directory, save_extension, legacy_extension
+
+import json
+import os
+import threading
+import time
+
+catalog_file_name = 'catalog.json'
+
+# Catalogs read so far, keyed by saves folder: {character name: entry}
+catalogs = {}
+# Saves folders whose catalog has changes that weren't written to disk yet
+dirty_catalogs = set()
+catalog_lock = threading.RLock()
+
+def CatalogEntry(player, last_played: float = None, file_name: str = None) -> dict:
+    """
+    Creates the catalog entry of a character.
+
+    Parameters:
+        player (Player): The saved character.
+        last_played (float): When the character was last played, as a timestamp (now by default).
+        file_name (str): The name of the character's save file, only given for legacy saves (`SaveFileName` by default).
+
+    Returns:
+        entry (dict): The save file name, level, race, class, gold and last played time of the character.
+    """
+
+    return {
+        'file': file_name or SaveFileName(player.name),
+        'level': player.level,
+        'race': player.race,
+        'player_class': player.player_class,
+        'gold': player.gold,
+        'last_played': last_played if last_played is not None else time.time()
+    }
+
+def CatalogEntryFromHeader(header: dict, file_path: str) -> dict:
+    """
+    Creates the catalog entry of a save from its header, without loading the save.
+
+    Parameters:
+        header (dict): The header of the save, see `DecodeSaveHeader`.
+        file_path (str): The path of the save file.
+
+    Returns:
+        entry (dict): The catalog entry of the saved character, see `CatalogEntry`.
+    """
+
+    return {
+        'file': os.path.basename(file_path),
+        'level': header['level'],
+        'race': header['race'],
+        'player_class': header['player_class'],
+        'gold': header['gold'],
+        'last_played': header['saved_at']
+    }
+
+def CatalogFilePath(entry: dict, directory: str = saves_directory) -> str:
+    """
+    Returns the path of the save file a catalog entry points at.
+
+    Parameters:
+        entry (dict): The catalog entry, see `CatalogEntry`.
+        directory (str): The saves folder.
+
+    Returns:
+        file_path (str): The path of the save file, always inside the saves folder.
+    """
+
+    save_name, extension = os.path.splitext(entry['file'])
+
+    if extension not in (save_extension, legacy_extension) or not IsValidSaveName(save_name):
+        raise ValueError(f"The catalog entry {entry['file']!r} isn't the name of a save file.")
+
+    return os.path.join(directory, entry['file'])
+
+def LoadCatalog(directory: str = saves_directory) -> dict:
+    """
+    Returns the catalog of a saves folder, rebuilding it if it is missing.
+
+    Parameters:
+        directory (str): The saves folder.
+
+    Returns:
+        catalog (dict): The catalog entry of each saved character, keyed by character name.
+    """
+
+    with catalog_lock:
+        if directory in catalogs:
+            return catalogs[directory]
+
+        try:
+            with open(os.path.join(directory, catalog_file_name), 'r', encoding = 'utf-8') as file:
+                catalog = json.load(file)
+
+            if not all(os.path.isfile(CatalogFilePath(entry, directory)) for entry in catalog.values()):
+                raise ValueError("The catalog lists a save file that doesn't exist.")
+
+            catalogs[directory] = catalog
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            RebuildCatalog(directory)
+
+        return catalogs[directory]
+
+def RebuildCatalog(directory: str = saves_directory) -> dict:
+    """
+    Rebuilds the catalog of a saves folder from the save files in it.
+
+    Only the header of each save is read. Legacy saves and version 1 saves have no details in their header,
+    so they are loaded once instead and their modification time is used as the last played time.
+
+    Parameters:
+        directory (str): The saves folder.
+
+    Returns:
+        catalog (dict): The rebuilt catalog.
+    """
+
+    catalog = {}
+
+    for save_name, file_path in ListSaves(directory).items():
+        try:
+            header = ReadSaveHeader(file_path) if not file_path.endswith(legacy_extension) else None
+
+            if header is not None and 'saved_at' in header:
+                catalog[save_name] = CatalogEntryFromHeader(header, file_path)
+            else:
+                catalog[save_name] = CatalogEntry(ReadSave(file_path), os.path.getmtime(file_path), os.path.basename(file_path))
+        except Exception:
+            continue    # Leave unreadable saves out of the menus rather than failing to show them at all
+
+    with catalog_lock:
+        catalogs[directory] = catalog
+
+        if os.path.isdir(directory):
+            WriteCatalog(directory)
+
+    return catalog
+
+def WriteCatalog(directory: str = saves_directory) -> None:
+    """
+    Writes the catalog of a saves folder to disk.
+
+    Parameters:
+        directory (str): The saves folder.
+    """
+
+    with catalog_lock:
+        data = json.dumps(catalogs[directory], indent = 1, sort_keys = True).encode('utf-8')
+        WriteFileAtomically(os.path.join(directory, catalog_file_name), data)
+        dirty_catalogs.discard(directory)
+
+def UpdateCatalog(save_name: str, entry: dict, directory: str = saves_directory, write: bool = True) -> None:
+    """
+    Adds or replaces the catalog entry of a character.
+
+    Parameters:
+        save_name (str): The name of the saved character.
+        entry (dict): The catalog entry of the character, see `CatalogEntry`.
+        directory (str): The saves folder.
+        write (bool): Whether to write the catalog to disk now, or leave it for `WriteDirtyCatalogs`.
+    """
+
+    with catalog_lock:
+        LoadCatalog(directory)[save_name] = entry
+
+        if write:
+            WriteCatalog(directory)
+        else:
+            dirty_catalogs.add(directory)
+
+def WriteDirtyCatalogs() -> None:
+    """
+    Writes every catalog that has changes that weren't written to disk yet.
+    """
+
+    with catalog_lock:
+        for directory in list(dirty_catalogs):
+            WriteCatalog(directory)
+
+def RemoveFromCatalog(save_name: str, directory: str = saves_directory) -> None:
+    """
+    Removes a character from the catalog.
+
+    Parameters:
+        save_name (str): The name of the saved character.
+        directory (str): The saves folder.
+    """
+
+    with catalog_lock:
+        if LoadCatalog(directory).pop(save_name, None) is not None:
+            WriteCatalog(directory)
+
+def DescribeEntry(save_name: str, entry: dict) -> str:
+    """
+    Formats a catalog entry for the load and delete menus.
+
+    Parameters:
+        save_name (str): The name of the saved character.
+        entry (dict): The catalog entry of the character.
+
+    Returns:
+        description (str): The name, level, race, class, gold and last played time of the character.
+    """
+
+    last_played = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['last_played']))
+
+    return f"{save_name} - Level {entry['level']} {entry['race']} {entry['player_class']} - {int(entry['gold'])}g - Last played {last_played}"
@@ -0,0 +1,602 @@
+'''
+Versioned binary save format for Console Quest RPG.
+
+Saves used to be a pickle of the whole Player object, which tied every save to the exact class that wrote
+it and stored every derived stat along with it. This module stores only the canonical state of a character
+and recalculates everything else when the save is loaded. It manages:
+- Encoding a character's identity, attributes, level, experience, gold, kills, deaths, current and max
+  Health/Mana/Stamina (deaths lower the max stats permanently) and inventory counts with `struct`.
+- Decoding saves of any version, upgrading older versions through the migration table.
+- Reading legacy `.pkl` saves written by `Player` or `old_Player`, with an unpickler that only accepts
+  those two classes, so a tampered save can't run code when it is loaded.
+- Checking character names before they are saved. The name of a character is the name of its save file, and
+  players connected to the game server pick their names remotely, so a name can't reach outside the saves
+  folder or carry control characters into the menus of other players.
+
+A save starts with a fixed-size header holding the magic bytes, the format version, the size of the header,
+the length of the body, and the name, level, race, class and gold of the character along with when it was
+saved. Menus can describe a save by reading just the header, and only load the body of the save they pick.
+The body holds the canonical state. New versions only ever add fields to the end of the header and of the
+body, so a save written by a newer version of the game can still be loaded by reading the fields this
+version knows about and skipping the rest. Version 1 saves (a short header with no metadata) still load.
+
+Functions:
+- EncodeString: Encodes a string as its UTF-8 length followed by its bytes.
+- DecodeString: Decodes a string written by `EncodeString`.
+- StateFromPlayer: Takes the canonical state of a character, the only part of it that is saved.
+- BuildPlayer: Creates a character from its canonical state, recalculating all of the derived stats.
+- EncodeBody: Encodes the canonical state of a character into the body of a save.
+- EncodeSave: Encodes a character into the binary save format.
+- EncodeState: Encodes the canonical state of a character into the binary save format.
+- DecodeSaveHeader: Decodes the fixed-size header of a save, without touching the body.
+- DecodeBody: Decodes the body of a save into a canonical state.
+- MigrateV1ToV2: Upgrades a version 1 state to version 2.
+- DecodeSave: Decodes a save of any version into a character.
+- DecodeSaveState: Decodes a save of any version into its header and the canonical state of the character.
+- IsValidSaveName: Tells whether a character name can be used as the name of its save file.
+- SaveFileName: Returns the name of a character's save file.
+- WriteFileAtomically: Writes a file so that it either keeps its old contents or has all of the new ones.
+- WriteSave: Saves a character to the saves folder.
+- ReadSave: Loads a character from a save file, in the binary format or the legacy pickle format.
+- ReadSaveHeader: Reads only the header of a save file, which is enough to describe the save without loading it.
+- ListSaves: Lists the saved characters in the saves folder.
+- LegacyCharacter: Stand-in for a pickled `Player` or `old_Player`, holding its attributes.
+- RestrictedUnpickler: Unpickler that only accepts legacy characters and the containers they hold.
+- LoadLegacySave: Loads the character of a legacy save and tells which class wrote it.
+'''
+
+from src.classes.Player import Player # Change either to Player or old_Player
+
+import io
+import os
+import pickle
+import struct
+import tempfile
+import time
+import unicodedata
+
+save_magic = b'CQRS'
+save_version = 2
+save_extension = '.sav'
+legacy_extension = '.pkl'
+saves_directory = 'saves'
+max_name_length = 32                                    # characters a character name may have at most
+name_separators = ('/', '\\', ':', os.sep, os.altsep)   # characters that would make a name a path
+
+attribute_names = ('Strength', 'Endurance', 'Intelligence', 'Willpower', 'Agility', 'Speed')
+stat_names = ('Health', 'Mana', 'Stamina')
+
+header_text_size = 40                                   # bytes kept of the name, race and class in the header
+
+prefix_struct = struct.Struct('<4sH')                   # magic, version (every save version starts with these)
+legacy_header_struct = struct.Struct('<4sHI')           # version 1: magic, version, body length
+header_struct = struct.Struct(f'<4sHHIIdd{header_text_size}s{header_text_size}s{header_text_size}s')   # magic, version, header size, body length, level, gold, saved at, name, race, class
+length_struct = struct.Struct('<H')                     # length of an encoded string
+count_struct = struct.Struct('<I')                      # number of inventory items
+progress_struct = struct.Struct('<6iIddIdII3d3d')       # attributes, level, experience, next experience, attribute points, gold, kills, deaths, stats, max stats
+
+def EncodeString(value: str) -> bytes:
+    """
+    Encodes a string as its UTF-8 length followed by its bytes.
+
+    Parameters:
+        value (str): The string to encode.
+
+    Returns:
+        data (bytes): The encoded string.
+    """
+
+    encoded = value.encode('utf-8')
+
+    return length_struct.pack(len(encoded)) + encoded
+
+def DecodeString(data: bytes, offset: int) -> tuple[str, int]:
+    """
+    Decodes a string written by `EncodeString`.
+
+    Parameters:
+        data (bytes): The data holding the string.
+        offset (int): Where the string starts in the data.
+
+    Returns:
+        value (str): The decoded string.
+        offset (int): Where the next field starts in the data.
+    """
+
+    (length,) = length_struct.unpack_from(data, offset)
+    offset += length_struct.size
+
+    return data[offset:offset + length].decode('utf-8'), offset + length
+
+def StateFromPlayer(player) -> dict:
+    """
+    Takes the canonical state of a character, the only part of it that is saved.
+
+    Works with both `Player` and `old_Player` characters, so legacy saves can be converted.
+
+    Parameters:
+        player (Player): The character to take the state of.
+
+    Returns:
+        state (dict): The identity, attributes, progress, stats and inventory counts of the character.
+    """
+
+    return {
+        'name': player.name,
+        'sex': player.sex,
+        'race': player.race,
+        'birth_sign': player.birth_sign,
+        'player_class': player.player_class,
+        'location': player.location,
+        'attributes': {name: player.attributes[name] for name in attribute_names},
+        'level': player.level,
+        'experience': player.experience,
+        'next_experience': player.next_experience,
+        'attribute_points': player.attribute_points,
+        'gold': player.gold,
+        'total_kills': player.total_kills,
+        'total_deaths': player.total_deaths,
+        'stats': {name: player.stats[name] for name in stat_names},
+        'max_stats': {name: player.max_stats[name] for name in stat_names},
+        'inventory': {item_name: details['count'] for item_name, details in player.inventory.items()}
+    }
+
+def BuildPlayer(state: dict) -> Player:
+    """
+    Creates a character from its canonical state, recalculating all of the derived stats.
+
+    Parameters:
+        state (dict): The canonical state of the character, see `StateFromPlayer`.
+
+    Returns:
+        player (Player): The character.
+    """
+
+    player = Player(state['name'], state['sex'], state['race'], state['birth_sign'], state['player_class'], state['attributes'])
+    player.location = state['location']
+    player.level = state['level']
+    player.experience = state['experience']
+    player.next_experience = state['next_experience']
+    player.attribute_points = state['attribute_points']
+    player.gold = state['gold']
+    player.total_kills = state['total_kills']
+    player.total_deaths = state['total_deaths']
+    player.inventory = {item_name: {'count': count} for item_name, count in state['inventory'].items()}
+    player.CalculateDerivedStats()
+    # Deaths lower the max stats for good, so they are restored rather than recalculated
+    player.stats = dict(state['stats'])
+    player.max_stats = dict(state['max_stats'])
+
+    return player
+
+def EncodeBody(state: dict) -> bytes:
+    """
+    Encodes the canonical state of a character into the body of a save.
+
+    Parameters:
+        state (dict): The canonical state of the character, see `StateFromPlayer`.
+
+    Returns:
+        body (bytes): The encoded body.
+    """
+
+    inventory = state['inventory']
+
+    parts = [EncodeString(state[field]) for field in ('name', 'sex', 'race', 'birth_sign', 'player_class', 'location')]
+    parts.append(progress_struct.pack(
+        *(state['attributes'][name] for name in attribute_names),
+        state['level'],
+        state['experience'],
+        state['next_experience'],
+        state['attribute_points'],
+        state['gold'],
+        state['total_kills'],
+        state['total_deaths'],
+        *(state['stats'][name] for name in stat_names),
+        *(state['max_stats'][name] for name in stat_names)
+    ))
+    parts.append(count_struct.pack(len(inventory)))
+    parts.extend(EncodeString(item_name) for item_name in inventory)
+    parts.append(struct.pack(f'<{len(inventory)}I', *inventory.values()))
+
+    return b''.join(parts)
+
+def EncodeSave(player, saved_at: float = None) -> bytes:
+    """
+    Encodes a character into the binary save format.
+
+    Parameters:
+        player (Player): The character to encode.
+        saved_at (float): When the character was saved, as a timestamp (now by default).
+
+    Returns:
+        data (bytes): The encoded save, header included.
+    """
+
+    return EncodeState(StateFromPlayer(player), saved_at)
+
+def EncodeState(state: dict, saved_at: float = None) -> bytes:
+    """
+    Encodes the canonical state of a character into the binary save format.
+
+    Parameters:
+        state (dict): The canonical state of the character, see `StateFromPlayer`.
+        saved_at (float): When the character was saved, as a timestamp (now by default).
+
+    Returns:
+        data (bytes): The encoded save, header included.
+    """
+
+    body = EncodeBody(state)
+    header = header_struct.pack(
+        save_magic,
+        save_version,
+        header_struct.size,
+        len(body),
+        state['level'],
+        state['gold'],
+        saved_at if saved_at is not None else time.time(),
+        state['name'].encode('utf-8')[:header_text_size],
+        state['race'].encode('utf-8')[:header_text_size],
+        state['player_class'].encode('utf-8')[:header_text_size]
+    )
+
+    return header + body
+
+def DecodeSaveHeader(data: bytes) -> dict:
+    """
+    Decodes the fixed-size header of a save, without touching the body.
+
+    Parameters:
+        data (bytes): The start of the save, at least `header_struct.size` bytes (version 1 saves only need `legacy_header_struct.size`).
+
+    Returns:
+        header (dict): The version, header size and body length of the save, and the name, level, race, class, gold and save time of the character (version 2 and later).
+    """
+
+    if len(data) < prefix_struct.size:
+        raise ValueError("Save file is too short to be a Console Quest save.")
+
+    magic, version = prefix_struct.unpack_from(data)
+
+    if magic != save_magic:
+        raise ValueError("Save file is not a Console Quest save.")
+
+    if version == 1:
+        _, _, body_length = legacy_header_struct.unpack_from(data)
+
+        return {'version': version, 'header_size': legacy_header_struct.size, 'body_length': body_length}
+
+    if len(data) < header_struct.size:
+        raise ValueError("Save file is too short to be a Console Quest save.")
+
+    _, _, header_size, body_length, level, gold, saved_at, name, race, player_class = header_struct.unpack_from(data)
+
+    def text(value):
+        return value.rstrip(b'\0').decode('utf-8', errors = 'ignore')
+
+    return {
+        'version': version,
+        'header_size': header_size,
+        'body_length': body_length,
+        'name': text(name),
+        'level': level,
+        'race': text(race),
+        'player_class': text(player_class),
+        'gold': gold,
+        'saved_at': saved_at
+    }
+
+def DecodeBody(body: bytes) -> dict:
+    """
+    Decodes the body of a save into a canonical state.
+
+    Parameters:
+        body (bytes): The body of the save, without the header.
+
+    Returns:
+        state (dict): The canonical state of the character, see `StateFromPlayer`.
+    """
+
+    state = {}
+    offset = 0
+
+    for field in ('name', 'sex', 'race', 'birth_sign', 'player_class', 'location'):
+        state[field], offset = DecodeString(body, offset)
+
+    values = progress_struct.unpack_from(body, offset)
+    offset += progress_struct.size
+
+    state['attributes'] = dict(zip(attribute_names, values[0:6]))
+    (state['level'], state['experience'], state['next_experience'], state['attribute_points'],
+     state['gold'], state['total_kills'], state['total_deaths']) = values[6:13]
+    state['stats'] = dict(zip(stat_names, values[13:16]))
+    state['max_stats'] = dict(zip(stat_names, values[16:19]))
+
+    (item_count,) = count_struct.unpack_from(body, offset)
+    offset += count_struct.size
+    item_names = []
+
+    for _ in range(item_count):
+        item_name, offset = DecodeString(body, offset)
+        item_names.append(item_name)
+
+    state['inventory'] = dict(zip(item_names, struct.unpack_from(f'<{item_count}I', body, offset)))
+
+    return state
+
+def MigrateV1ToV2(state: dict) -> dict:
+    """
+    Upgrades a version 1 state to version 2. Version 2 only added the metadata header, the state is unchanged.
+    """
+
+    return state
+
+# Upgrades a state decoded from a save version to the state of the next version: {version: function(state) -> state}
+save_migrations = {
+    1: MigrateV1ToV2
+}
+
+def DecodeSave(data: bytes) -> Player:
+    """
+    Decodes a save of any version into a character.
+
+    Parameters:
+        data (bytes): The encoded save, header included.
+
+    Returns:
+        player (Player): The character stored in the save.
+    """
+
+    return BuildPlayer(DecodeSaveState(data)[1])
+
+def DecodeSaveState(data: bytes) -> tuple[dict, dict]:
+    """
+    Decodes a save of any version into its header and the canonical state of the character.
+
+    Parameters:
+        data (bytes): The encoded save, header included.
+
+    Returns:
+        header (dict): The decoded header, see `DecodeSaveHeader`.
+        state (dict): The canonical state of the character, upgraded to the current version.
+    """
+
+    header = DecodeSaveHeader(data)
+    version = header['version']
+
+    if version < 1:
+        raise ValueError(f"Save format version {version} is not supported.")
+
+    body = data[header['header_size']:header['header_size'] + header['body_length']]
+
+    if len(body) != header['body_length']:
+        raise ValueError("Save file is truncated.")
+
+    # Newer versions only grow the header and append fields to the body, so read the fields this version knows about
+    state = DecodeBody(body)
+
+    while version < save_version:
+        state = save_migrations[version](state)
+        version += 1
+
+    return header, state
+
+def IsValidSaveName(name: str) -> bool:
+    """
+    Tells whether a character name can be used as the name of its save file.
+
+    A valid name has 1 to `max_name_length` characters, isn't only whitespace, doesn't start with a dot, and
+    has no path separators, no `..` and no control characters (an escape character would draw in the menus
+    of every player listing the saves).
+
+    Parameters:
+        name (str): The name of the character.
+
+    Returns:
+        valid (bool): Whether the name is valid.
+    """
+
+    return (isinstance(name, str) and 0 < len(name) <= max_name_length and not name.isspace()
+            and not name.startswith('.') and '..' not in name
+            and not any(separator and separator in name for separator in name_separators)
+            and not any(unicodedata.category(character).startswith('C') for character in name))
+
+def SaveFileName(name: str) -> str:
+    """
+    Returns the name of a character's save file, the only way a save file name is made from a character name.
+
+    Parameters:
+        name (str): The name of the character.
+
+    Returns:
+        file_name (str): The name of the save file, without any folder.
+    """
+
+    if not IsValidSaveName(name):
+        raise ValueError(f"The name {name!r} can't be used to save a character.")
+
+    return name + save_extension
+
+def WriteFileAtomically(file_path: str, data: bytes) -> None:
+    """
+    Writes a file so that it either keeps its old contents or has all of the new ones.
+
+    The data is written to a temporary file next to the target, flushed to disk, and then renamed over
+    the target, so a crash in the middle of saving can never leave a half written save behind.
+
+    Parameters:
+        file_path (str): The path of the file to write.
+        data (bytes): The new contents of the file.
+    """
+
+    directory = os.path.dirname(file_path) or '.'
+    os.makedirs(directory, exist_ok = True)
+    descriptor, temp_path = tempfile.mkstemp(prefix = os.path.basename(file_path) + '.', suffix = '.tmp', dir = directory)
+
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def WriteSave(player, directory: str = saves_directory) -> str:
+    """
+    Saves a character to the saves folder.
+
+    Parameters:
+        player (Player): The character to save.
+        directory (str): The folder to save the character in.
+
+    Returns:
+        file_path (str): The path of the save file.
+    """
+
+    file_path = os.path.join(directory, SaveFileName(player.name))
+    WriteFileAtomically(file_path, EncodeSave(player))
+
+    return file_path
+
+def ReadSave(file_path: str) -> Player:
+    """
+    Loads a character from a save file, in the binary format or the legacy pickle format.
+
+    Parameters:
+        file_path (str): The path of the save file.
+
+    Returns:
+        player (Player): The character stored in the save.
+    """
+
+    with open(file_path, 'rb') as file:
+        data = file.read()
+
+    if data[:len(save_magic)] == save_magic:
+        return DecodeSave(data)
+
+    # Legacy saves are a pickled Player (or old_Player), keep only their state so they load as a Player
+    return BuildPlayer(StateFromPlayer(LoadLegacySave(data)[1]))
+
+def ReadSaveHeader(file_path: str) -> dict:
+    """
+    Reads only the header of a save file, which is enough to describe the save without loading it.
+
+    Parameters:
+        file_path (str): The path of the save file.
+
+    Returns:
+        header (dict): The decoded header, see `DecodeSaveHeader`.
+    """
+
+    with open(file_path, 'rb') as file:
+        return DecodeSaveHeader(file.read(header_struct.size))
+
+def ListSaves(directory: str = saves_directory) -> dict:
+    """
+    Lists the saved characters in the saves folder.
+
+    A character saved in both formats is only listed once, with its binary save (which is the newest).
+
+    Parameters:
+        directory (str): The folder holding the saves.
+
+    Returns:
+        saves (dict): The path of each saved character's save file, keyed by character name.
+    """
+
+    if not os.path.isdir(directory):
+        return {}
+
+    saves = {}
+
+    for file_name in sorted(os.listdir(directory)):
+        save_name, extension = os.path.splitext(file_name)
+
+        if extension == save_extension or (extension == legacy_extension and save_name not in saves):
+            saves[save_name] = os.path.join(directory, file_name)
+
+    return saves
+
+# Classes a legacy save may hold, as (module, class name): layout
+legacy_classes = {
+    ('src.classes.Player', 'Player'): 'Player pickle',
+    ('src.classes.old_Player', 'Player'): 'old_Player pickle'
+}
+# Classes the pickle protocol itself needs to rebuild an object
+pickle_helpers = {
+    ('copyreg', '_reconstructor'),
+    ('copy_reg', '_reconstructor'),
+    ('builtins', 'object'),
+    ('__builtin__', 'object')
+}
+
+class LegacyCharacter:
+    """
+    Stand-in for a pickled `Player` or `old_Player`, holding its attributes.
+
+    Very old saves may miss attributes that were added later, these fall back to the starting values of a new character.
+    """
+
+    location = "Small Town"
+    level = 1
+    experience = 0
+    next_experience = 100
+    attribute_points = 0
+    gold = 0
+    total_kills = 0
+    total_deaths = 0
+    inventory = {}
+
+class RestrictedUnpickler(pickle.Unpickler):
+    """
+    Unpickler that only accepts legacy characters and the containers they hold.
+
+    The player classes themselves are never imported, their attributes are read into a `LegacyCharacter`
+    instead, which works for saves written by either class.
+
+    Args:
+        file (file): The pickled save.
+
+    Attributes:
+        layouts (set): The layouts of the legacy characters found in the pickle.
+    """
+
+    def __init__(self, file):
+        super().__init__(file)
+        self.layouts = set()
+
+    def find_class(self, module, name):
+        if (module, name) in legacy_classes:
+            self.layouts.add(legacy_classes[(module, name)])
+            return LegacyCharacter
+
+        if (module, name) in pickle_helpers:
+            return super().find_class(module, name)
+
+        raise pickle.UnpicklingError(f"Legacy saves can't hold {module}.{name}.")
+
+def LoadLegacySave(data: bytes) -> tuple[str, LegacyCharacter]:
+    """
+    Loads the character of a legacy save and tells which class wrote it.
+
+    Parameters:
+        data (bytes): The pickled save.
+
+    Returns:
+        layout (str): 'Player pickle' or 'old_Player pickle'.
+        character (LegacyCharacter): The attributes of the saved character.
+    """
+
+    unpickler = RestrictedUnpickler(io.BytesIO(data))
+    character = unpickler.load()
+
+    if not isinstance(character, LegacyCharacter) or len(unpickler.layouts) != 1:
+        raise ValueError("Not a saved character.")
+
+    return unpickler.layouts.pop(), character
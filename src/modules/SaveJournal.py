@@ -0,0 +1,318 @@
+'''
+Journaled saves for Console Quest RPG.
+
+Writing the whole character every time is fine for the occasional save from the pause menu, but far too
+much to do after every fight. This module keeps, next to each save (the snapshot), an append-only journal
+of what changed since the snapshot was written:
+- An autosave compares the character with the last state written and appends only the differences (gold,
+  experience, level, attributes, stats, kills, deaths, location and inventory count changes), usually a few
+  dozen bytes.
+- Once the journal grows past `compaction_threshold`, the next save folds it into a fresh snapshot and
+  starts an empty journal.
+- Loading a save replays the journal on top of the snapshot.
+
+Every journal starts with the save time of the snapshot it belongs to, so a journal left over from an older
+snapshot (e.g. the game crashed while compacting) is ignored instead of being applied twice. Every record
+carries its length and a checksum, so a record cut short by a crash is dropped along with anything after it.
+
+Functions:
+- JournalPath: Returns the path of the journal that belongs to a save file.
+- EncodeDelta: Encodes the differences between two states of a character into a journal record.
+- ApplyDelta: Applies a journal record to the state of a character.
+- ReadJournal: Reads the valid records of a journal that belongs to a snapshot.
+- WriteSnapshot: Writes a full save of a character and starts a new, empty journal for it.
+- AppendJournal: Saves a character by appending what changed since the last save to its journal.
+- ReadJournaledSave: Loads a character from a save file, replaying its journal on top of it.
+- ForgetJournal: Forgets the last state written for a save file, so its next save writes a snapshot.
+'''
+
+from src.modules.SaveFormat import EncodeState, EncodeString, DecodeString, DecodeSaveState, BuildPlayer, ReadSave, SaveFileName, WriteFileAtomically
+from src.modules.SaveFormat import attribute_names, stat_names, legacy_extension
+
+import copy
+import os
+import struct
+import threading
+import zlib
+
+journal_extension = '.journal'
+journal_magic = b'CQRJ'
+journal_version = 1
+compaction_threshold = 16 * 1024       # Journal size in bytes after which the next save writes a snapshot
+
+journal_header_struct = struct.Struct('<4sHd')      # magic, version, save time of the snapshot
+record_struct = struct.Struct('<II')                # length and checksum of a record
+operation_struct = struct.Struct('<BB')             # operation, field
+integer_struct = struct.Struct('<q')
+float_struct = struct.Struct('<d')
+
+set_number = 1
+set_string = 2
+change_item = 3
+
+# Fields a journal record can set: (state key, nested key or None, struct of the value)
+number_fields = (
+    [('level', None, integer_struct), ('experience', None, float_struct), ('next_experience', None, float_struct),
+     ('attribute_points', None, integer_struct), ('gold', None, float_struct), ('total_kills', None, integer_struct),
+     ('total_deaths', None, integer_struct)]
+    + [('attributes', name, integer_struct) for name in attribute_names]
+    + [('stats', name, float_struct) for name in stat_names]
+    + [('max_stats', name, float_struct) for name in stat_names]
+)
+string_fields = ('location',)
+identity_fields = ('name', 'sex', 'race', 'birth_sign', 'player_class')
+
+# Last state written for each character, keyed by save file path: {'saved_at', 'state', 'journal_size'}
+journal_bases = {}
+journal_lock = threading.Lock()
+
+def JournalPath(file_path: str) -> str:
+    """
+    Returns the path of the journal that belongs to a save file.
+
+    Parameters:
+        file_path (str): The path of the save file.
+
+    Returns:
+        journal_path (str): The path of the journal.
+    """
+
+    return os.path.splitext(file_path)[0] + journal_extension
+
+def EncodeDelta(base: dict, state: dict) -> bytes:
+    """
+    Encodes the differences between two states of a character into a journal record.
+
+    Parameters:
+        base (dict): The state of the character that was last written.
+        state (dict): The current state of the character.
+
+    Returns:
+        record (bytes): The operations that turn the base into the current state (empty if nothing changed).
+    """
+
+    parts = []
+
+    for field, (key, name, value_struct) in enumerate(number_fields):
+        value = state[key] if name is None else state[key][name]
+
+        if value != (base[key] if name is None else base[key][name]):
+            parts.append(operation_struct.pack(set_number, field) + value_struct.pack(value))
+
+    for field, key in enumerate(string_fields):
+        if state[key] != base[key]:
+            parts.append(operation_struct.pack(set_string, field) + EncodeString(state[key]))
+
+    old_inventory = base['inventory']
+    new_inventory = state['inventory']
+
+    for item_name in old_inventory.keys() | new_inventory.keys():
+        change = new_inventory.get(item_name, 0) - old_inventory.get(item_name, 0)
+
+        if change != 0:
+            parts.append(operation_struct.pack(change_item, 0) + EncodeString(item_name) + integer_struct.pack(change))
+
+    return b''.join(parts)
+
+def ApplyDelta(state: dict, record: bytes) -> dict:
+    """
+    Applies a journal record to the state of a character.
+
+    Parameters:
+        state (dict): The state of the character, changed in place.
+        record (bytes): A journal record written by `EncodeDelta`.
+
+    Returns:
+        state (dict): The updated state.
+    """
+
+    offset = 0
+
+    while offset < len(record):
+        operation, field = operation_struct.unpack_from(record, offset)
+        offset += operation_struct.size
+
+        if operation == set_number:
+            key, name, value_struct = number_fields[field]
+            (value,) = value_struct.unpack_from(record, offset)
+            offset += value_struct.size
+
+            if name is None:
+                state[key] = value
+            else:
+                state[key][name] = value
+        elif operation == set_string:
+            state[string_fields[field]], offset = DecodeString(record, offset)
+        elif operation == change_item:
+            item_name, offset = DecodeString(record, offset)
+            (change,) = integer_struct.unpack_from(record, offset)
+            offset += integer_struct.size
+            count = state['inventory'].get(item_name, 0) + change
+
+            if count > 0:
+                state['inventory'][item_name] = count
+            else:
+                state['inventory'].pop(item_name, None)
+        else:
+            raise ValueError(f"Unknown journal operation {operation}.")
+
+    return state
+
+def ReadJournal(journal_path: str, saved_at: float) -> tuple[list, int]:
+    """
+    Reads the valid records of a journal that belongs to a snapshot.
+
+    Parameters:
+        journal_path (str): The path of the journal.
+        saved_at (float): The save time of the snapshot the journal should belong to.
+
+    Returns:
+        records (list): The records of the journal, in order (empty if the journal is missing or belongs to another snapshot).
+        size (int): The size in bytes of the valid part of the journal.
+    """
+
+    try:
+        with open(journal_path, 'rb') as file:
+            data = file.read()
+    except OSError:
+        return [], 0
+
+    if len(data) < journal_header_struct.size:
+        return [], 0
+
+    magic, version, journal_saved_at = journal_header_struct.unpack_from(data)
+
+    if magic != journal_magic or version != journal_version or journal_saved_at != saved_at:
+        return [], 0
+
+    records = []
+    offset = journal_header_struct.size
+
+    while offset + record_struct.size <= len(data):
+        length, checksum = record_struct.unpack_from(data, offset)
+        record = data[offset + record_struct.size:offset + record_struct.size + length]
+
+        # A record cut short or garbled by a crash ends the journal
+        if len(record) != length or zlib.crc32(record) != checksum:
+            break
+
+        records.append(record)
+        offset += record_struct.size + length
+
+    return records, offset
+
+def WriteSnapshot(file_path: str, state: dict, saved_at: float) -> None:
+    """
+    Writes a full save of a character and starts a new, empty journal for it.
+
+    Parameters:
+        file_path (str): The path of the save file.
+        state (dict): The canonical state of the character.
+        saved_at (float): When the character was saved, as a timestamp.
+    """
+
+    if os.path.basename(file_path) != SaveFileName(state['name']):
+        raise ValueError(f"The save of {state['name']!r} can't be written to {file_path!r}.")
+
+    # The snapshot goes first: if the game stops in between, the old journal no longer matches it and is ignored
+    WriteFileAtomically(file_path, EncodeState(state, saved_at))
+    WriteFileAtomically(JournalPath(file_path), journal_header_struct.pack(journal_magic, journal_version, saved_at))
+
+    with journal_lock:
+        journal_bases[file_path] = {'saved_at': saved_at, 'state': copy.deepcopy(state), 'journal_size': journal_header_struct.size}
+
+def AppendJournal(file_path: str, state: dict, saved_at: float) -> bool:
+    """
+    Saves a character by appending what changed since the last save to its journal.
+
+    A full snapshot is written instead when there is nothing to append to yet (the character hasn't been
+    saved or loaded since the game started), when the journal has grown past `compaction_threshold`, or
+    when the identity of the character changed.
+
+    Parameters:
+        file_path (str): The path of the save file.
+        state (dict): The canonical state of the character.
+        saved_at (float): When the character was saved, as a timestamp (only used for snapshots).
+
+    Returns:
+        compacted (bool): True if a snapshot was written instead of a journal record.
+    """
+
+    with journal_lock:
+        base = journal_bases.get(file_path)
+
+    if base is None or base['journal_size'] >= compaction_threshold or any(state[key] != base['state'][key] for key in identity_fields):
+        WriteSnapshot(file_path, state, saved_at)
+        return True
+
+    record = EncodeDelta(base['state'], state)
+
+    if not record:
+        return False
+
+    # The record is written where the last good one ended, so whatever a failed append left behind is overwritten
+    try:
+        with open(JournalPath(file_path), 'r+b') as file:
+            file.seek(base['journal_size'])
+            file.write(record_struct.pack(len(record), zlib.crc32(record)) + record)
+            file.truncate()
+            file.flush()
+            os.fsync(file.fileno())
+    except BaseException:
+        # The journal may not end where the base says anymore, the next save writes a snapshot instead
+        ForgetJournal(file_path)
+        raise
+
+    with journal_lock:
+        base['state'] = copy.deepcopy(state)
+        base['journal_size'] += record_struct.size + len(record)
+
+    return False
+
+def ReadJournaledSave(file_path: str):
+    """
+    Loads a character from a save file, replaying its journal on top of it.
+
+    Legacy saves and version 1 saves have no journal and are loaded as they are.
+
+    Parameters:
+        file_path (str): The path of the save file.
+
+    Returns:
+        player (Player): The character, with every journaled change applied.
+    """
+
+    if file_path.endswith(legacy_extension):
+        return ReadSave(file_path)
+
+    with open(file_path, 'rb') as file:
+        header, state = DecodeSaveState(file.read())
+
+    if 'saved_at' not in header:
+        return BuildPlayer(state)
+
+    journal_path = JournalPath(file_path)
+    records, journal_size = ReadJournal(journal_path, header['saved_at'])
+
+    for record in records:
+        ApplyDelta(state, record)
+
+    with journal_lock:
+        # Only continue a journal that is intact, otherwise the next save starts over with a snapshot
+        if journal_size and journal_size == os.path.getsize(journal_path):
+            journal_bases[file_path] = {'saved_at': header['saved_at'], 'state': copy.deepcopy(state), 'journal_size': journal_size}
+        else:
+            journal_bases.pop(file_path, None)
+
+    return BuildPlayer(state)
+
+def ForgetJournal(file_path: str) -> None:
+    """
+    Forgets the last state written for a save file, so its next save writes a snapshot. Used when a save is deleted, or when appending to its journal failed.
+
+    Parameters:
+        file_path (str): The path of the save file.
+    """
+
+    with journal_lock:
+        journal_bases.pop(file_path, None)
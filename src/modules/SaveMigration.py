@@ -0,0 +1,209 @@
+'''
+Bulk save migration for Console Quest RPG.
+
+Legacy saves are a pickle of whichever class wrote them, `Player` or `old_Player` (see the "Change either to
+Player or old_Player" imports), and version 1 saves lack the metadata header. The game can still load all of
+them, but it has to do the work again every time. This module rewrites a whole saves folder to the current
+save format in one go:
+- The folder is streamed with `os.scandir` and the files are spread over a `multiprocessing` pool, so tens
+  of thousands of saves never sit in memory at once and every core is kept busy.
+- The layout of every file is detected first: a pickled `Player`, a pickled `old_Player`, a binary save of
+  an older version, a current save, or something else.
+- Pickles are read with the restricted unpickler of `SaveFormat`, so a tampered save can't run code.
+- Legacy saves are written next to the pickle as a `.sav`, unless a `.sav` of the same character already
+  exists (it is newer). Older binary saves are upgraded in place. Either way the last played time is kept.
+- Every file is migrated on its own: a file that fails is reported and the others carry on.
+- A dry run detects and decodes every file and reports what would happen, without writing anything.
+
+The save catalog is rebuilt once the folder has been migrated, since it may point at the legacy saves.
+
+Run a migration from the root folder of the game with:
+    python -m src.modules.SaveMigration --dry-run
+    python -m src.modules.SaveMigration --directory saves --report migration.csv
+
+Functions:
+- DetectLayout: Detects the layout of a save from its contents.
+- ListSaveFiles: Streams the save files of a saves folder.
+- MigrateSaveFile: Migrates a single save file to the current save format, without ever raising.
+- MigrateSaves: Migrates every save file of a saves folder over a process pool.
+- main: Parses the command line arguments and runs the migration.
+'''
+
+from src.modules.SaveFormat import StateFromPlayer, EncodeState, DecodeSaveHeader, DecodeSaveState, LoadLegacySave, WriteFileAtomically
+from src.modules.SaveFormat import save_magic, save_version, save_extension, legacy_extension, saves_directory
+from src.modules.SaveCatalog import RebuildCatalog
+
+import argparse
+import collections
+import csv
+import multiprocessing
+import os
+
+report_columns = ('file', 'layout', 'action', 'error')
+shown_failures = 20     # Failures printed by the command line, the report lists all of them
+
+def DetectLayout(data: bytes) -> tuple[str, object]:
+    """
+    Detects the layout of a save from its contents.
+
+    Parameters:
+        data (bytes): The contents of the save file.
+
+    Returns:
+        layout (str): 'current', 'version N' for an older binary save, 'Player pickle' or 'old_Player pickle'.
+        character (LegacyCharacter): The unpickled character of a legacy save (None for binary saves).
+    """
+
+    if data[:len(save_magic)] == save_magic:
+        version = DecodeSaveHeader(data)['version']
+        return ('current' if version >= save_version else f'version {version}'), None
+
+    return LoadLegacySave(data)
+
+def ListSaveFiles(directory: str = saves_directory):
+    """
+    Streams the save files of a saves folder.
+
+    Parameters:
+        directory (str): The saves folder.
+
+    Yields:
+        file_path (str): The path of each binary or legacy save file, in no particular order.
+    """
+
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and os.path.splitext(entry.name)[1] in (save_extension, legacy_extension):
+                yield entry.path
+
+def MigrateSaveFile(task: tuple) -> tuple:
+    """
+    Migrates a single save file to the current save format, without ever raising.
+
+    Parameters:
+        task (tuple): The path of the save file, whether this is a dry run and whether to remove legacy saves once migrated.
+
+    Returns:
+        result (tuple): The path of the file, its layout, what was done ('migrated', 'would migrate', 'current',
+            'superseded' or 'failed') and the error (empty unless it failed).
+    """
+
+    file_path, dry_run, remove_legacy = task
+    layout = 'unknown'
+
+    try:
+        with open(file_path, 'rb') as file:
+            data = file.read()
+
+        layout, character = DetectLayout(data)
+
+        if layout == 'current':
+            return file_path, layout, 'current', ''
+
+        if character is not None:
+            target_path = os.path.splitext(file_path)[0] + save_extension
+
+            # A binary save of the same character was written after the pickle, the pickle is out of date
+            if os.path.exists(target_path):
+                return file_path, layout, 'superseded', ''
+
+            state = StateFromPlayer(character)
+        else:
+            target_path = file_path
+            state = DecodeSaveState(data)[1]
+
+        # Decoding the new save makes sure it loads before anything is replaced
+        new_data = EncodeState(state, os.path.getmtime(file_path))
+        DecodeSaveState(new_data)
+
+        if dry_run:
+            return file_path, layout, 'would migrate', ''
+
+        WriteFileAtomically(target_path, new_data)
+
+        if character is not None and remove_legacy:
+            os.remove(file_path)
+
+        return file_path, layout, 'migrated', ''
+    except Exception as error:
+        return file_path, layout, 'failed', f"{type(error).__name__}: {error}"
+
+def MigrateSaves(directory: str = saves_directory, dry_run: bool = False, remove_legacy: bool = False,
+                 report_path: str = None, processes: int = None, chunksize: int = 64) -> dict:
+    """
+    Migrates every save file of a saves folder over a process pool.
+
+    Parameters:
+        directory (str): The saves folder.
+        dry_run (bool): Whether to only report what would be migrated, without writing anything.
+        remove_legacy (bool): Whether to remove legacy saves once they have been migrated.
+        report_path (str): Optional CSV file to write the layout and outcome of every file to.
+        processes (int): Number of worker processes (one per core by default).
+        chunksize (int): Number of files handed to a worker at a time.
+
+    Returns:
+        summary (dict): How many files were found per layout ('layouts'), per outcome ('actions'), and the
+            (file path, error) of every file that failed ('failures').
+    """
+
+    summary = {'layouts': collections.Counter(), 'actions': collections.Counter(), 'failures': []}
+    tasks = ((file_path, dry_run, remove_legacy) for file_path in ListSaveFiles(directory))
+    report_file = open(report_path, 'w', newline = '', encoding = 'utf-8') if report_path else None
+
+    try:
+        report = csv.writer(report_file) if report_file else None
+
+        if report:
+            report.writerow(report_columns)
+
+        with multiprocessing.Pool(processes) as pool:
+            for file_path, layout, action, error in pool.imap_unordered(MigrateSaveFile, tasks, chunksize):
+                summary['layouts'][layout] += 1
+                summary['actions'][action] += 1
+
+                if error:
+                    summary['failures'].append((file_path, error))
+
+                if report:
+                    report.writerow((file_path, layout, action, error))
+    finally:
+        if report_file:
+            report_file.close()
+
+    # The catalog may point at legacy saves that were replaced or removed
+    if not dry_run and summary['actions']['migrated']:
+        RebuildCatalog(directory)
+
+    return summary
+
+def main():
+    """
+    Parses the command line arguments and runs the migration.
+    """
+
+    parser = argparse.ArgumentParser(description = "Migrates every save of Console Quest RPG to the current save format.")
+    parser.add_argument('--directory', default = saves_directory, help = "saves folder to migrate")
+    parser.add_argument('--dry-run', action = 'store_true', help = "only report what would be migrated")
+    parser.add_argument('--remove-legacy', action = 'store_true', help = "remove legacy .pkl saves once migrated")
+    parser.add_argument('--report', default = None, help = "CSV file to write the outcome of every file to")
+    parser.add_argument('--processes', type = int, default = None, help = "worker processes (one per core by default)")
+    arguments = parser.parse_args()
+
+    summary = MigrateSaves(arguments.directory, arguments.dry_run, arguments.remove_legacy, arguments.report, arguments.processes)
+
+    print(f" - Found {sum(summary['layouts'].values())} saves in {arguments.directory}" + (" (dry run)" if arguments.dry_run else ""))
+
+    for layout, count in sorted(summary['layouts'].items()):
+        print(f"   {layout}: {count}")
+
+    for action, count in sorted(summary['actions'].items()):
+        print(f" - {action.capitalize()}: {count}")
+
+    for file_path, error in summary['failures'][:shown_failures]:
+        print(f"   {file_path}: {error}")
+
+    if len(summary['failures']) > shown_failures:
+        print(f"   ... and {len(summary['failures']) - shown_failures} more" + (f", see {arguments.report}" if arguments.report else ""))
+
+if __name__ == '__main__':
+    main()
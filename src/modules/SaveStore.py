@@ -0,0 +1,265 @@
+'''
+Save storage backends for Console Quest RPG.
+
+Saves are kept as files in the saves folder by default (see `SaveFormat`, `SaveJournal` and `SaveCatalog`).
+They can also be kept in a single SQLite database, which holds up better when there are a lot of characters
+and can rank them without loading a single save. The backend is picked with the `CQ_SAVE_BACKEND`
+environment variable (`file` or `sqlite`), and the database lives in `saves/saves.db` unless
+`CQ_SAVE_DATABASE` points somewhere else.
+
+The database backend:
+- Runs in WAL mode, so the menus can read the database while the writer thread is writing to it.
+- Keeps every character in one row of the `characters` table: the encoded save (the same binary format as a
+  .sav file) along with the level, race, class, gold, kills, deaths and last played time of the character.
+- Indexes the table on name, level and kills, so listing and ranking characters never scans the saves.
+- Only uses parameterized statements, which `sqlite3` prepares once and keeps in its statement cache.
+- Writes every save the writer thread picked up at once, in a single transaction.
+
+Functions:
+- OpenDatabase: Returns the connection of the current thread to the save database, creating the database if needed.
+- WriteSaveFiles: Writes a batch of queued saves to the saves folder.
+- WriteSaveRows: Writes a batch of queued saves to the save database in a single transaction.
+- WriteQueuedSaves: Writes a batch of queued saves with the selected backend.
+- ListStoredSaves: Returns the details of every saved character.
+- LoadStoredSave: Loads a saved character.
+- DeleteStoredSave: Deletes a saved character.
+- TopCharacters: Returns the saved characters ranked by kills, deaths, level or gold.
+'''
+
+from src.modules.SaveFormat import EncodeState, DecodeSaveState, BuildPlayer, SaveFileName, legacy_extension, saves_directory
+from src.modules.SaveJournal import WriteSnapshot, AppendJournal, ReadJournaledSave, ForgetJournal, JournalPath
+from src.modules.SaveCatalog import LoadCatalog, CatalogFilePath, UpdateCatalog, RemoveFromCatalog
+from src.modules.TraceHandler import Traced
+
+import os
+import sqlite3
+import threading
+
+save_backend = os.environ.get('CQ_SAVE_BACKEND', 'file').strip().lower()
+database_path = os.environ.get('CQ_SAVE_DATABASE', os.path.join(saves_directory, 'saves.db'))
+
+if save_backend not in ('file', 'sqlite'):
+    raise ValueError(f"Unknown save backend '{save_backend}', expected 'file' or 'sqlite'.")
+
+schema_statements = (
+    """CREATE TABLE IF NOT EXISTS characters (
+        name TEXT PRIMARY KEY,
+        level INTEGER NOT NULL,
+        race TEXT NOT NULL,
+        player_class TEXT NOT NULL,
+        gold REAL NOT NULL,
+        total_kills INTEGER NOT NULL,
+        total_deaths INTEGER NOT NULL,
+        last_played REAL NOT NULL,
+        save BLOB NOT NULL
+    )""",
+    # The primary key already indexes the name
+    "CREATE INDEX IF NOT EXISTS characters_level ON characters (level)",
+    "CREATE INDEX IF NOT EXISTS characters_kills ON characters (total_kills)"
+)
+
+write_statement = """INSERT OR REPLACE INTO characters (name, level, race, player_class, gold, total_kills, total_deaths, last_played, save)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+list_statement = "SELECT name, level, race, player_class, gold, last_played FROM characters"
+load_statement = "SELECT save FROM characters WHERE name = ?"
+delete_statement = "DELETE FROM characters WHERE name = ?"
+
+# Columns characters can be ranked by, the column names can't be passed as parameters
+ranking_columns = ('total_kills', 'total_deaths', 'level', 'gold')
+
+# Every thread gets its own connection, since a connection can only be used by the thread that opened it
+database_connections = threading.local()
+
+def OpenDatabase(path: str = None) -> sqlite3.Connection:
+    """
+    Returns the connection of the current thread to the save database, creating the database if needed.
+
+    Parameters:
+        path (str): The path of the database (`database_path` by default).
+
+    Returns:
+        connection (sqlite3.Connection): The connection, kept open for the next call from the same thread.
+    """
+
+    path = path or database_path
+    connections = database_connections.__dict__.setdefault('connections', {})
+
+    if path not in connections:
+        directory = os.path.dirname(path)
+
+        if directory:
+            os.makedirs(directory, exist_ok = True)
+
+        connection = sqlite3.connect(path, timeout = 10.0)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")    # Safe in WAL mode, a crash can only lose the last transaction
+
+        with connection:
+            for statement in schema_statements:
+                connection.execute(statement)
+
+        connections[path] = connection
+
+    return connections[path]
+
+def WriteSaveFiles(saves: list) -> list:
+    """
+    Writes a batch of queued saves to the saves folder.
+
+    Full saves write a snapshot of the character, autosaves only journal what changed since the last save.
+
+    Parameters:
+        saves (list): The queued saves, as (file path, (directory, character name, state, save time, catalog entry, full save)).
+
+    Returns:
+        errors (list): The (file path, error) of every save that failed to write.
+    """
+
+    errors = []
+
+    for file_path, (directory, save_name, state, saved_at, entry, full_save) in saves:
+        try:
+            if full_save:
+                WriteSnapshot(file_path, state, saved_at)
+            else:
+                # Journaled saves only touch the catalog in memory, unless the journal was compacted
+                full_save = AppendJournal(file_path, state, saved_at)
+
+            UpdateCatalog(save_name, entry, directory, write = full_save)
+        except Exception as error:
+            errors.append((file_path, error))
+
+    return errors
+
+def WriteSaveRows(saves: list) -> list:
+    """
+    Writes a batch of queued saves to the save database in a single transaction.
+
+    The database always stores the whole character, so autosaves and full saves are written the same way.
+
+    Parameters:
+        saves (list): The queued saves, as (file path, (directory, character name, state, save time, catalog entry, full save)).
+
+    Returns:
+        errors (list): The (file path, error) of every save that failed to write (all of them if the transaction failed).
+    """
+
+    try:
+        rows = [
+            (save_name, state['level'], state['race'], state['player_class'], state['gold'], state['total_kills'],
+             state['total_deaths'], saved_at, EncodeState(state, saved_at))
+            for file_path, (directory, save_name, state, saved_at, entry, full_save) in saves
+        ]
+
+        connection = OpenDatabase()
+
+        with connection:
+            connection.executemany(write_statement, rows)
+    except Exception as error:
+        return [(file_path, error) for file_path, queued_save in saves]
+
+    return []
+
+@Traced('WriteQueuedSaves', 'saves')
+def WriteQueuedSaves(saves: list) -> list:
+    """
+    Writes a batch of queued saves with the selected backend.
+
+    Parameters:
+        saves (list): The queued saves, as (file path, (directory, character name, state, save time, catalog entry, full save)).
+
+    Returns:
+        errors (list): The (file path, error) of every save that failed to write.
+    """
+
+    if save_backend == 'sqlite':
+        return WriteSaveRows(saves)
+
+    return WriteSaveFiles(saves)
+
+def ListStoredSaves() -> dict:
+    """
+    Returns the details of every saved character.
+
+    Returns:
+        saves (dict): The level, race, class, gold and last played time of each saved character, keyed by character name (see `CatalogEntry`).
+    """
+
+    if save_backend == 'file':
+        return LoadCatalog()
+
+    saves = {}
+
+    for name, level, race, player_class, gold, last_played in OpenDatabase().execute(list_statement):
+        saves[name] = {'level': level, 'race': race, 'player_class': player_class, 'gold': gold, 'last_played': last_played}
+
+    return saves
+
+def LoadStoredSave(save_name: str):
+    """
+    Loads a saved character.
+
+    Parameters:
+        save_name (str): The name of the saved character.
+
+    Returns:
+        player (Player): The saved character.
+    """
+
+    if save_backend == 'file':
+        return ReadJournaledSave(CatalogFilePath(LoadCatalog()[save_name]))
+
+    row = OpenDatabase().execute(load_statement, (save_name,)).fetchone()
+
+    if row is None:
+        raise ValueError(f"No saved character named '{save_name}'.")
+
+    return BuildPlayer(DecodeSaveState(row[0])[1])
+
+def DeleteStoredSave(save_name: str) -> None:
+    """
+    Deletes a saved character.
+
+    Parameters:
+        save_name (str): The name of the saved character.
+    """
+
+    if save_backend == 'sqlite':
+        connection = OpenDatabase()
+
+        with connection:
+            connection.execute(delete_statement, (save_name,))
+
+        return
+
+    save_path = os.path.join(saves_directory, SaveFileName(save_name))
+
+    # Remove the journal and legacy save too, or they would show up again the next time the catalog is rebuilt
+    for file_path in (save_path, JournalPath(save_path), os.path.join(saves_directory, save_name + legacy_extension)):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    ForgetJournal(save_path)
+    RemoveFromCatalog(save_name)
+
+def TopCharacters(by: str = 'total_kills', limit: int = 10) -> list:
+    """
+    Returns the saved characters ranked by kills, deaths, level or gold. Only available with the database backend.
+
+    Parameters:
+        by (str): The column to rank the characters by, one of `ranking_columns`.
+        limit (int): The number of characters to return at most.
+
+    Returns:
+        characters (list): The (name, level, race, class, value ranked by) of each character, best first.
+    """
+
+    if save_backend != 'sqlite':
+        raise ValueError("Ranking characters needs the sqlite save backend.")
+
+    if by not in ranking_columns:
+        raise ValueError(f"Can't rank characters by '{by}', expected one of {', '.join(ranking_columns)}.")
+
+    statement = f"SELECT name, level, race, player_class, {by} FROM characters ORDER BY {by} DESC, name LIMIT ?"
+
+    return OpenDatabase().execute(statement, (limit,)).fetchall()
@@ -0,0 +1,182 @@
+'''
+Background save writer for Console Quest RPG.
+
+Saving used to write the save file on the spot, from the pause menu and after every death, so a slow
+disk would freeze the game until the write finished. This module hands saves off to a writer thread:
+- The state of the character is copied right away, so the save holds the character exactly as it was when saved.
+- Saves of the same character that pile up before the writer gets to them are merged, only the newest is written.
+- Every save waiting when the writer wakes up is written as one batch (see `SaveStore`).
+- Full saves are written to a temporary file, flushed to disk and renamed over the old save (see `WriteFileAtomically`).
+- Autosaves only append what changed since the last save to the character's journal (see `SaveJournal`).
+- Saves still waiting when the game exits are written before it closes.
+- Saves that fail to write are kept, and tried again with the next save or flush. Their errors are handed to
+  the game by `TakeSaveErrors` and `FlushSaves`, and printed to stderr if they still fail when the game exits.
+- The save catalog is updated once the save is safely on disk (see `SaveCatalog`).
+
+Functions:
+- QueueSave: Queues a character to be saved by the writer thread.
+- RetryFailedSaves: Queues the saves that failed to write again.
+- TakeSaveErrors: Returns the errors of the saves that failed to write since they were last taken.
+- FlushSaves: Waits until every queued save has been written.
+- SaveWriterLoop: Writes queued saves until the game exits, run by the writer thread.
+- StartSaveWriter: Starts the writer thread if it isn't running yet.
+- FlushSavesOnExit: Writes every queued save and catalog change before the game exits.
+'''
+
+from src.modules.SaveFormat import StateFromPlayer, SaveFileName, saves_directory
+from src.modules.SaveCatalog import CatalogEntry, WriteDirtyCatalogs
+from src.modules.SaveStore import WriteQueuedSaves
+
+import atexit
+import os
+import sys
+import threading
+import time
+
+# Saves waiting to be written, keyed by file path: (directory, character name, state, save time, catalog entry, full save)
+# A newer save of the same character replaces the older one
+pending_saves = {}
+# Saves that failed to write, kept as they were queued until they are tried again
+failed_saves = {}
+# Errors from saves that failed to write since they were last taken, as (file path, error)
+save_errors = []
+save_condition = threading.Condition()
+writer_state = {'thread': None, 'writing': None}
+
+def QueueSave(player, directory: str = saves_directory, full_save: bool = True) -> str:
+    """
+    Queues a character to be saved by the writer thread.
+
+    Parameters:
+        player (Player): The character to save.
+        directory (str): The folder to save the character in.
+        full_save (bool): Whether to write the whole character, or only journal what changed since the last save.
+
+    Returns:
+        file_path (str): The path the save will be written to.
+    """
+
+    file_path = os.path.join(directory, SaveFileName(player.name))
+    saved_at = time.time()
+
+    with save_condition:
+        # A full save that is still waiting stays a full save when an autosave replaces it
+        full_save = full_save or (file_path in pending_saves and pending_saves[file_path][5])
+        pending_saves[file_path] = (directory, player.name, StateFromPlayer(player), saved_at, CatalogEntry(player, saved_at), full_save)
+        RetryFailedSaves()
+        StartSaveWriter()
+        save_condition.notify_all()
+
+    return file_path
+
+def RetryFailedSaves() -> None:
+    """
+    Queues the saves that failed to write again, unless a newer save of the same character is waiting.
+    Must be called while holding `save_condition`.
+    """
+
+    for file_path, failed_save in failed_saves.items():
+        if file_path not in pending_saves:
+            pending_saves[file_path] = failed_save
+        elif failed_save[5] and not pending_saves[file_path][5]:
+            # The newer save only journals what changed, the snapshot the failed save was meant to write is still needed
+            pending_saves[file_path] = pending_saves[file_path][:5] + (True,)
+
+    failed_saves.clear()
+
+def TakeSaveErrors() -> list:
+    """
+    Returns the errors of the saves that failed to write since they were last taken, without waiting for the writer.
+
+    Returns:
+        errors (list): The (file path, error) of every save that failed to write.
+    """
+
+    with save_condition:
+        errors = list(save_errors)
+        save_errors.clear()
+
+    return errors
+
+def FlushSaves(timeout: float = None) -> list:
+    """
+    Waits until every queued save has been written, trying the saves that failed before once more.
+
+    Parameters:
+        timeout (float): Optional number of seconds to wait at most.
+
+    Returns:
+        errors (list): The (file path, error) of every save that failed to write since the errors were last taken.
+    """
+
+    with save_condition:
+        if failed_saves:
+            RetryFailedSaves()
+            StartSaveWriter()
+            save_condition.notify_all()
+
+        save_condition.wait_for(lambda: not pending_saves and writer_state['writing'] is None, timeout)
+        errors = list(save_errors)
+        save_errors.clear()
+
+    return errors
+
+def SaveWriterLoop() -> None:
+    """
+    Writes queued saves until the game exits, run by the writer thread.
+    """
+
+    while True:
+        with save_condition:
+            save_condition.wait_for(lambda: pending_saves)
+            saves = list(pending_saves.items())
+            pending_saves.clear()
+            writer_state['writing'] = [file_path for file_path, queued_save in saves]
+
+        try:
+            errors = WriteQueuedSaves(saves)
+        except Exception as error:
+            # Whatever went wrong, the writer has to keep running and the batch must not be lost
+            errors = [(file_path, error) for file_path, queued_save in saves]
+
+        failed_paths = {file_path for file_path, error in errors}
+
+        with save_condition:
+            for file_path, queued_save in saves:
+                if file_path in failed_paths:
+                    failed_saves[file_path] = queued_save
+
+            save_errors.extend(errors)
+            writer_state['writing'] = None
+            save_condition.notify_all()
+
+def StartSaveWriter() -> None:
+    """
+    Starts the writer thread if it isn't running yet. Must be called while holding `save_condition`.
+    """
+
+    if writer_state['thread'] is None or not writer_state['thread'].is_alive():
+        writer_state['thread'] = threading.Thread(target = SaveWriterLoop, name = "SaveWriter", daemon = True)
+        writer_state['thread'].start()
+
+def FlushSavesOnExit(timeout: float = None) -> None:
+    """
+    Writes every queued save and catalog change before the game exits.
+
+    Parameters:
+        timeout (float): Optional number of seconds to wait for the saves at most.
+    """
+
+    for file_path, error in FlushSaves(timeout):
+        print(f"Failed to save {file_path}: {error}", file = sys.stderr)
+
+    with save_condition:
+        unwritten = len(pending_saves) + len(writer_state['writing'] or ())
+
+    if unwritten:
+        print(f"{unwritten} saves were still being written when the game exited.", file = sys.stderr)
+
+    WriteDirtyCatalogs()
+
+# The writer thread is a daemon so it never keeps the game open, write whatever is left before exiting
+atexit.register(FlushSavesOnExit)
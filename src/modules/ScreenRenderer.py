@@ -0,0 +1,326 @@
+'''
+Frame-buffer terminal renderer for Console Quest RPG.
+
+Clearing the screen used to run `clear` (or `cls`) in a new shell for every screen: every menu, every
+combat turn and every level-up keystroke, and the whole screen was sent to the terminal again each time.
+This module keeps the screen in memory instead:
+- While the renderer runs, everything the game prints goes into the frame being built, nothing is written
+  to the terminal yet.
+- Clearing the console starts a new, empty frame without spawning anything.
+- When the output is flushed (`input` flushes before reading, and the game flushes before waiting), the frame
+  is compared with what is on the screen, and only the lines that changed are sent, each one placed with
+  ANSI cursor movement, in a single write.
+- Frames that don't fit in the terminal are redrawn in full, since the lines scrolled off can't be reached.
+
+The renderer is only used when the game runs in a terminal, on anything but Windows (whose console only
+understands the cursor movement codes when told to). It can be turned on or off with the `CQ_RENDERER`
+environment variable (`ansi` or `plain`), plain being the old behavior of clearing the screen with a shell.
+
+Sessions of the game server (see `GameServer`) each get a frame buffer of their own, drawn on their connection.
+`sys.stdout` is then replaced by a `RoutedOutput`, which sends what each session thread prints to the frame
+buffer of its session, and everything else where it went before.
+
+Functions:
+- FrameBuffer: Text stream that builds frames in memory and sends only their changes to the terminal.
+- RoutedOutput: Text stream that sends what each session thread prints to the frame buffer of its session.
+- VisibleWidth: Returns how many columns a line takes up in the terminal, ignoring color codes.
+- StartRenderer: Starts sending everything the game prints through a frame buffer, if the terminal supports it.
+- StopRenderer: Draws the last frame and sends everything printed afterwards straight to the terminal again.
+- StartSessionRenderer: Sends everything the current thread prints through a frame buffer drawn on a session stream.
+- StopSessionRenderer: Draws the last frame of the current thread's session and stops sending its output there.
+- CurrentFrameBuffer: Returns the frame buffer the current thread prints to.
+- NewFrame: Starts a new, empty frame, replacing the console clear.
+- IsRendering: Returns whether the renderer is running.
+'''
+
+from src.modules.TraceHandler import Traced
+
+import atexit
+import io
+import os
+import re
+import shutil
+import sys
+import threading
+
+color_code_pattern = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+
+class FrameBuffer(io.TextIOBase):
+    """
+    Text stream that builds frames in memory and sends only their changes to the terminal.
+
+    Args:
+        stream (file): The terminal stream the frames are drawn on (usually `sys.stdout`).
+        size (os.terminal_size): Fixed size of the terminal, for streams whose size can't be asked (the console size by default).
+
+    Attributes:
+        lines (list): The finished lines of the frame being built.
+        partial (str): The unfinished last line of the frame being built (e.g. an input prompt).
+        screen (list): The lines on the screen, as last drawn (None when unknown, the next frame is then redrawn in full).
+        changed (bool): Whether the frame changed since it was last drawn.
+        awaiting_input (bool): Whether the last frame drawn ended on a prompt, which the player has answered since.
+    """
+
+    def __init__(self, stream, size = None):
+        super().__init__()
+        self.stream = stream
+        self.size = size
+        self.lines = []
+        self.partial = ''
+        self.screen = None
+        self.changed = False
+        self.awaiting_input = False
+
+    @property
+    def encoding(self):
+        return self.stream.encoding
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return True
+
+    def write(self, text):
+        if not text:
+            return 0
+
+        # The answer to the last prompt moved the cursor to the next line, unless the prompt is being overwritten
+        if self.awaiting_input and not text.startswith('\r'):
+            self.lines.append(self.partial)
+            self.partial = ''
+
+        self.awaiting_input = False
+        self.changed = True
+        *finished, partial = (self.partial + text).split('\n')
+
+        # A carriage return goes back to the start of the line, so only what follows the last one is kept
+        self.lines.extend(line.rsplit('\r', 1)[-1] for line in finished)
+        self.partial = partial.rsplit('\r', 1)[-1]
+
+        return len(text)
+
+    def flush(self):
+        if self.changed:
+            self.Draw()
+
+    def Clear(self):
+        """
+        Starts a new, empty frame. The screen keeps the last frame until the new one is drawn.
+        """
+
+        self.lines = []
+        self.partial = ''
+        self.changed = True
+        self.awaiting_input = False
+
+    @Traced('FrameBuffer.Draw', 'render')
+    def Draw(self):
+        """
+        Sends the lines of the frame that changed since the last draw to the terminal, in a single write.
+        """
+
+        frame = self.lines + [self.partial]
+        size = self.size or shutil.get_terminal_size()
+
+        if self.screen is None or len(frame) > size.lines or any(VisibleWidth(line) > size.columns for line in frame):
+            output = ['\x1b[H\x1b[2J', '\n'.join(frame)]
+            fits = len(frame) <= size.lines and all(VisibleWidth(line) <= size.columns for line in frame)
+            self.screen = list(frame) if fits else None
+        else:
+            output = []
+
+            for row, line in enumerate(frame[:-1]):
+                if row >= len(self.screen) or self.screen[row] != line:
+                    output.append(f'\x1b[{row + 1};1H{line}\x1b[K')
+
+            if len(self.screen) > len(frame):
+                output.append(f'\x1b[{len(frame) + 1};1H\x1b[J')
+
+            # The last line is always drawn last, which leaves the cursor right after it for the next prompt
+            output.append(f'\x1b[{len(frame)};1H{frame[-1]}\x1b[K')
+            self.screen = list(frame)
+
+        # Whatever the player types after a prompt is echoed on its line, so that line has to be drawn again next time
+        if self.partial:
+            self.awaiting_input = True
+
+            if self.screen is not None:
+                self.screen[-1] = None
+
+        data = ''.join(output).encode(self.stream.encoding or 'utf-8', 'replace')
+        buffer = getattr(self.stream, 'buffer', None)
+
+        if buffer is not None:
+            self.stream.flush()
+            buffer.write(data)
+            buffer.flush()
+        else:
+            self.stream.write(data.decode(self.stream.encoding or 'utf-8'))
+            self.stream.flush()
+
+        self.changed = False
+
+class RoutedOutput(io.TextIOBase):
+    """
+    Text stream that sends what each session thread prints to the frame buffer of its session.
+
+    Args:
+        stream (file): Where everything printed outside of a session goes (the `sys.stdout` it replaces).
+    """
+
+    def __init__(self, stream):
+        super().__init__()
+        self.stream = stream
+
+    def Target(self):
+        """
+        Returns the stream the current thread prints to.
+        """
+
+        return getattr(session_renderers, 'buffer', None) or self.stream
+
+    @property
+    def encoding(self):
+        return self.Target().encoding
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return self.Target().isatty()
+
+    def write(self, text):
+        return self.Target().write(text)
+
+    def flush(self):
+        self.Target().flush()
+
+renderer_state = {'buffer': None, 'stream': None}
+routing_lock = threading.Lock()
+
+# The frame buffer of the session each thread runs, if any
+session_renderers = threading.local()
+
+def VisibleWidth(line: str) -> int:
+    """
+    Returns how many columns a line takes up in the terminal, ignoring color codes.
+
+    Parameters:
+        line (str): The line.
+
+    Returns:
+        width (int): The number of columns.
+    """
+
+    return len(color_code_pattern.sub('', line))
+
+def StartRenderer(stream = None) -> bool:
+    """
+    Starts sending everything the game prints through a frame buffer, if the terminal supports it.
+
+    Parameters:
+        stream (file): Optional stream to draw the frames on instead of the console, always used (e.g. a null terminal for benchmarks).
+
+    Returns:
+        started (bool): Whether the renderer is running.
+    """
+
+    if renderer_state['buffer'] is not None:
+        return True
+
+    if stream is None:
+        mode = os.environ.get('CQ_RENDERER', '').strip().lower()
+        supported = sys.stdout.isatty() and os.name != 'nt'
+
+        if mode == 'plain' or (mode != 'ansi' and not supported):
+            return False
+
+    renderer_state['stream'] = sys.stdout
+    renderer_state['buffer'] = FrameBuffer(stream if stream is not None else sys.stdout)
+    sys.stdout = renderer_state['buffer']
+
+    return True
+
+def StopRenderer() -> None:
+    """
+    Draws the last frame and sends everything printed afterwards straight to the terminal again.
+    """
+
+    frame_buffer = renderer_state['buffer']
+
+    if frame_buffer is None:
+        return
+
+    frame_buffer.flush()
+    sys.stdout = renderer_state['stream']
+    renderer_state['buffer'] = None
+    renderer_state['stream'] = None
+
+    # Leave the cursor on a line of its own below the last frame
+    frame_buffer.stream.write('\n')
+    frame_buffer.stream.flush()
+
+def StartSessionRenderer(stream, size: os.terminal_size) -> FrameBuffer:
+    """
+    Sends everything the current thread prints through a frame buffer drawn on a session stream.
+
+    Parameters:
+        stream (file): The stream of the session, e.g. a network connection.
+        size (os.terminal_size): The size of the session's terminal.
+
+    Returns:
+        frame_buffer (FrameBuffer): The frame buffer of the session.
+    """
+
+    with routing_lock:
+        if not isinstance(sys.stdout, RoutedOutput):
+            sys.stdout = RoutedOutput(sys.stdout)
+
+    session_renderers.buffer = FrameBuffer(stream, size)
+
+    return session_renderers.buffer
+
+def StopSessionRenderer() -> None:
+    """
+    Draws the last frame of the current thread's session and stops sending its output there.
+    """
+
+    frame_buffer = getattr(session_renderers, 'buffer', None)
+    session_renderers.buffer = None
+
+    if frame_buffer is not None:
+        frame_buffer.flush()
+
+def CurrentFrameBuffer() -> FrameBuffer:
+    """
+    Returns the frame buffer the current thread prints to, its session's or the console's (None if there is neither).
+    """
+
+    return getattr(session_renderers, 'buffer', None) or renderer_state['buffer']
+
+def NewFrame() -> bool:
+    """
+    Starts a new, empty frame, replacing the console clear.
+
+    Returns:
+        started (bool): Whether a new frame was started (False if the renderer isn't running).
+    """
+
+    frame_buffer = CurrentFrameBuffer()
+
+    if frame_buffer is None:
+        return False
+
+    frame_buffer.Clear()
+
+    return True
+
+def IsRendering() -> bool:
+    """
+    Returns whether the renderer is running, for the console or the session of the current thread.
+    """
+
+    return CurrentFrameBuffer() is not None
+
+atexit.register(StopRenderer)
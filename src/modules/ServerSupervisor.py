@@ -0,0 +1,461 @@
+'''
+Multi-process game server for Console Quest RPG.
+
+A single game server (see `GameServer`) runs in one process, so it only ever uses one core. This module
+spreads the players over a number of worker processes instead:
+- The supervisor forks the workers up front, then accepts every connection itself and hands it over to the
+  least loaded worker, over a Unix socket of its own (file descriptors can be sent over Unix sockets).
+- Every worker serves its connections like a standalone game server, and reports its health (open
+  sessions, sessions served and turned away, threads, memory and CPU time) to the supervisor every
+  `--health-interval` seconds. The supervisor prints the health of every worker, and writes it as JSON if
+  asked to.
+- A worker that dies is replaced. A worker stays on its own sessions, none of them ever moves.
+- On SIGINT or SIGTERM the supervisor stops accepting connections and tells the workers to drain: every
+  player can finish their game, and workers exit once their last session ends (or after `--drain-timeout`
+  seconds), with their saves written. Once draining, a worker ignores SIGTERM while it writes its saves, and
+  the supervisor gives it `save_flush_timeout` seconds to do so before terminating it.
+
+Workers write their saves concurrently, which only the SQLite save backend (see `SaveStore`) is safe for, so
+the supervisor picks it unless `CQ_SAVE_BACKEND` asks for something else, which it refuses.
+
+The supervisor relies on `fork` and on sending file descriptors, so it only runs on Unix. Run it from the
+root folder of the game with:
+    python -m src.modules.ServerSupervisor --port 4000 --workers 4 --metrics workers.json
+
+Functions:
+- SendHealth: Sends the health of a worker to the supervisor.
+- ServeWorker: Serves the connections the supervisor hands over to a worker, until it drains.
+- RunWorker: Runs a worker process.
+- StartWorker: Forks a worker process.
+- PickWorker: Returns the least loaded worker that takes new sessions.
+- DispatchConnection: Hands a connection over to the least loaded worker.
+- WorkerMetrics: Returns the health of every worker.
+- Supervise: Runs the workers and hands every connection over to them, until the supervisor is stopped.
+- main: Parses the command line arguments and runs the supervisor.
+'''
+
+from src.modules.GameServer import PrepareSessions, ServeSocket, server_state
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import resource
+import selectors
+import signal
+import socket
+import threading
+import time
+
+max_handoff = 16          # File descriptors a worker receives in a single message at most
+handoff_timeout = 1.0     # Seconds the supervisor waits on a busy worker before giving the connection to another
+save_flush_timeout = 30.0 # Seconds a drained worker may spend writing the saves still queued
+
+def SendHealth(channel: socket.socket, number: int, state: str) -> None:
+    """
+    Sends the health of a worker to the supervisor.
+
+    Parameters:
+        channel (socket.socket): The worker's end of its channel to the supervisor.
+        number (int): Number of the worker.
+        state (str): What the worker is doing ('serving', 'draining' or 'stopped').
+    """
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    health = {
+        'worker': number,
+        'pid': os.getpid(),
+        'state': state,
+        'open': server_state['open'],
+        'total': server_state['total'],
+        'refused': server_state['refused'],
+        'threads': threading.active_count(),
+        'max_rss_kb': usage.ru_maxrss,
+        'cpu_seconds': round(usage.ru_utime + usage.ru_stime, 3)
+    }
+
+    try:
+        channel.send(json.dumps(health).encode('utf-8'))
+    except OSError:
+        pass     # The supervisor is busy or gone, the next report will do
+
+async def ServeWorker(number: int, channel: socket.socket, size: os.terminal_size, max_sessions: int,
+                      health_interval: float, drain_timeout: float) -> None:
+    """
+    Serves the connections the supervisor hands over to a worker, until it drains.
+
+    Parameters:
+        number (int): Number of the worker.
+        channel (socket.socket): The worker's end of its channel to the supervisor.
+        size (os.terminal_size): The size of the players' terminals.
+        max_sessions (int): The number of sessions the worker runs at most.
+        health_interval (float): Seconds between health reports.
+        drain_timeout (float): Seconds the worker waits for its sessions to end once draining.
+    """
+
+    loop = asyncio.get_running_loop()
+    draining = asyncio.Event()
+    connections = set()
+
+    def receive():
+        try:
+            message, descriptors, flags, address = socket.recv_fds(channel, 64, max_handoff)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            message, descriptors = b'', []
+
+        for descriptor in descriptors:
+            connection = socket.socket(fileno = descriptor)
+
+            if message == b'connect' and not draining.is_set():
+                task = loop.create_task(ServeSocket(connection, size, max_sessions))
+                connections.add(task)
+                task.add_done_callback(connections.discard)
+            else:
+                connection.close()
+
+        # An empty message means the supervisor is gone, there won't be any more connections either way
+        if not message:
+            loop.remove_reader(channel.fileno())
+
+        if message in (b'drain', b''):
+            draining.set()
+
+    channel.setblocking(False)
+    loop.add_reader(channel.fileno(), receive)
+    loop.add_signal_handler(signal.SIGTERM, draining.set)
+
+    while not draining.is_set():
+        SendHealth(channel, number, 'serving')
+
+        try:
+            await asyncio.wait_for(draining.wait(), health_interval)
+        except asyncio.TimeoutError:
+            pass
+
+    deadline = loop.time() + drain_timeout
+
+    while server_state['open'] and loop.time() < deadline:
+        SendHealth(channel, number, 'draining')
+        await asyncio.sleep(min(health_interval, max(deadline - loop.time(), 0)))
+
+    SendHealth(channel, number, 'stopped')
+
+def RunWorker(number: int, channel: socket.socket, inherited: list, size: os.terminal_size, max_sessions: int,
+              health_interval: float, drain_timeout: float) -> None:
+    """
+    Runs a worker process.
+
+    Parameters:
+        number (int): Number of the worker.
+        channel (socket.socket): The worker's end of its channel to the supervisor.
+        inherited (list): The sockets of the supervisor the worker was forked with, which it closes.
+        size (os.terminal_size): The size of the players' terminals.
+        max_sessions (int): The number of sessions the worker runs at most.
+        health_interval (float): Seconds between health reports.
+        drain_timeout (float): Seconds the worker waits for its sessions to end once draining.
+    """
+
+    # Only the supervisor decides when to stop, Ctrl+C in the terminal reaches the workers too
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    for inherited_socket in inherited:
+        inherited_socket.close()
+
+    PrepareSessions()
+
+    try:
+        asyncio.run(ServeWorker(number, channel, size, max_sessions, health_interval, drain_timeout))
+    finally:
+        # The event loop and its SIGTERM handler are gone, a SIGTERM now would kill the worker in the middle of a save
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+        # Worker processes don't run atexit handlers, so the saves still queued are written here
+        from src.modules.SaveWriter import FlushSavesOnExit
+
+        FlushSavesOnExit(save_flush_timeout)
+
+def StartWorker(number: int, inherited: list, settings: dict) -> dict:
+    """
+    Forks a worker process.
+
+    Parameters:
+        number (int): Number of the worker.
+        inherited (list): The sockets of the supervisor, closed by the worker.
+        settings (dict): The size, max_sessions, health_interval and drain_timeout of the worker.
+
+    Returns:
+        worker (dict): The worker's process, its channel, its last health report, the sessions handed over
+            to it since that report ('pending') and when it started.
+    """
+
+    channel, worker_channel = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    process = multiprocessing.get_context('fork').Process(
+        target = RunWorker, name = f"Worker-{number}", daemon = False,
+        args = (number, worker_channel, inherited + [channel], settings['size'], settings['max_sessions'],
+                settings['health_interval'], settings['drain_timeout'])
+    )
+    process.start()
+    worker_channel.close()
+    channel.settimeout(handoff_timeout)
+
+    return {'number': number, 'process': process, 'channel': channel, 'health': {}, 'pending': 0, 'started': time.time()}
+
+def PickWorker(workers: list) -> dict:
+    """
+    Returns the least loaded worker that takes new sessions.
+
+    Parameters:
+        workers (list): The workers.
+
+    Returns:
+        worker (dict): The worker with the fewest open sessions, counting the ones it was just handed (None if no worker takes sessions).
+    """
+
+    candidates = [worker for worker in workers
+                  if worker['process'].is_alive() and worker['health'].get('state', 'serving') == 'serving']
+
+    if not candidates:
+        return None
+
+    return min(candidates, key = lambda worker: (worker['health'].get('open', 0) + worker['pending'], worker['number']))
+
+def DispatchConnection(connection: socket.socket, workers: list) -> bool:
+    """
+    Hands a connection over to the least loaded worker, trying the next one if that worker can't take it.
+
+    Parameters:
+        connection (socket.socket): The connection the supervisor accepted.
+        workers (list): The workers.
+
+    Returns:
+        dispatched (bool): Whether a worker took the connection (it is closed otherwise).
+    """
+
+    tried = []
+
+    try:
+        while (worker := PickWorker([worker for worker in workers if worker not in tried])) is not None:
+            try:
+                socket.send_fds(worker['channel'], [b'connect'], [connection.fileno()])
+            except OSError:
+                tried.append(worker)
+                continue
+
+            worker['pending'] += 1
+
+            return True
+
+        return False
+    finally:
+        connection.close()
+
+def WorkerMetrics(workers: list, supervisor_state: dict) -> dict:
+    """
+    Returns the health of every worker.
+
+    Parameters:
+        workers (list): The workers.
+        supervisor_state (dict): The connections accepted and dispatched, and the workers restarted, by the supervisor.
+
+    Returns:
+        metrics (dict): The supervisor's counts, and the last health report of every worker, along with its number,
+            whether it is alive, its uptime and how old the report is.
+    """
+
+    now = time.time()
+    report = []
+
+    for worker in workers:
+        health = dict(worker['health'])
+        health.update({
+            'worker': worker['number'],
+            'pid': worker['process'].pid,
+            'alive': worker['process'].is_alive(),
+            'uptime': round(now - worker['started'], 1),
+            'report_age': round(now - worker['reported'], 1) if 'reported' in worker else None,
+            'pending': worker['pending']
+        })
+        report.append(health)
+
+    return dict(supervisor_state, time = now, workers = report)
+
+def Supervise(host: str = '127.0.0.1', port: int = 4000, worker_count: int = None, size: os.terminal_size = os.terminal_size((80, 24)),
+              max_sessions: int = 5000, health_interval: float = 1.0, drain_timeout: float = 300.0,
+              status_interval: float = 10.0, metrics_path: str = None) -> dict:
+    """
+    Runs the workers and hands every connection over to them, until the supervisor is stopped.
+
+    Parameters:
+        host (str): The address to listen on.
+        port (int): The port to listen on.
+        worker_count (int): The number of worker processes (one per core by default).
+        size (os.terminal_size): The size of the players' terminals.
+        max_sessions (int): The number of sessions each worker runs at most.
+        health_interval (float): Seconds between the health reports of the workers.
+        drain_timeout (float): Seconds the workers wait for their sessions to end on shutdown.
+        status_interval (float): Seconds between the health summaries printed by the supervisor.
+        metrics_path (str): Optional JSON file the health of every worker is written to, every status interval.
+
+    Returns:
+        metrics (dict): The health of every worker once they have all stopped (see `WorkerMetrics`).
+    """
+
+    os.environ.setdefault('CQ_SAVE_BACKEND', 'sqlite')
+
+    if os.environ['CQ_SAVE_BACKEND'].strip().lower() != 'sqlite':
+        raise ValueError("Workers write their saves concurrently, which needs the sqlite save backend (CQ_SAVE_BACKEND=sqlite).")
+
+    settings = {'size': size, 'max_sessions': max_sessions, 'health_interval': health_interval, 'drain_timeout': drain_timeout}
+    supervisor_state = {'accepted': 0, 'dispatched': 0, 'dropped': 0, 'restarts': 0, 'stopping': False}
+
+    listener = socket.create_server((host, port), backlog = 1024)
+    listener.setblocking(False)
+    workers = []
+
+    for number in range(worker_count or os.cpu_count() or 1):
+        workers.append(StartWorker(number, [listener] + [worker['channel'] for worker in workers], settings))
+
+    selector = selectors.DefaultSelector()
+    selector.register(listener, selectors.EVENT_READ)
+
+    for worker in workers:
+        selector.register(worker['channel'], selectors.EVENT_READ, worker)
+
+    def stop(signal_number, frame):
+        supervisor_state['stopping'] = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    def write_metrics():
+        metrics = WorkerMetrics(workers, supervisor_state)
+
+        if metrics_path:
+            with open(metrics_path, 'w', encoding = 'utf-8') as file:
+                json.dump(metrics, file, indent = 2)
+
+        return metrics
+
+    def read_health(worker):
+        try:
+            message = worker['channel'].recv(65536)
+        except (BlockingIOError, InterruptedError, socket.timeout):
+            return
+        except OSError:
+            message = b''
+
+        if not message:
+            selector.unregister(worker['channel'])
+            return
+
+        worker['health'] = json.loads(message)
+        worker['reported'] = time.time()
+        worker['pending'] = 0
+
+    print(f" - Serving Console Quest RPG on {listener.getsockname()} with {len(workers)} workers")
+    next_status = time.monotonic() + status_interval
+
+    while not supervisor_state['stopping']:
+        for key, events in selector.select(timeout = min(health_interval, 0.5)):
+            if key.fileobj is listener:
+                while True:
+                    try:
+                        connection, address = listener.accept()
+                    except (BlockingIOError, InterruptedError):
+                        break
+
+                    supervisor_state['accepted'] += 1
+                    dispatched = DispatchConnection(connection, workers)
+                    supervisor_state['dispatched' if dispatched else 'dropped'] += 1
+            else:
+                read_health(key.data)
+
+        for index, worker in enumerate(workers):
+            if worker['process'].is_alive() or supervisor_state['stopping']:
+                continue
+
+            print(f" - Worker {worker['number']} (pid {worker['process'].pid}) exited with code {worker['process'].exitcode}, restarting it")
+
+            try:
+                selector.unregister(worker['channel'])
+            except KeyError:
+                pass     # Its channel already closed
+
+            worker['channel'].close()
+            others = [listener] + [other['channel'] for other in workers if other is not worker]
+            workers[index] = StartWorker(worker['number'], others, settings)
+            selector.register(workers[index]['channel'], selectors.EVENT_READ, workers[index])
+            supervisor_state['restarts'] += 1
+
+        if time.monotonic() >= next_status:
+            next_status = time.monotonic() + status_interval
+            metrics = write_metrics()
+            sessions = ', '.join(f"{worker['worker']}: {worker.get('open', 0)}" for worker in metrics['workers'])
+            print(f" - {supervisor_state['accepted']} connections accepted, open sessions by worker: {sessions}")
+
+    # Drain: no new connections, and every worker finishes the sessions it has
+    selector.unregister(listener)
+    listener.close()
+    print(f" - Draining {len(workers)} workers...")
+
+    for worker in workers:
+        try:
+            worker['channel'].send(b'drain')
+        except OSError:
+            pass
+
+    deadline = time.monotonic() + drain_timeout + save_flush_timeout + handoff_timeout
+
+    while any(worker['process'].is_alive() for worker in workers) and time.monotonic() < deadline:
+        for key, events in selector.select(timeout = min(health_interval, 0.5)):
+            read_health(key.data)
+
+        if time.monotonic() >= next_status:
+            next_status = time.monotonic() + status_interval
+            metrics = write_metrics()
+            print(f" - Waiting on {sum(worker.get('open', 0) for worker in metrics['workers'])} sessions to end")
+
+    for worker in workers:
+        if worker['process'].is_alive():
+            worker['process'].terminate()
+
+        worker['process'].join()
+
+    metrics = write_metrics()
+    selector.close()
+
+    for worker in workers:
+        worker['channel'].close()
+
+    return metrics
+
+def main():
+    """
+    Parses the command line arguments and runs the supervisor.
+    """
+
+    parser = argparse.ArgumentParser(description = "Hosts Console Quest RPG over TCP, spreading the players over worker processes.")
+    parser.add_argument('--host', default = '127.0.0.1', help = "address to listen on")
+    parser.add_argument('--port', type = int, default = 4000, help = "port to listen on")
+    parser.add_argument('--workers', type = int, default = None, help = "worker processes (one per core by default)")
+    parser.add_argument('--columns', type = int, default = 80, help = "width of the players' terminals")
+    parser.add_argument('--lines', type = int, default = 24, help = "height of the players' terminals")
+    parser.add_argument('--max-sessions', type = int, default = 5000, help = "sessions each worker runs at most")
+    parser.add_argument('--health-interval', type = float, default = 1.0, help = "seconds between the health reports of the workers")
+    parser.add_argument('--drain-timeout', type = float, default = 300.0, help = "seconds the workers wait for their sessions to end on shutdown")
+    parser.add_argument('--status-interval', type = float, default = 10.0, help = "seconds between the health summaries printed")
+    parser.add_argument('--metrics', default = None, help = "JSON file to write the health of every worker to")
+    arguments = parser.parse_args()
+
+    metrics = Supervise(arguments.host, arguments.port, arguments.workers, os.terminal_size((arguments.columns, arguments.lines)),
+                        arguments.max_sessions, arguments.health_interval, arguments.drain_timeout,
+                        arguments.status_interval, arguments.metrics)
+
+    for worker in metrics['workers']:
+        print(f" - Worker {worker['worker']}: {worker.get('total', 0)} sessions served, {worker.get('refused', 0)} turned away")
+
+if __name__ == '__main__':
+    main()
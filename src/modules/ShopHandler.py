@@ -3,15 +3,15 @@ Shop functionality for Console Quest RPG.
 
 This module handles the shop system within the game, allowing players to buy and sell items. It manages:
 - Displaying the shop menu for player interactions (buying items, selling items, leaving the shop).
-- Loading the inventory of items available for purchase and the items the shop requires from external text files.
+- Loading the inventory of items available for purchase and the items the shop requires from the config tables.
 - Facilitating item purchases and sales, updating the player's gold and inventory accordingly.
 
 This module is essential for enhancing player experience by providing a dynamic and interactive way to manage resources in the game.
 
 Functions:
 - ShopMenu: Displays the shop interface where players can select options to buy or sell items.
-- LoadShopInventory: Loads items available for purchase from a specified inventory file, generating random buy prices.
-- LoadShopNeeds: Loads items that the shop needs from a specified file, generating random sell prices.
+- LoadShopInventory: Loads items available for purchase from the shop inventory config, generating random buy prices.
+- LoadShopNeeds: Loads items that the shop needs from the shop needs config, generating random sell prices.
 - BuyItems: Enables the player to purchase items, updating their inventory and gold.
 - SellItems: Allows the player to sell items from their inventory, updating their gold and inventory as necessary.
 '''
@@ -19,6 +19,7 @@ Functions:
 from src.modules.MainMenu import ConsoleInput, ClearConsole
 from src.modules.ArtAssets import DisplayPlanet
 from src.modules.TextFormatter import MenuLine
+from src.modules.ConfigHandler import GetShopInventory, GetShopNeeds
 
 from src.classes.Player import Player # Change either to Player or old_Player
 
@@ -57,55 +58,25 @@ def ShopMenu(player: Player) -> None:
         else:
             return
         
-def LoadShopInventory(file_path: str = '.\\config\\shopInventory.txt') -> list:
+def LoadShopInventory() -> list:
     """
-    Loads items available for purchase from a specified inventory file, generating random buy prices.
-
-    Parameters:
-        file_path (str): The path to the shop items file.
+    Loads items available for purchase from the shop inventory config, generating random buy prices.
 
     Returns:
         items (list): A list of dictionaries representing items available in the shop.
     """
     
-    selling_items = []
-
-    with open(file_path, 'r') as file:
-        for line in file:
-            name, min_price, max_price = line.strip().split(', ')
-            min_price, max_price = int(min_price), int(max_price)
-            buy_price = random.randint(min_price, max_price)
-            selling_items.append({
-                'name': name,
-                'sell_price': buy_price
-            })
+    return [{'name': item.name, 'sell_price': random.randint(item.min_price, item.max_price)} for item in GetShopInventory()]
 
-    return selling_items
-
-def LoadShopNeeds(file_path: str = '.\\config\\shopNeeds.txt') -> list:
+def LoadShopNeeds() -> list:
     """
-    Loads items that the shop needs from a specified file, generating random sell prices.
-
-    Parameters:
-        file_path (str): The path to the shop items file.
+    Loads items that the shop needs from the shop needs config, generating random sell prices.
 
     Returns:
-        items (list): A list of dictionaries representing items available in the shop.
+        items (list): A list of dictionaries representing items the shop buys.
     """
 
-    buying_items = []
-
-    with open(file_path, 'r') as file:
-        for line in file:
-            name, min_price, max_price = line.strip().split(', ')
-            min_price, max_price = int(min_price), int(max_price)
-            sell_price = random.randint(min_price, max_price)
-            buying_items.append({
-                'name': name,
-                'sell_price': sell_price
-            })
-
-    return buying_items
+    return [{'name': item.name, 'sell_price': random.randint(item.min_price, item.max_price)} for item in GetShopNeeds()]
 
 def BuyItems(player: Player) -> None:
     """
@@ -210,6 +181,7 @@ def SellItems(player: Player) -> None:
     """
 
     shop_needs = LoadShopNeeds()
+    sell_prices = {shop_item['name']: shop_item['sell_price'] for shop_item in shop_needs}
 
     ClearConsole()
     DisplayPlanet()
@@ -227,14 +199,17 @@ def SellItems(player: Player) -> None:
         ConsoleInput()
         return
 
+    # Snapshot the inventory once, so the numbers shown match the item that gets sold
+    inventory_items = list(player.inventory.items())
+
     # Loop through the inventory items
-    for index, (item_name, details) in enumerate(player.inventory.items(), start=1):
+    for index, (item_name, details) in enumerate(inventory_items, start=1):
         item_count = details['count']
 
-        # Find the corresponding shop item to get the sell price
-        shop_item = next((shop_item for shop_item in shop_needs if shop_item['name'] == item_name), None)
-        if shop_item:
-            print(f" {index}. {item_name} (x{item_count}) @ {shop_item['sell_price']}g each")
+        # Look up the sell price of the item
+        sell_price = sell_prices.get(item_name)
+        if sell_price is not None:
+            print(f" {index}. {item_name} (x{item_count}) @ {sell_price}g each")
         else:
             print(" * ERROR: The shop isn't taking that item right now!")
 
@@ -248,14 +223,13 @@ def SellItems(player: Player) -> None:
 
     try:
         item_choice = int(item_choice) - 1
-        if item_choice < 0 or item_choice >= len(player.inventory):
+        if item_choice < 0 or item_choice >= len(inventory_items):
             raise ValueError
     except ValueError:
         return
     
     # Get the selected item
-    selected_item_name = list(player.inventory.keys())[item_choice]
-    selected_item = player.inventory[selected_item_name]
+    selected_item_name, selected_item = inventory_items[item_choice]
 
     # Ask the player how many of the item they want to sell
     max_quantity = selected_item['count']
@@ -272,9 +246,9 @@ def SellItems(player: Player) -> None:
         return
     
     # Calculate the gold earned from the sale
-    shop_item = next((shop_item for shop_item in shop_needs if shop_item['name'] == selected_item_name), None)
-    if shop_item:
-        total_gold = shop_item['sell_price'] * quantity_choice
+    sell_price = sell_prices.get(selected_item_name)
+    if sell_price is not None:
+        total_gold = sell_price * quantity_choice
         player.gold += total_gold
         player.inventory[selected_item_name]['count'] -= quantity_choice
 
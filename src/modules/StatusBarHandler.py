@@ -16,41 +16,45 @@ Functions:
 
 from src.classes.Player import Player # Change either to Player or old_Player
 from src.classes.Enemy import Enemy
+from src.modules.TextFormatter import Frame, Emit
 
-def UpdateEnemyHealthBar(enemy: Enemy) -> None:
+def UpdateEnemyHealthBar(enemy: Enemy, frame: Frame = None) -> None:
     """
     Generates and displays the current health status of an enemy during combat.
 
     Parameters:
         enemy (object): The enemy.
+        frame (Frame): The frame to add the bar to, if any.
     """
 
     bar_length = 50
 
     health_bar, health_display = enemy.GenerateStatBar(enemy.stats['Health'], enemy.max_stats['Health'], bar_length, 'red')
     
-    print(f" -  HP: {health_bar} " + health_display)
+    Emit(f" -  HP: {health_bar} " + health_display, frame)
 
-def UpdateExperienceBar(player: Player) -> None:
+def UpdateExperienceBar(player: Player, frame: Frame = None) -> None:
     """
     Displays the player's experience status, showing how close they are to leveling up.
 
     Parameters:
         player (object): The player character.
+        frame (Frame): The frame to add the bar to, if any.
     """
 
     bar_length = 46
     
     exp_bar, exp_display = player.GenerateExpBar(round(player.experience, 2), round(player.next_experience, 2), bar_length, 'yellow')
 
-    print(f" - EXP: {exp_bar} " + exp_display)
+    Emit(f" - EXP: {exp_bar} " + exp_display, frame)
 
-def UpdateStatusBar(player: Player) -> None:
+def UpdateStatusBar(player: Player, frame: Frame = None) -> None:
     """
     Updates and displays the player's health, mana, and stamina, giving a complete overview of their current stats.
 
     Parameters:
         player (object): The player character.
+        frame (Frame): The frame to add the bars to, if any.
     """
 
     bar_length = 50
@@ -59,6 +63,6 @@ def UpdateStatusBar(player: Player) -> None:
     mana_bar, mana_display = player.GenerateStatBar(round(player.stats['Mana'], 2), round(player.max_stats['Mana'], 2), bar_length, 'blue')
     stamina_bar, stamina_display = player.GenerateStatBar(round(player.stats['Stamina'], 2), round(player.max_stats['Stamina'], 2),bar_length, 'green')
 
-    print(f" -  HP: {health_bar} " + health_display)
-    print(f" -  MP: {mana_bar} " + mana_display)
-    print(f" -  SP: {stamina_bar} " + stamina_display)
\ No newline at end of file
+    Emit(f" -  HP: {health_bar} " + health_display, frame)
+    Emit(f" -  MP: {mana_bar} " + mana_display, frame)
+    Emit(f" -  SP: {stamina_bar} " + stamina_display, frame)
\ No newline at end of file
@@ -6,21 +6,88 @@ These functions create visual separation and structure within the game's menus,
 and understand their options. The formatting includes lines, titles, and selection options that contribute to an 
 engaging user experience.
 
+Screens with a lot of lines (the in-game menu, combat turns, the stats screen) are built in a `Frame` and
+written to the console at once, instead of with a separate print for every line. The formatting functions
+add their lines to a frame when given one, and print them otherwise.
+
+The health, mana, stamina and experience bars of the player and of enemies are all drawn by `GenerateBar`.
+The color codes are worked out once, and every bar drawn is kept, so redrawing a bar that didn't change
+(which is most of them, every turn and every menu) doesn't build it again.
+
 Functions:
+- Frame: Collects the lines of a screen, so the whole screen is written to the console at once.
+- Emit: Adds a line to a frame, or prints it when there is no frame.
 - MenuLine: Prints a decorative line for visual separation in the menu.
 - MenuTitle: Displays the game title centered within the menu.
 - MenuSelection: Prints the available options in the menu, including version information.
+- RenderBar: Builds a colored bar with the given number of filled cells.
+- GenerateBar: Builds the colored bar of a stat along with its value.
 '''
 
-def MenuLine(scalar: int = 73) -> None:
+from src.modules.TraceHandler import Traced
+
+import functools
+import sys
+
+bar_colors = ('black', 'red', 'green', 'yellow', 'blue', 'magenta', 'cyan', 'white')
+color_codes = {color: f"\033[1;{30 + index}m" for index, color in enumerate(bar_colors)}
+reset_code = "\033[0m"
+
+class Frame:
+    """
+    Collects the lines of a screen, so the whole screen is written to the console at once.
+
+    Attributes:
+        parts (list): The lines of the screen so far, each ending with a new line.
+    """
+
+    def __init__(self):
+        self.parts = []
+
+    def Print(self, text: str = '') -> None:
+        """
+        Adds a line to the screen, the same way `print` would print it.
+
+        Parameters:
+            text (str): The line (may span several lines).
+        """
+
+        self.parts.append(f"{text}\n")
+
+    @Traced('Frame.Write', 'render')
+    def Write(self) -> None:
+        """
+        Writes the screen to the console in a single write, then starts over with an empty screen.
+        """
+
+        sys.stdout.write(''.join(self.parts))
+        sys.stdout.flush()
+        self.parts.clear()
+
+def Emit(text: str = '', frame: Frame = None) -> None:
+    """
+    Adds a line to a frame, or prints it when there is no frame.
+
+    Parameters:
+        text (str): The line.
+        frame (Frame): The frame being built, if any.
+    """
+
+    if frame is None:
+        print(text)
+    else:
+        frame.Print(text)
+
+def MenuLine(scalar: int = 73, frame: Frame = None) -> None:
     """
     Prints a decorative line for visual separation in the menu.
     
     Parameters:
         scalar (int): Value for how many spaces go on either side of the title.
+        frame (Frame): The frame to add the line to, if any.
     """
 
-    print("+" + "-" * scalar + "+")
+    Emit("+" + "-" * scalar + "+", frame)
 
 def MenuTitle(scalar: int = 26) -> None:
     """
@@ -48,4 +115,45 @@ def MenuSelection(scalar: int = 49, version: str = "(v0.2.2-pre)") -> None:
         if number == quit_game:
             print(f" {number}. {option}" + " " * scalar + version)
         else:
-            print(f" {number}. {option}")
\ No newline at end of file
+            print(f" {number}. {option}")
+
+@functools.lru_cache(maxsize = 1024)
+def RenderBar(filled: int, length: int, bar_color: str, bracket_color: str) -> str:
+    """
+    Builds a colored bar with the given number of filled cells. Bars are cached, since the same few are drawn over and over.
+
+    Parameters:
+        filled (int): Number of filled cells.
+        length (int): Total number of cells.
+        bar_color (str): Color of the filled cells, one of `bar_colors`.
+        bracket_color (str): Color of the brackets around the bar, one of `bar_colors`.
+
+    Returns:
+        bar (str): The bar, with its color codes.
+    """
+
+    bracket_code = color_codes[bracket_color]
+
+    return f"{bracket_code}[{color_codes[bar_color]}{'=' * filled}{' ' * (length - filled)}{bracket_code}]{reset_code}"
+
+def GenerateBar(current: float, maximum: float, length: int = 50, bar_color: str = 'white', bracket_color: str = 'white', display_width: int = 10) -> tuple[str, str]:
+    """
+    Builds the colored bar of a stat along with its value.
+
+    Parameters:
+        current (float): Current value of the stat.
+        maximum (float): Maximum value of the stat.
+        length (int): Length of the bar.
+        bar_color (str): Color of the filled part of the bar.
+        bracket_color (str): Color of the brackets around the bar.
+        display_width (int): Width the value is right-aligned to.
+
+    Returns:
+        bar (str): The bar.
+        display (str): The current and maximum value, in parentheses.
+    """
+
+    bar = RenderBar(int(length * (current / maximum)), length, bar_color, bracket_color)
+    display = f"({current}/{maximum})".rjust(display_width)
+
+    return bar, display
@@ -0,0 +1,202 @@
+'''
+Opt-in tracing of the hot paths of Console Quest RPG.
+
+This module records how long the hot paths of a live session take (combat turns, enemy spawns, config
+loads, saves, console clears and screen renders) as spans, without attaching a profiler:
+- Tracing is turned on with the `CQ_TRACE` environment variable: `1` writes the trace to `trace.json` when
+  the game exits, any other value is the path to write it to.
+- Spans are kept in a ring buffer in memory (the newest `CQ_TRACE_BUFFER` spans, 100000 by default), so a
+  long session never grows without bound.
+- The trace is written in the Chrome trace event format, and can be opened in `chrome://tracing` or Perfetto.
+
+Tracing costs next to nothing when it is off: `Traced` hands back the function it decorates untouched, and
+`TraceSpan` and `StartSpan` return right away.
+
+Functions:
+- RecordSpan: Adds a finished span to the ring buffer.
+- Traced: Decorator that records a span for every call of a function.
+- RecordingSpan: Context manager that records a span for the code it wraps.
+- TraceSpan: Returns a context manager that records a span for the code it wraps.
+- StartSpan: Starts a span that is ended by `EndSpan`, for code that can't be wrapped in a `with` block.
+- EndSpan: Ends a span started by `StartSpan` and records it.
+- TraceEvents: Returns the recorded spans as Chrome trace events.
+- DumpTrace: Writes the recorded spans to a Chrome trace file.
+'''
+
+import atexit
+import collections
+import contextlib
+import functools
+import os
+import threading
+import time
+
+trace_setting = os.environ.get('CQ_TRACE', '').strip()
+trace_enabled = trace_setting.lower() not in ('', '0', 'false', 'no', 'off')
+trace_path = trace_setting if trace_enabled and trace_setting.lower() not in ('1', 'true', 'yes', 'on') else 'trace.json'
+
+# Finished spans, oldest first: (name, category, start in ns, duration in ns, thread id, args)
+trace_spans = collections.deque(maxlen = int(os.environ.get('CQ_TRACE_BUFFER', 100000)))
+trace_start = time.perf_counter_ns()
+null_span = contextlib.nullcontext()
+
+def RecordSpan(name: str, category: str, start: int, end: int, args: dict = None) -> None:
+    """
+    Adds a finished span to the ring buffer, dropping the oldest span once it is full.
+
+    Parameters:
+        name (str): Name of the span.
+        category (str): Category of the span (e.g. combat, saves, render).
+        start (int): When the span started, from `time.perf_counter_ns`.
+        end (int): When the span ended, from `time.perf_counter_ns`.
+        args (dict): Optional details shown along with the span.
+    """
+
+    trace_spans.append((name, category, start, end - start, threading.get_ident(), args))
+
+def Traced(name: str = None, category: str = 'game'):
+    """
+    Decorator that records a span for every call of a function. The function is left untouched when tracing is off.
+
+    Parameters:
+        name (str): Name of the spans (the qualified name of the function by default).
+        category (str): Category of the spans.
+
+    Returns:
+        decorator (function): The decorator.
+    """
+
+    def decorator(function):
+        if not trace_enabled:
+            return function
+
+        span_name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def traced(*args, **kwargs):
+            start = time.perf_counter_ns()
+
+            try:
+                return function(*args, **kwargs)
+            finally:
+                RecordSpan(span_name, category, start, time.perf_counter_ns())
+
+        return traced
+
+    return decorator
+
+@contextlib.contextmanager
+def RecordingSpan(name: str, category: str, args: dict):
+    """
+    Context manager that records a span for the code it wraps, used by `TraceSpan` when tracing is on.
+    """
+
+    start = time.perf_counter_ns()
+
+    try:
+        yield
+    finally:
+        RecordSpan(name, category, start, time.perf_counter_ns(), args)
+
+def TraceSpan(name: str, category: str = 'game', **args):
+    """
+    Returns a context manager that records a span for the code it wraps (one that does nothing when tracing is off).
+
+    Parameters:
+        name (str): Name of the span.
+        category (str): Category of the span.
+        **args: Optional details shown along with the span.
+
+    Returns:
+        span (context manager): The span.
+    """
+
+    if not trace_enabled:
+        return null_span
+
+    return RecordingSpan(name, category, args or None)
+
+def StartSpan(name: str, category: str = 'game', **args):
+    """
+    Starts a span that is ended by `EndSpan`, for code that can't be wrapped in a `with` block.
+
+    Parameters:
+        name (str): Name of the span.
+        category (str): Category of the span.
+        **args: Optional details shown along with the span.
+
+    Returns:
+        span (tuple): The started span, to pass to `EndSpan` (None when tracing is off).
+    """
+
+    if not trace_enabled:
+        return None
+
+    return (name, category, time.perf_counter_ns(), args or None)
+
+def EndSpan(span) -> None:
+    """
+    Ends a span started by `StartSpan` and records it.
+
+    Parameters:
+        span (tuple): The span returned by `StartSpan`.
+    """
+
+    if span is None:
+        return
+
+    name, category, start, args = span
+    RecordSpan(name, category, start, time.perf_counter_ns(), args)
+
+def TraceEvents() -> list:
+    """
+    Returns the recorded spans as Chrome trace events.
+
+    Returns:
+        events (list): A complete event ('X') for each span, with its times in microseconds since tracing started.
+    """
+
+    process_id = os.getpid()
+    events = []
+
+    for name, category, start, duration, thread_id, args in list(trace_spans):
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (start - trace_start) / 1000,
+            'dur': duration / 1000,
+            'pid': process_id,
+            'tid': thread_id
+        }
+
+        if args:
+            event['args'] = args
+
+        events.append(event)
+
+    return events
+
+def DumpTrace(file_path: str = None) -> str:
+    """
+    Writes the recorded spans to a Chrome trace file.
+
+    Parameters:
+        file_path (str): The path of the trace file (`trace_path` by default).
+
+    Returns:
+        file_path (str): The path the trace was written to.
+    """
+
+    # Only needed once the session is over, so it isn't imported with the rest of the game
+    import json
+
+    file_path = file_path or trace_path
+
+    with open(file_path, 'w', encoding = 'utf-8') as file:
+        json.dump({'traceEvents': TraceEvents(), 'displayTimeUnit': 'ms'}, file)
+
+    return file_path
+
+if trace_enabled:
+    atexit.register(DumpTrace)
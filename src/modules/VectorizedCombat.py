@@ -0,0 +1,277 @@
+'''
+NumPy-vectorized combat engine that resolves many encounters in lockstep.
+
+Where `CombatSimulator` resolves one fight at a time, this module stores the health, mana, stamina,
+attack, defense, crit and dodge values of N player/enemy pairs as arrays and resolves turn after turn
+for all of them at once. Every turn rolls the crit and dodge thresholds for all pairs in one go and
+applies the outcome with masked array operations, following the same rules as `MeleeAttack`,
+`CastSpell`, `EnemyDecides` and `StartEncounter`:
+- The weakened melee attack (75% of physical attack, no stamina spent) when stamina is too low.
+- Critical hits that skip the dodge check entirely.
+- Dodges checked against the attacker's dodge chance, costing nothing.
+- The slower side skipping the first turn, and the player's mana and stamina recovery every turn.
+
+The player always follows the default strategy of `CombatSimulator.ChooseAction`, since a per-pair
+Python callback would defeat the purpose of vectorizing the fight.
+
+This module needs NumPy, which is optional for the rest of the game (see docs/DEPENDENCIES.md).
+
+Functions:
+- BuildCombatArrays: Packs the combat values of N player/enemy pairs into arrays.
+- ResolveEncounters: Resolves every encounter stored in the combat arrays and returns the outcome arrays.
+- SimulateEncountersVectorized: Spawns enemies for a player and resolves all of the encounters in lockstep.
+- SummarizeVectorizedEncounters: Aggregates the outcome arrays into win rates and averages.
+'''
+
+from src.modules.CombatSimulator import ThresholdProbability, SpawnEnemy, level_cap
+
+import numpy as np
+import random
+
+winner_names = ('draw', 'player', 'enemy', 'fled')
+
+def BuildCombatArrays(players: list, enemies: list) -> dict:
+    """
+    Packs the combat values of N player/enemy pairs into arrays.
+
+    Parameters:
+        players (list): The players fighting, one per encounter.
+        enemies (list): The enemies being fought, paired by index with the players.
+
+    Returns:
+        arrays (dict): Arrays of health, mana, stamina, costs, damage and roll thresholds for both sides, keyed by name.
+    """
+
+    if len(players) != len(enemies):
+        raise ValueError("Every player needs exactly one enemy to fight.")
+
+    def column(values, dtype = np.float64):
+        return np.fromiter(values, dtype = dtype, count = len(players))
+
+    pairs = list(zip(players, enemies))
+
+    player_physical_attack = column(player.physical_attack for player, _ in pairs)
+    enemy_physical_attack = column(enemy.physical_attack for _, enemy in pairs)
+    player_physical_defense = column(player.physical_defense for player, _ in pairs)
+    enemy_physical_defense = column(enemy.physical_defense for _, enemy in pairs)
+    player_magical_defense = column(player.magical_defense for player, _ in pairs)
+    enemy_magical_defense = column(enemy.magical_defense for _, enemy in pairs)
+
+    return {
+        'player_health': column(player.stats['Health'] for player, _ in pairs),
+        'player_mana': column(player.stats['Mana'] for player, _ in pairs),
+        'player_stamina': column(player.stats['Stamina'] for player, _ in pairs),
+        'player_max_health': column(player.max_stats['Health'] for player, _ in pairs),
+        'player_max_mana': column(player.max_stats['Mana'] for player, _ in pairs),
+        'player_max_stamina': column(player.max_stats['Stamina'] for player, _ in pairs),
+        'player_mana_recovery': column(round(player.attributes['Willpower'] * 0.03, 2) for player, _ in pairs),
+        'player_stamina_recovery': column(round(player.attributes['Endurance'] * 0.03, 2) for player, _ in pairs),
+        'player_mana_cost': column(player.mana_cost for player, _ in pairs),
+        'player_stamina_cost': column(player.stamina_cost for player, _ in pairs),
+        'player_crit_roll': column(ThresholdProbability(player.critical_chance) for player, _ in pairs),
+        'player_dodge_roll': column(ThresholdProbability(player.dodge_chance) for player, _ in pairs),
+        'player_critical_hit': column(player.critical_hit for player, _ in pairs),
+        'player_melee_damage': np.maximum(0, player_physical_attack - enemy_physical_defense),
+        'player_weakened_damage': np.maximum(0, player_physical_attack * 0.75 - enemy_physical_defense),
+        'player_spell_damage': np.maximum(0, column(player.magical_attack for player, _ in pairs) - enemy_magical_defense),
+        'player_speed': column((player.attributes['Speed'] for player, _ in pairs), np.int16),
+        'player_level': column((player.level for player, _ in pairs), np.int16),
+        'enemy_health': column(enemy.stats['Health'] for _, enemy in pairs),
+        'enemy_mana': column(enemy.stats['Mana'] for _, enemy in pairs),
+        'enemy_stamina': column(enemy.stats['Stamina'] for _, enemy in pairs),
+        'enemy_mana_cost': column(enemy.mana_cost for _, enemy in pairs),
+        'enemy_stamina_cost': column(enemy.stamina_cost for _, enemy in pairs),
+        'enemy_crit_roll': column(ThresholdProbability(enemy.critical_chance) for _, enemy in pairs),
+        'enemy_dodge_roll': column(ThresholdProbability(enemy.dodge_chance) for _, enemy in pairs),
+        'enemy_critical_hit': column(enemy.critical_hit for _, enemy in pairs),
+        'enemy_melee_damage': np.maximum(0, enemy_physical_attack - player_physical_defense),
+        'enemy_weakened_damage': np.maximum(0, enemy_physical_attack * 0.75 - player_physical_defense),
+        'enemy_spell_damage': np.maximum(0, column(enemy.magical_attack for _, enemy in pairs) - player_magical_defense),
+        'enemy_speed': column((enemy.attributes['Speed'] for _, enemy in pairs), np.int16),
+        'enemy_dropped_exp': column(enemy.dropped_exp for _, enemy in pairs),
+        'enemy_dropped_gold': column(enemy.dropped_gold for _, enemy in pairs)
+    }
+
+def ResolveEncounters(arrays: dict, flee_threshold: float = 0.0, max_turns: int = 500, seed: int = None) -> dict:
+    """
+    Resolves every encounter stored in the combat arrays and returns the outcome arrays.
+
+    The input arrays are left untouched, so the same arrays can be resolved again with a different seed.
+
+    Parameters:
+        arrays (dict): Combat arrays built by `BuildCombatArrays`.
+        flee_threshold (float): Health ratio under which the player runs away (when fast enough).
+        max_turns (int): Turns after which an unfinished fight is called a draw.
+        seed (int): Optional seed so the results can be reproduced.
+
+    Returns:
+        outcomes (dict): Arrays of winner codes (indexes into `winner_names`), turns taken, damage dealt and taken, and experience and gold earned.
+    """
+
+    rng = np.random.default_rng(seed)
+
+    player_health = arrays['player_health'].copy()
+    player_mana = arrays['player_mana'].copy()
+    player_stamina = arrays['player_stamina'].copy()
+    enemy_health = arrays['enemy_health'].copy()
+    enemy_mana = arrays['enemy_mana'].copy()
+    enemy_stamina = arrays['enemy_stamina'].copy()
+
+    player_max_mana = arrays['player_max_mana']
+    player_max_stamina = arrays['player_max_stamina']
+    player_mana_cost = arrays['player_mana_cost']
+    player_stamina_cost = arrays['player_stamina_cost']
+    enemy_mana_cost = arrays['enemy_mana_cost']
+    enemy_stamina_cost = arrays['enemy_stamina_cost']
+
+    player_goes_first = arrays['player_speed'] >= arrays['enemy_speed']
+    player_can_run = arrays['player_speed'] > arrays['enemy_speed']
+    flee_health = arrays['player_max_health'] * flee_threshold
+
+    count = player_health.shape[0]
+    winner = np.zeros(count, dtype = np.int8)
+    turns = np.zeros(count, dtype = np.int32)
+    active = player_health > 0
+
+    for turn_counter in range(1, max_turns + 1):
+        if not active.any():
+            break
+
+        crit_roll = rng.random(count)
+        dodge_roll = rng.random(count)
+
+        if turn_counter % 2 == 1:
+            # The slower side skips the very first turn, so the player only acts on turn 1 when they go first
+            acting = active if turn_counter > 1 else active & player_goes_first
+
+            running = acting & player_can_run & (player_health < flee_health)
+            fighting = acting & ~running
+            melee = fighting & ((player_stamina >= player_stamina_cost) | (player_mana < player_mana_cost))
+            spell = fighting & ~melee
+
+            is_crit = crit_roll < arrays['player_crit_roll']
+            is_hit = dodge_roll >= arrays['player_dodge_roll']
+
+            weakened = melee & (player_stamina < player_stamina_cost)
+            melee_crit = melee & ~weakened & is_crit
+            melee_hit = melee & ~weakened & ~is_crit & is_hit
+            spell_ready = spell & (player_mana >= player_mana_cost)
+            spell_crit = spell_ready & is_crit
+            spell_hit = spell_ready & ~is_crit & is_hit
+
+            enemy_health -= np.where(weakened, arrays['player_weakened_damage'], 0)
+            enemy_health -= np.where(melee_crit | spell_crit, arrays['player_critical_hit'], 0)
+            enemy_health -= np.where(melee_hit, arrays['player_melee_damage'], 0)
+            enemy_health -= np.where(spell_hit, arrays['player_spell_damage'], 0)
+            player_stamina -= np.where(melee_crit | melee_hit, player_stamina_cost, 0)
+            player_mana -= np.where(spell_crit | spell_hit, player_mana_cost, 0)
+        else:
+            acting = active
+            running = np.zeros(count, dtype = bool)
+
+            melee = acting & (rng.random(count) < 0.5)
+            spell = acting & ~melee
+
+            is_crit = crit_roll < arrays['enemy_crit_roll']
+            is_hit = dodge_roll >= arrays['enemy_dodge_roll']
+
+            weakened = melee & (enemy_stamina < enemy_stamina_cost)
+            melee_crit = melee & ~weakened & is_crit
+            melee_hit = melee & ~weakened & ~is_crit & is_hit
+            spell_ready = spell & (enemy_mana >= enemy_mana_cost)
+            spell_crit = spell_ready & is_crit
+            spell_hit = spell_ready & ~is_crit & is_hit
+
+            player_health -= np.where(weakened, arrays['enemy_weakened_damage'], 0)
+            player_health -= np.where(melee_crit | spell_crit, arrays['enemy_critical_hit'], 0)
+            player_health -= np.where(melee_hit, arrays['enemy_melee_damage'], 0)
+            player_health -= np.where(spell_hit, arrays['enemy_spell_damage'], 0)
+            enemy_stamina -= np.where(melee_crit | melee_hit, enemy_stamina_cost, 0)
+            enemy_mana -= np.where(spell_crit | spell_hit, enemy_mana_cost, 0)
+
+        recovered_mana = player_mana + arrays['player_mana_recovery']
+        recovered_stamina = player_stamina + arrays['player_stamina_recovery']
+        player_mana = np.where(active, np.where(recovered_mana <= player_max_mana, recovered_mana, player_max_mana), player_mana)
+        player_stamina = np.where(active, np.where(recovered_stamina <= player_max_stamina, recovered_stamina, player_max_stamina), player_stamina)
+
+        fled = running
+        died = active & ~fled & (player_health <= 0)
+        won = active & ~fled & ~died & (enemy_health <= 0)
+
+        winner[fled] = winner_names.index('fled')
+        winner[died] = winner_names.index('enemy')
+        winner[won] = winner_names.index('player')
+
+        finished = fled | died | won
+        turns[active] = turn_counter
+        active &= ~finished
+
+    player_won = winner == winner_names.index('player')
+
+    return {
+        'winner': winner,
+        'turns': turns,
+        'damage_dealt': arrays['enemy_health'] - enemy_health,
+        'damage_taken': arrays['player_health'] - player_health,
+        'exp': np.where(player_won & (arrays['player_level'] < level_cap), arrays['enemy_dropped_exp'], 0),
+        'gold': np.where(player_won, arrays['enemy_dropped_gold'], 0)
+    }
+
+def SimulateEncountersVectorized(player, count: int, enemy = None, flee_threshold: float = 0.0, max_turns: int = 500, seed: int = None) -> dict:
+    """
+    Spawns enemies for a player and resolves all of the encounters in lockstep.
+
+    Passing an Enemy makes every encounter fight a copy of that enemy, which skips spawning entirely.
+    Passing an enemy type or None spawns a fresh enemy for each encounter like exploring the world does.
+
+    Parameters:
+        player (Player): The character fighting the encounters.
+        count (int): How many encounters to resolve.
+        enemy (Enemy, str or None): An existing enemy, the type of enemy to spawn, or None for a random type.
+        flee_threshold (float): Health ratio under which the player runs away (when fast enough).
+        max_turns (int): Turns after which an unfinished fight is called a draw.
+        seed (int): Optional seed so the results can be reproduced.
+
+    Returns:
+        outcomes (dict): The outcome arrays returned by `ResolveEncounters`.
+    """
+
+    if enemy is None or isinstance(enemy, str):
+        spawn_rng = random.Random(seed) if seed is not None else random
+        arrays = BuildCombatArrays([player] * count, [SpawnEnemy(player, enemy, spawn_rng) for _ in range(count)])
+    else:
+        # Every encounter is identical, so build a single pair and broadcast it
+        arrays = {name: np.repeat(values, count) for name, values in BuildCombatArrays([player], [enemy]).items()}
+
+    return ResolveEncounters(arrays, flee_threshold, max_turns, seed)
+
+def SummarizeVectorizedEncounters(outcomes: dict) -> dict:
+    """
+    Aggregates the outcome arrays into win rates and averages.
+
+    Parameters:
+        outcomes (dict): Outcome arrays returned by `ResolveEncounters`.
+
+    Returns:
+        summary (dict): Number of fights, win/loss/flee/draw rates, average turns, average turns to kill, and average loot per fight.
+    """
+
+    fights = int(outcomes['winner'].shape[0])
+
+    if fights == 0:
+        return {'fights': 0}
+
+    rates = np.bincount(outcomes['winner'], minlength = len(winner_names)) / fights
+    player_won = outcomes['winner'] == winner_names.index('player')
+
+    return {
+        'fights': fights,
+        'win_rate': float(rates[winner_names.index('player')]),
+        'loss_rate': float(rates[winner_names.index('enemy')]),
+        'flee_rate': float(rates[winner_names.index('fled')]),
+        'draw_rate': float(rates[winner_names.index('draw')]),
+        'average_turns': float(outcomes['turns'].mean()),
+        'average_turns_to_kill': float(outcomes['turns'][player_won].mean()) if player_won.any() else None,
+        'average_exp': float(outcomes['exp'].mean()),
+        'average_gold': float(outcomes['gold'].mean())
+    }